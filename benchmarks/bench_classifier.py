@@ -0,0 +1,72 @@
+"""
+Accuracy drift and throughput of the make/model classifier's fast modes.
+
+Runs a fixed, seeded crop set through the reference path (PIL + image
+processor, fp32) and through the fast-preprocessing and int8 modes, then
+prints top-1 agreement with the reference, the mean top-1 confidence
+difference and crops per second. Pass a directory of vehicle crops to use
+real images instead of the synthetic set.
+Run from the repository root:
+    python -m benchmarks.bench_classifier [crop_dir] [--threads N]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+import cv2
+import numpy as np
+
+from src.classifier import VehicleMakeModelClassifier
+
+MODES = [
+    ("reference", {}),
+    ("fast preprocess", {"fast_preprocess": True}),
+    ("int8", {"quantize": True}),
+    ("fast + int8", {"fast_preprocess": True, "quantize": True}),
+]
+
+def load_crops(crop_dir, count=128):
+    if crop_dir:
+        paths = sorted(glob.glob(os.path.join(crop_dir, "*.jpg")) + glob.glob(os.path.join(crop_dir, "*.png")))
+        return [cv2.imread(path) for path in paths[:count]]
+    # Seeded synthetic crops of typical vehicle-crop sizes
+    rng = np.random.default_rng(0)
+    crops = []
+    for _ in range(count):
+        height, width = rng.integers(60, 400), rng.integers(80, 600)
+        crop = cv2.resize(rng.integers(0, 256, (8, 8, 3), dtype=np.uint8), (int(width), int(height)))
+        crops.append(cv2.GaussianBlur(crop, (5, 5), 0))
+    return crops
+
+def run(classifier, crops, repeats=3):
+    classifier.classify_batch(crops[:8])
+    start = time.perf_counter()
+    for _ in range(repeats):
+        results = classifier.classify_batch(crops)
+    elapsed = time.perf_counter() - start
+    return results, len(crops) * repeats / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the classifier's fast modes.")
+    parser.add_argument("crop_dir", nargs="?", help="directory of vehicle crops (default: synthetic set)")
+    parser.add_argument("--threads", type=int, default=None, help="torch threads")
+    args = parser.parse_args()
+
+    crops = load_crops(args.crop_dir)
+    print(f"{len(crops)} crops, threads: {args.threads or 'torch default'}\n")
+
+    reference = None
+    for name, options in MODES:
+        classifier = VehicleMakeModelClassifier(num_threads=args.threads, **options)
+        results, crops_per_second = run(classifier, crops)
+        if reference is None:
+            reference = results
+        agreement = np.mean([r["make_model"] == ref["make_model"] for r, ref in zip(results, reference)])
+        drift = np.mean([abs(r["confidence"] - ref["confidence"]) for r, ref in zip(results, reference)])
+        print(f"{name:<16} {crops_per_second:7.1f} crops/s, top-1 agreement {agreement * 100:5.1f}%, "
+              f"mean confidence drift {drift:.4f}")
+
+if __name__ == "__main__":
+    main()
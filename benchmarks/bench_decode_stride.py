@@ -0,0 +1,79 @@
+"""
+Decode cost of analyzing every Nth frame, and of starting mid-video.
+
+Renders a synthetic traffic video (src/generate_demo_video.py) and, for each
+stride, times a pass that read()s every frame and drops the unanalyzed ones
+(what a naive analysis-rate limit does) against one that grab()s the skipped
+frames and read()s only the analyzed ones (src/frame_stride.py). "source fps"
+is video frames consumed per second, i.e. how far ahead of real time decoding
+runs. Then times reaching the middle of the video by seeking versus decoding
+from frame 0. Run from the repository root:
+    python -m benchmarks.bench_decode_stride [--frames 300] [--resolution 1920x1080]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+
+from src.frame_stride import read_frame
+from src.generate_demo_video import generate_demo_video
+
+def decode_pass(path, stride, grab):
+    cap = cv2.VideoCapture(path)
+    consumed = 0
+    start = time.perf_counter()
+    while True:
+        if grab:
+            ret, _ = read_frame(cap, stride - 1 if consumed else 0)
+            consumed += stride if consumed else 1
+        else:
+            ret, _ = cap.read()
+            consumed += 1
+        if not ret:
+            break
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return elapsed
+
+def time_to_frame(path, target, seek):
+    cap = cv2.VideoCapture(path)
+    start = time.perf_counter()
+    if seek:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+    else:
+        for _ in range(target):
+            cap.grab()
+    cap.read()
+    elapsed = time.perf_counter() - start
+    cap.release()
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare read() and grab()-skipping decode throughput.")
+    parser.add_argument("--frames", type=int, default=300)
+    parser.add_argument("--resolution", default="1920x1080")
+    parser.add_argument("--strides", type=int, nargs="+", default=[1, 2, 3, 6, 15])
+    args = parser.parse_args()
+    width, height = map(int, args.resolution.split("x"))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "source.mp4")
+        generate_demo_video(path, num_frames=args.frames, num_cars=10, width=width, height=height)
+        print(f"{args.frames} frames at {width}x{height}")
+        print(f"{'stride':>6}{'read all fps':>14}{'grab/read fps':>15}{'speedup':>9}")
+        for stride in args.strides:
+            read_all = decode_pass(path, stride, grab=False)
+            strided = decode_pass(path, stride, grab=True)
+            print(f"{stride:>6}{args.frames / read_all:>14.1f}{args.frames / strided:>15.1f}"
+                  f"{read_all / strided:>8.2f}x")
+
+        target = args.frames // 2
+        decoded = time_to_frame(path, target, seek=False)
+        sought = time_to_frame(path, target, seek=True)
+        print(f"Reaching frame {target}: decode from 0 {decoded * 1000:.0f} ms, seek {sought * 1000:.0f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Memory and GC cost of keeping results as per-detection dicts vs. a DetectionStore.
+
+Simulates a long run (default 1M detections, ~8 vehicles per frame) and prints
+the bytes held per detection and the time of a full garbage collection.
+Run from the repository root:
+    python -m benchmarks.bench_detection_store [detections]
+"""
+
+import gc
+import random
+import sys
+import time
+import tracemalloc
+
+from src.detection_store import DetectionStore
+
+VEHICLES_PER_FRAME = 8
+MAKE_MODELS = [f"Make {i} Model {i}" for i in range(200)] + ["Unknown"]
+CLASSES = ["car", "motorcycle", "bus", "truck"]
+
+def fake_frames(detections):
+    rng = random.Random(0)
+    for frame_id in range(detections // VEHICLES_PER_FRAME):
+        rows = []
+        for i in range(VEHICLES_PER_FRAME):
+            x = rng.uniform(0, 1800)
+            rows.append({
+                "id": frame_id // 30 * VEHICLES_PER_FRAME + i,
+                "bbox": [x, 300.0, x + 120.0, 380.0],
+                "class": rng.choice(CLASSES),
+                "confidence": rng.random(),
+                "make_model": rng.choice(MAKE_MODELS),
+                "make_model_confidence": rng.random(),
+                "license_plate": f"{rng.randrange(10000):04d}ABC" if rng.random() < 0.3 else "N/A",
+                "plate_confidence": rng.random(),
+            })
+        yield frame_id, rows
+
+def fill_dicts(detections):
+    results = []
+    for frame_id, rows in fake_frames(detections):
+        for d in rows:
+            results.append({
+                "frame_id": frame_id,
+                "vehicle_id": d["id"],
+                "vehicle_class": d["class"],
+                "detection_confidence": d["confidence"],
+                "make_model": d["make_model"],
+                "make_model_confidence": d["make_model_confidence"],
+                "license_plate": d["license_plate"],
+                "plate_confidence": d["plate_confidence"],
+                "bbox": d["bbox"]
+            })
+    return results
+
+def fill_store(detections):
+    store = DetectionStore()
+    for frame_id, rows in fake_frames(detections):
+        store.append_frame(frame_id, [d["id"] for d in rows], [d["bbox"] for d in rows],
+                           [d["class"] for d in rows], [d["confidence"] for d in rows],
+                           [d["make_model"] for d in rows], [d["make_model_confidence"] for d in rows],
+                           [d["license_plate"] for d in rows], [d["plate_confidence"] for d in rows])
+    return store
+
+def measure(name, fill, detections):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = fill(detections)
+    fill_time = time.perf_counter() - start
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    gc.collect()
+    gc_time = time.perf_counter() - start
+
+    print(f"{name:<16} {held / len(results):8.1f} B/detection held, peak {peak / 2**20:7.1f} MB, "
+          f"fill {fill_time:5.1f}s, full GC {gc_time * 1000:7.1f} ms")
+    return held
+
+def main():
+    detections = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{detections} detections, {VEHICLES_PER_FRAME} per frame\n")
+    dict_bytes = measure("list of dicts", fill_dicts, detections)
+    store_bytes = measure("DetectionStore", fill_store, detections)
+    print(f"\nMemory reduction: {dict_bytes / store_bytes:.1f}x")
+
+if __name__ == "__main__":
+    main()
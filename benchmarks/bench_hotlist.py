@@ -0,0 +1,86 @@
+"""
+Lookup latency of the fuzzy plate hotlist at scale.
+
+Builds a hotlist of random plates (default 1M) and times lookups of reads that
+are exact, OCR-confused (O/0, I/1, B/8, ...), one edit away and not listed,
+against a naive scan that computes the edit distance to every plate.
+Run from the repository root:
+    python -m benchmarks.bench_hotlist [entries]
+"""
+
+import random
+import sys
+import time
+
+import numpy as np
+
+from src.hotlist import Hotlist, canonical_plate, edit_distance
+
+LETTERS = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+DIGITS = "0123456789"
+# Letter/digit layouts of common plate formats
+FORMATS = ["LLLDDDD", "DLLLDDD", "LLDDLLL", "LLLDDD", "DDDLLL", "LDDDLLL"]
+CONFUSE = {"0": "O", "1": "I", "8": "B", "5": "S", "2": "Z", "O": "0", "I": "1", "B": "8"}
+
+def random_plate(rng):
+    return "".join(rng.choice(LETTERS if kind == "L" else DIGITS) for kind in rng.choice(FORMATS))
+
+def confused(plate, rng):
+    positions = [i for i, char in enumerate(plate) if char in CONFUSE]
+    if not positions:
+        return plate
+    i = rng.choice(positions)
+    return plate[:i] + CONFUSE[plate[i]] + plate[i + 1:]
+
+def one_edit(plate, rng):
+    i = rng.randrange(len(plate))
+    edit = rng.choice(("substitute", "delete", "insert"))
+    if edit == "substitute":
+        return plate[:i] + rng.choice(LETTERS + DIGITS) + plate[i + 1:]
+    if edit == "delete":
+        return plate[:i] + plate[i + 1:]
+    return plate[:i] + rng.choice(LETTERS + DIGITS) + plate[i:]
+
+def time_lookups(hotlist, reads):
+    latencies = []
+    hits = 0
+    for read in reads:
+        start = time.perf_counter()
+        hits += bool(hotlist.lookup(read))
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1e6
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), hits
+
+def main(entries=1_000_000, queries=2000):
+    rng = random.Random(0)
+    plates = [random_plate(rng) for _ in range(entries)]
+
+    start = time.perf_counter()
+    hotlist = Hotlist(plates, max_distance=1)
+    build = time.perf_counter() - start
+    index_mb = (hotlist._hashes.nbytes + hotlist._ids.nbytes) / 1e6
+    print(f"Hotlist of {len(hotlist):,} plates: built in {build:.1f}s, index arrays {index_mb:.0f} MB")
+
+    listed = rng.sample(plates, queries)
+    cases = {
+        "exact": listed,
+        "ocr-confused": [confused(plate, rng) for plate in listed],
+        "one edit": [one_edit(plate, rng) for plate in listed],
+        "not listed": [random_plate(rng) + "X" for _ in range(queries)],
+    }
+    print(f"{'reads':<14}{'p50 us':>10}{'p99 us':>10}{'hit rate':>10}")
+    for name, reads in cases.items():
+        p50, p99, hits = time_lookups(hotlist, reads)
+        print(f"{name:<14}{p50:>10.1f}{p99:>10.1f}{hits / len(reads):>10.1%}")
+
+    # Naive scan for comparison, on a few reads only
+    canonicals = [canonical_plate(plate) for plate in plates]
+    start = time.perf_counter()
+    for read in cases["one edit"][:3]:
+        query = canonical_plate(read)
+        [plate for plate in canonicals if edit_distance(query, plate, 1) <= 1]
+    naive = (time.perf_counter() - start) / 3
+    print(f"Naive scan: {naive * 1e3:.0f} ms per read")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
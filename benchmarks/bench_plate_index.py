@@ -0,0 +1,104 @@
+"""
+Ingest rate and query latency of the plate/vehicle search index.
+
+Writes a synthetic multi-camera results CSV (default 1M rows: vehicles seen
+for several frames each, 1 in 5 without a plate read), ingests it into a
+fresh index, then times substring, fuzzy, camera/time and make/model
+queries, and an append of new rows.
+Run from the repository root:
+    python -m benchmarks.bench_plate_index [rows]
+"""
+
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from benchmarks.bench_hotlist import one_edit, random_plate
+from src.plate_index import PlateIndex
+
+MAKES = ["Toyota Corolla", "Honda Civic", "Ford Transit", "Kia Rio", "BMW 3 Series", "Tesla Model 3",
+         "Volkswagen Golf", "Nissan Leaf"]
+CLASSES = ["car", "car", "car", "truck", "bus", "motorcycle"]
+COLUMNS = ["timestamp", "stream_id", "frame_id", "vehicle_id", "vehicle_class", "detection_confidence",
+           "make_model", "make_model_confidence", "license_plate", "plate_confidence", "bbox"]
+
+def write_results(path, rows, rng, start=datetime(2024, 1, 1), first_vehicle=0, header=True):
+    """Write `rows` result rows; returns the plates used."""
+    plates = []
+    with open(path, "a", newline="") as f:
+        writer = csv.writer(f)
+        if header:
+            writer.writerow(COLUMNS)
+        written = 0
+        vehicle_id = first_vehicle
+        while written < rows:
+            vehicle_id += 1
+            plate = random_plate(rng)
+            plates.append(plate)
+            camera = rng.randrange(16)
+            seen = start + timedelta(seconds=vehicle_id * 2)
+            make, vehicle_class = rng.choice(MAKES), rng.choice(CLASSES)
+            for k in range(min(rng.randint(3, 12), rows - written)):
+                read = plate if rng.random() > 0.2 else "N/A"
+                writer.writerow([(seen + timedelta(seconds=k / 10)).isoformat(), camera, vehicle_id * 60 + k,
+                                 vehicle_id, vehicle_class, 0.9, make, 0.7, read, 0.8, "[1, 2, 3, 4]"])
+                written += 1
+    return plates
+
+def time_queries(index, name, queries, **kwargs):
+    latencies = []
+    results = 0
+    for query in queries:
+        start = time.perf_counter()
+        results += len(index.search(query, **kwargs))
+        latencies.append(time.perf_counter() - start)
+    latencies = np.array(latencies) * 1e3
+    print(f"{name:<26}{np.percentile(latencies, 50):>10.2f}{np.percentile(latencies, 99):>10.2f}"
+          f"{results / len(queries):>12.1f}")
+
+def main(rows=1_000_000, queries=200):
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = os.path.join(tmp, "multi_camera_results.csv")
+        plates = write_results(results, rows, rng)
+        csv_mb = os.path.getsize(results) / 1e6
+
+        index = PlateIndex(os.path.join(tmp, "index.db"))
+        try:
+            start = time.perf_counter()
+            index.ingest(results)
+            ingest = time.perf_counter() - start
+            db_mb = sum(os.path.getsize(os.path.join(tmp, name)) for name in os.listdir(tmp)
+                        if name.startswith("index.db")) / 1e6
+            stats = index.stats()
+            print(f"Ingested {stats['detections']:,} rows ({stats['plates']:,} plates, {csv_mb:.0f} MB CSV) "
+                  f"in {ingest:.1f}s ({stats['detections'] / ingest:,.0f} rows/s), index {db_mb:.0f} MB")
+
+            sample = rng.sample(plates, queries)
+            print(f"{'query':<26}{'p50 ms':>10}{'p99 ms':>10}{'results':>12}")
+            time_queries(index, "exact plate", sample)
+            time_queries(index, "4-char substring", [plate[1:5] for plate in sample], limit=20)
+            time_queries(index, "fuzzy 1 edit", [one_edit(plate, rng) for plate in sample], fuzzy=1)
+            time_queries(index, "plate, camera + day", sample, camera=3, since="2024-01-02", until="2024-01-03")
+            time_queries(index, "camera + hour", [None] * 20, camera=5, since="2024-01-03T10:00",
+                         until="2024-01-03T11:00")
+            time_queries(index, "make/model + hour", [None] * 20, make_model="Transit", since="2024-01-03T10:00",
+                         until="2024-01-03T11:00")
+            time_queries(index, "make/model, all time", [None] * 5, make_model="Transit", limit=20)
+
+            # A streaming sink appends; re-ingesting reads only the new bytes
+            write_results(results, 10000, rng, start=datetime(2024, 6, 1), first_vehicle=10 ** 7, header=False)
+            start = time.perf_counter()
+            added = index.ingest(results)
+            print(f"Append of {added:,} rows ingested in {(time.perf_counter() - start) * 1e3:.0f} ms")
+        finally:
+            index.close()
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000)
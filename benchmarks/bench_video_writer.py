@@ -0,0 +1,104 @@
+"""
+Encode throughput, caller blocking time, output size and quality of the video writers.
+
+Renders a synthetic traffic video (src/generate_demo_video.py, with mild
+sensor noise so the encoders have texture to deal with), draws the usual
+overlays on it, keeps the frames in memory and writes them with the OpenCV
+mp4v writer and with FFmpegVideoWriter at several codec/preset settings.
+"write ms" is the time the caller spends in write() per frame, the part the
+pipeline's writer thread waits for; fps includes finishing the file.
+Quality is the mean PSNR of the decoded output against the input frames.
+Run from the repository root:
+    python -m benchmarks.bench_video_writer [--frames 90] [--resolution 1920x1080]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import cv2
+import numpy as np
+
+from src.generate_demo_video import generate_demo_video
+from src.renderer import draw_overlays
+from src.video_writer import find_ffmpeg, open_video_writer
+
+CONFIGS = [
+    ("opencv mp4v", {"backend": "opencv"}),
+    ("x264 ultrafast crf23", {"backend": "ffmpeg", "codec": "libx264", "preset": "ultrafast", "crf": 23}),
+    ("x264 veryfast crf23", {"backend": "ffmpeg", "codec": "libx264", "preset": "veryfast", "crf": 23}),
+    ("x264 veryfast crf28", {"backend": "ffmpeg", "codec": "libx264", "preset": "veryfast", "crf": 28}),
+    ("x264 medium crf23", {"backend": "ffmpeg", "codec": "libx264", "preset": "medium", "crf": 23}),
+    ("x265 ultrafast crf28", {"backend": "ffmpeg", "codec": "libx265", "preset": "ultrafast", "crf": 28}),
+]
+
+def load_frames(frames, width, height, noise, tmp):
+    path = os.path.join(tmp, "source.mp4")
+    generate_demo_video(path, num_frames=frames, num_cars=10, width=width, height=height)
+    rng = np.random.default_rng(0)
+    cap = cv2.VideoCapture(path)
+    loaded = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if noise:
+            frame = cv2.add(frame, rng.normal(0, noise, frame.shape).astype(np.int8), dtype=cv2.CV_8U)
+        boxes = [{"bbox": (x, height // 3, x + width // 12, height // 3 + height // 10), "make_model": "Toyota Corolla",
+                  "license_plate": "ABC123"} for x in range(50, width - width // 12, width // 8)]
+        draw_overlays(frame, boxes, len(boxes))
+        loaded.append(frame)
+    cap.release()
+    return loaded
+
+def mean_psnr(path, frames, step=10):
+    cap = cv2.VideoCapture(path)
+    scores = []
+    for i in range(len(frames)):
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if i % step == 0:
+            scores.append(cv2.PSNR(frames[i], frame))
+    cap.release()
+    return float(np.mean(scores)) if scores else float("nan")
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the video writer backends.")
+    parser.add_argument("--frames", type=int, default=90)
+    parser.add_argument("--resolution", default="1920x1080")
+    parser.add_argument("--noise", type=float, default=3.0, help="std-dev of added sensor noise")
+    parser.add_argument("--threads", type=int, default=0, help="ffmpeg encoder threads (0 = auto)")
+    args = parser.parse_args()
+    width, height = map(int, args.resolution.split("x"))
+
+    if find_ffmpeg() is None:
+        print("ffmpeg not found: only the OpenCV writer can be measured")
+    print(f"CPU cores: {os.cpu_count()}")
+    with tempfile.TemporaryDirectory() as tmp:
+        frames = load_frames(args.frames, width, height, args.noise, tmp)
+        print(f"{len(frames)} frames at {width}x{height}")
+        print(f"{'writer':<24}{'fps':>8}{'write ms':>10}{'MB':>8}{'Mbit/s':>8}{'PSNR dB':>9}")
+        for name, options in CONFIGS:
+            if options["backend"] == "ffmpeg":
+                if find_ffmpeg() is None:
+                    continue
+                options = {**options, "threads": args.threads}
+            path = os.path.join(tmp, name.replace(" ", "_") + ".mp4")
+            start = time.perf_counter()
+            writer = open_video_writer(path, 30, (width, height), **options)
+            blocked = 0.0
+            for frame in frames:
+                write_start = time.perf_counter()
+                writer.write(frame)
+                blocked += time.perf_counter() - write_start
+            writer.release()
+            elapsed = time.perf_counter() - start
+            size_mb = os.path.getsize(path) / 1e6
+            bitrate = size_mb * 8 / (len(frames) / 30)
+            print(f"{name:<24}{len(frames) / elapsed:>8.1f}{blocked * 1000 / len(frames):>10.2f}"
+                  f"{size_mb:>8.2f}{bitrate:>8.2f}{mean_psnr(path, frames):>9.1f}")
+
+if __name__ == "__main__":
+    main()
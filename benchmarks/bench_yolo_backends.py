@@ -0,0 +1,53 @@
+"""
+CPU latency of the YOLO backends (PyTorch, ONNX Runtime, OpenVINO, int8).
+
+Exports each backend on first use (cached next to the weights), then times
+predict() on a 1280x720 frame. Backends whose runtime is missing are skipped.
+Run from the repository root:
+    python -m benchmarks.bench_yolo_backends [runs]
+"""
+
+import importlib.util
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from src.detector import VEHICLE_CLASSES
+from src.yolo_export import BACKENDS, export_yolo
+
+RUNTIMES = {"onnx": "onnxruntime", "onnx-int8": "onnxruntime",
+            "openvino": "openvino", "openvino-int8": "openvino"}
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+
+    from ultralytics import YOLO
+    from ultralytics.utils import ASSETS
+
+    frame = cv2.resize(cv2.imread(str(ASSETS / "bus.jpg")), (1280, 720))
+    print(f"{runs} runs per backend, 1280x720 frame\n")
+
+    baseline = None
+    for backend in BACKENDS:
+        runtime = RUNTIMES.get(backend)
+        if runtime and importlib.util.find_spec(runtime) is None:
+            print(f"{backend:<14} skipped ({runtime} not installed)")
+            continue
+        model = YOLO(export_yolo("yolo11n.pt", backend), task="detect")
+        for _ in range(3):
+            model.predict(frame, classes=VEHICLE_CLASSES, verbose=False)
+
+        times = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            model.predict(frame, classes=VEHICLE_CLASSES, verbose=False)
+            times.append(time.perf_counter() - start)
+        p50, p95 = np.percentile(times, [50, 95]) * 1000
+        baseline = baseline or p50
+        print(f"{backend:<14} p50 {p50:6.1f} ms, p95 {p95:6.1f} ms, {1000 / p50:5.1f} fps, "
+              f"{baseline / p50:4.2f}x vs pytorch")
+
+if __name__ == "__main__":
+    main()
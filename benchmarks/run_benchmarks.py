@@ -0,0 +1,340 @@
+"""
+Per-stage and end-to-end benchmark suite with regression tracking.
+
+Generates a synthetic video with src/generate_demo_video.py at the requested
+vehicle density and resolution, times every stage on its own (decode,
+track_and_count, detect_vehicles, classify, scan_plate, overlay drawing,
+encode, result saving) and the full per-frame pipeline, and writes p50/p95/p99
+latency and fps per stage as JSON. Stages share one process, so memory is
+reported as the process's peak RSS after each stage (cumulative_peak_rss_mb,
+a high-water mark that includes every earlier stage) and for the whole run
+(peak_rss_mb); run a single --stages entry to see one stage's own peak.
+With --baseline, the run is compared with an earlier JSON file and the exit
+code is 1 on a regression.
+
+Run from the repository root:
+    python -m benchmarks.run_benchmarks --frames 200 --cars 12 --resolution 1920x1080 \\
+        --output data/bench.json --baseline data/bench_baseline.json
+    python -m benchmarks.run_benchmarks --stages decode,overlay,encode,save   # no models needed
+"""
+
+import argparse
+import json
+import os
+import platform
+import resource
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from src.generate_demo_video import generate_demo_video
+from src.video_writer import open_video_writer
+
+# "save" runs last so it saves the rows of the end_to_end run
+STAGES = ["decode", "track_and_count", "detect_vehicles", "classify", "scan_plate",
+          "overlay", "encode", "end_to_end", "save"]
+# Stages that need no model weights
+MODEL_FREE_STAGES = ["decode", "overlay", "encode", "save"]
+
+def peak_rss_mb():
+    """Peak resident set size of this process so far, in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+def summarize(durations):
+    """Latency percentiles (ms) and throughput of a list of per-call durations (s)."""
+    if not durations:
+        return {"calls": 0}
+    ms = np.asarray(durations) * 1000
+    p50, p95, p99 = np.percentile(ms, [50, 95, 99])
+    return {
+        "calls": len(durations),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(p50), 3),
+        "p95_ms": round(float(p95), 3),
+        "p99_ms": round(float(p99), 3),
+        "fps": round(len(durations) / float(np.sum(durations)), 2),
+    }
+
+def read_frames(video_path):
+    cap = cv2.VideoCapture(video_path)
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                return
+            yield frame
+    finally:
+        cap.release()
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+class BenchmarkContext:
+    """State shared between stages: the video, the pipeline and sample crops."""
+
+    def __init__(self, video_path, work_dir, crop_limit):
+        self.video_path = video_path
+        self.work_dir = work_dir
+        self.crop_limit = crop_limit
+        self.pipeline = None
+        # Vehicle crops found by the tracker stage, reused by classify/scan_plate
+        self.crops = []
+        self.detections = {}
+
+    def get_pipeline(self):
+        if self.pipeline is None:
+            from main import VehicleAnalysisPipeline
+            self.pipeline = VehicleAnalysisPipeline()
+        return self.pipeline
+
+    def sample_crops(self):
+        if self.crops:
+            return self.crops
+        # Nothing detected (or the tracker stage was skipped): fixed center crops
+        crops = []
+        for frame in read_frames(self.video_path):
+            height, width = frame.shape[:2]
+            crops.append(frame[height // 3:height // 3 * 2, width // 3:width // 3 * 2].copy())
+            if len(crops) >= self.crop_limit:
+                break
+        return crops
+
+def bench_decode(ctx):
+    cap = cv2.VideoCapture(ctx.video_path)
+    durations = []
+    while True:
+        (ret, _), seconds = timed(cap.read)
+        if not ret:
+            break
+        durations.append(seconds)
+    cap.release()
+    return durations
+
+def bench_track_and_count(ctx):
+    tracker = ctx.get_pipeline().tracker
+    tracker.reset()
+    durations = []
+    for frame_id, frame in enumerate(read_frames(ctx.video_path)):
+        (detections, _), seconds = timed(tracker.track_and_count, frame)
+        durations.append(seconds)
+        ctx.detections[frame_id] = detections
+        for detection in detections:
+            if len(ctx.crops) >= ctx.crop_limit:
+                break
+            x1, y1, x2, y2 = map(int, detection['bbox'])
+            crop = frame[max(0, y1):y2, max(0, x1):x2]
+            if crop.size:
+                ctx.crops.append(crop.copy())
+    return durations
+
+def bench_detect_vehicles(ctx):
+    detector = ctx.get_pipeline().detector
+    return [timed(detector.detect_vehicles, frame)[1] for frame in read_frames(ctx.video_path)]
+
+def bench_classify(ctx):
+    classifier = ctx.get_pipeline().classifier
+    return [timed(classifier.classify, crop)[1] for crop in ctx.sample_crops()]
+
+def bench_scan_plate(ctx):
+    scanner = ctx.get_pipeline().lpr_scanner
+    return [timed(scanner.scan_plate, crop)[1] for crop in ctx.sample_crops()]
+
+def _overlay_detections(ctx, frame_id, frame):
+    detections = ctx.detections.get(frame_id)
+    if detections is None:
+        # Fixed boxes so drawing cost doesn't depend on the tracker stage
+        height, width = frame.shape[:2]
+        detections = [{"bbox": [x, height // 3, x + width // 10, height // 3 + height // 12],
+                       "make_model": "Make Model", "license_plate": "ABC123"}
+                      for x in range(0, width - width // 10, width // 8)]
+    return detections
+
+def bench_overlay(ctx):
+    # Models load lazily, so drawing needs none of them
+    pipeline = ctx.get_pipeline()
+    durations = []
+    for frame_id, frame in enumerate(read_frames(ctx.video_path)):
+        detections = _overlay_detections(ctx, frame_id, frame)
+        durations.append(timed(pipeline.draw_overlays, frame, detections, len(detections))[1])
+    return durations
+
+def bench_encode(ctx):
+    cap = cv2.VideoCapture(ctx.video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    cap.release()
+    # The writer process_video uses (ffmpeg when available, see src/video_writer.py)
+    out = open_video_writer(os.path.join(ctx.work_dir, "encoded.mp4"), fps, size)
+    durations = [timed(out.write, frame)[1] for frame in read_frames(ctx.video_path)]
+    # A piped writer finishes encoding on release; charge that to the last frame
+    durations[-1] += timed(out.release)[1]
+    return durations
+
+def bench_save(ctx):
+    pipeline = ctx.get_pipeline()
+    if not pipeline.results:
+        # No end_to_end run: synthetic rows, one per car per frame
+        for frame_id in range(sum(1 for _ in read_frames(ctx.video_path))):
+            boxes = _overlay_detections(ctx, frame_id, np.zeros((720, 1280, 3), dtype=np.uint8))
+            count = len(boxes)
+            pipeline.results.append_frame(frame_id, list(range(count)), [d["bbox"] for d in boxes],
+                                          ["car"] * count, [0.9] * count, ["Make Model"] * count,
+                                          [0.5] * count, ["ABC123"] * count, [0.8] * count)
+    path = os.path.join(ctx.work_dir, "results.csv")
+    # First call pays the pandas import
+    pipeline.save_results(path)
+    return [timed(pipeline.save_results, path)[1] for _ in range(5)]
+
+def bench_end_to_end(ctx):
+    """decode + process_frame + overlay + encode per frame, like process_video."""
+    pipeline = ctx.get_pipeline()
+    pipeline.tracker.reset()
+    pipeline.track_cache.entries.clear()
+    cap = cv2.VideoCapture(ctx.video_path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+    out = open_video_writer(os.path.join(ctx.work_dir, "end_to_end.mp4"), fps, size)
+    durations = []
+    frame_id = 0
+    while True:
+        start = time.perf_counter()
+        ret, frame = cap.read()
+        if not ret:
+            break
+        total_count, detections = pipeline.process_frame(frame, frame_id)
+        pipeline.draw_overlays(frame, detections, total_count)
+        out.write(frame)
+        durations.append(time.perf_counter() - start)
+        frame_id += 1
+    cap.release()
+    durations[-1] += timed(out.release)[1]
+    return durations
+
+BENCHMARKS = {name: globals()[f"bench_{name}"] for name in STAGES}
+
+def compare(current, baseline, threshold):
+    """
+    Compare two benchmark reports stage by stage.
+    Returns:
+        list of (stage, metric, baseline_value, current_value) regressions
+    """
+    regressions = []
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or not stats.get("calls") or not before.get("calls"):
+            continue
+        for metric in ("p50_ms", "p95_ms"):
+            if stats[metric] > before[metric] * (1 + threshold):
+                regressions.append((stage, metric, before[metric], stats[metric]))
+    peak, peak_before = current.get("peak_rss_mb"), baseline.get("peak_rss_mb")
+    if peak and peak_before and peak > peak_before * (1 + threshold):
+        regressions.append(("process", "peak_rss_mb", peak_before, peak))
+    return regressions
+
+def run(stages, frames, cars, resolution, crop_limit=64, warm_up=True, keep_work_dir=False):
+    """
+    Run the selected stage benchmarks on a freshly generated synthetic video.
+    Args:
+        keep_work_dir: keep the synthetic video and stage outputs (path is
+            printed) instead of deleting them
+    Returns:
+        report dict (the JSON written by main)
+    """
+    work_dir = tempfile.mkdtemp(prefix="bench_")
+    try:
+        return _run(stages, frames, cars, resolution, crop_limit, warm_up, work_dir)
+    finally:
+        if keep_work_dir:
+            print(f"Benchmark artifacts kept in {work_dir}")
+        else:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+def _run(stages, frames, cars, resolution, crop_limit, warm_up, work_dir):
+    width, height = resolution
+    video_path = os.path.join(work_dir, "bench_video.mp4")
+    generate_demo_video(video_path, num_frames=frames, num_cars=cars, width=width, height=height)
+    ctx = BenchmarkContext(video_path, work_dir, crop_limit)
+
+    if warm_up and any(stage not in MODEL_FREE_STAGES for stage in stages):
+        ctx.get_pipeline().warm_up()
+
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "config": {"frames": frames, "cars": cars, "resolution": f"{width}x{height}", "stages": stages},
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "opencv": cv2.__version__,
+            "numpy": np.__version__,
+        },
+        "stages": {},
+    }
+    for stage in stages:
+        print(f"Benchmarking {stage}...")
+        stats = summarize(BENCHMARKS[stage](ctx))
+        # ru_maxrss never goes down: this is the peak up to and including this stage
+        stats["cumulative_peak_rss_mb"] = round(peak_rss_mb(), 1)
+        report["stages"][stage] = stats
+    report["peak_rss_mb"] = round(peak_rss_mb(), 1)
+    return report
+
+def print_report(report):
+    print(f"\n{'stage':<16} {'calls':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'fps':>9} {'cum. peak MB':>13}")
+    for stage, stats in report["stages"].items():
+        if not stats.get("calls"):
+            print(f"{stage:<16} {0:>6}")
+            continue
+        print(f"{stage:<16} {stats['calls']:>6} {stats['p50_ms']:>9.2f} {stats['p95_ms']:>9.2f} "
+              f"{stats['p99_ms']:>9.2f} {stats['fps']:>9.1f} {stats['cumulative_peak_rss_mb']:>13.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-stage pipeline benchmarks with regression tracking.")
+    parser.add_argument("--frames", type=int, default=100, help="frames in the synthetic video")
+    parser.add_argument("--cars", type=int, default=3, help="vehicles on screen (density)")
+    parser.add_argument("--resolution", default="1280x720", help="WIDTHxHEIGHT of the synthetic video")
+    parser.add_argument("--stages", default=",".join(STAGES), help=f"comma-separated subset of {STAGES}")
+    parser.add_argument("--output", default="data/benchmark.json", help="JSON report to write")
+    parser.add_argument("--baseline", help="earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown (p50/p95/peak RSS) that counts as a regression")
+    parser.add_argument("--keep-work-dir", action="store_true",
+                        help="keep the synthetic video and stage outputs instead of deleting them")
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(",") if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stages {unknown}, expected a subset of {STAGES}")
+    width, height = (int(v) for v in args.resolution.lower().split("x"))
+
+    report = run(stages, args.frames, args.cars, (width, height), keep_work_dir=args.keep_work_dir)
+    print_report(report)
+
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nReport written to {args.output} (peak RSS {report['peak_rss_mb']:.1f} MB)")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nRegressions against {args.baseline} (> {args.threshold:.0%} slower):")
+            for stage, metric, before, after in regressions:
+                print(f"  {stage} {metric}: {before:.2f} -> {after:.2f}")
+            sys.exit(1)
+        print(f"\nNo regressions against {args.baseline}.")
+
+if __name__ == "__main__":
+    main()
@@ -10,70 +10,169 @@ This script integrates:
 
 import cv2
 import os
-import pandas as pd
+import queue
+import threading
+import time
 from datetime import datetime
 from src.detector import VehicleDetector
 from src.tracker import VehicleTracker
 from src.classifier import VehicleMakeModelClassifier
 from src.lpr import LicensePlateScanner
+from src.model_registry import warm_up as warm_up_models
+from src.track_cache import TrackResultCache
+from src.result_sink import open_result_sink
+from src.detection_store import DetectionStore
+from src.track_aggregator import TrackAggregator
+from src.hotlist import HotlistMonitor
+from src.renderer import draw_overlays
+from src.video_writer import open_video_writer
+from src.frame_stride import analysis_stride, read_frame, time_range_frames
+from src import metrics
 
 class VehicleAnalysisPipeline:
-    def __init__(self):
+    def __init__(self, track_cache=None, result_sink=None, track_aggregator=None, per_frame_results=True,
+                 motion_gate=None, roi=None, yolo_backend=None, metrics_port=None, best_shot=None,
+                 hotlist=None):
+        """
+        Args:
+            track_cache: TrackResultCache controlling when make/model
+                results are recomputed for a track (default: TrackResultCache())
+            result_sink: path (.csv, .parquet, .db) or BackgroundSinkWriter that
+                result rows are streamed to instead of being kept in self.results
+                (a columnar DetectionStore)
+            track_aggregator: TrackAggregator building one summary row per vehicle
+                and deciding when to re-read plates (default: TrackAggregator())
+            per_frame_results: also keep one result row per vehicle per frame;
+                False keeps only the per-vehicle summaries
+            motion_gate: optional MotionGate that skips detection on static frames
+            roi: optional RegionOfInterest (see src/roi.py) limiting inference to
+                the camera's lanes of interest
+            yolo_backend: YOLO backend ('pytorch', 'onnx', 'openvino', ...; default
+                $YOLO_BACKEND or 'pytorch', see src/yolo_export.py)
+            metrics_port: serve stage latencies, queue depths and lag in Prometheus
+                format on this local port (see src/metrics.py); None = metrics off
+            best_shot: optional BestShotSelector; make/model and plates are then
+                analyzed once per track on its best-quality crops (see
+                src/best_shot.py) instead of on the frame cadence
+            hotlist: hotlist CSV path or HotlistMonitor (see src/hotlist.py);
+                every plate read is fuzzy-matched against it and hits raise alerts
+        """
         print("Initializing Vehicle Analysis Pipeline...")
-        self.detector = VehicleDetector()
-        self.tracker = VehicleTracker()
+        if metrics_port is not None:
+            metrics.start_http_server(metrics_port)
+        self.detector = VehicleDetector(roi=roi, backend=yolo_backend)
+        self.tracker = VehicleTracker(motion_gate=motion_gate, roi=roi, backend=yolo_backend)
         self.classifier = VehicleMakeModelClassifier()
         self.lpr_scanner = LicensePlateScanner()
-        self.results = []
+        self.track_cache = track_cache if track_cache is not None else TrackResultCache()
+        self.result_sink = open_result_sink(result_sink) if isinstance(result_sink, str) else result_sink
+        self.results = DetectionStore()
+        self.aggregator = track_aggregator if track_aggregator is not None else \
+            TrackAggregator(max_age=self.track_cache.max_age)
+        self.per_frame_results = per_frame_results
+        self.best_shot = best_shot
+        self.hotlist = HotlistMonitor(hotlist) if isinstance(hotlist, str) else hotlist
+        # One row per vehicle, added when its track ends
+        self.track_summaries = []
+        # Seconds spent per stage during the last process_video run
+        self.stage_timings = {'decode': 0.0, 'inference': 0.0, 'encode': 0.0}
         print("Pipeline ready.\n")
 
+    def warm_up(self, parallel=True, dummy_pass=True):
+        """
+        Load every model the pipeline uses before the first frame arrives.
+        Args:
+            parallel: load the models concurrently in a thread pool
+            dummy_pass: run one dummy inference per model to absorb first-call costs
+        Returns:
+            dict of per-model load and warm-up seconds
+        """
+        return warm_up_models([self.tracker, self.classifier, self.lpr_scanner],
+                              parallel=parallel, dummy_pass=dummy_pass)
+
+    def _tracks_to_refresh(self, detections, crops, stage, frame_id):
+        """Indices of detections whose `stage` result has to be (re)computed."""
+        indices = []
+        for i, (detection, crop) in enumerate(zip(detections, crops)):
+            if crop.size == 0:
+                continue
+            if stage == 'plate':
+                # Plates are re-read until the track's consensus is stable
+                if self.aggregator.needs_plate_read(detection['id'], frame_id):
+                    indices.append(i)
+                continue
+            crop_area = crop.shape[0] * crop.shape[1]
+            if self.track_cache.needs_refresh(detection['id'], stage, frame_id, crop_area):
+                indices.append(i)
+        return indices
+
     def process_frame(self, frame, frame_id):
         """Process a single frame through the complete pipeline."""
         # Step 1: Track vehicles
         detections, total_count = self.tracker.track_and_count(frame)
+        metrics.set_gauge("active_tracks", len(detections), pipeline="video")
         
         # Store enhanced detection data for display
         enhanced_detections = []
         
+        # Forget vehicles that have left the scene, summarizing their tracks
+        self.aggregator.update(frame_id, detections)
+        if self.best_shot is not None:
+            # Ending tracks get their last best-shot analysis before the summary
+            self._analyze_shots(self.best_shot.finish_stale(frame_id), frame_id, ended=True)
+        self.track_summaries.extend(self.aggregator.finish_stale(frame_id))
+        self.track_cache.evict_stale(frame_id)
+        
+        # Extract vehicle crops
+        crops = []
         for detection in detections:
-            # Extract vehicle crop
             x1, y1, x2, y2 = map(int, detection['bbox'])
             vehicle_crop = frame[y1:y2, x1:x2]
-            
-            # Step 2: Classify vehicle make/model
-            make_model_result = self.classifier.classify(vehicle_crop)
-            
-            # Step 3: Try to detect license plate in the crop
-            plate_text = None
-            plate_conf = 0.0
-            
-            # Save crop temporarily for OCR
-            temp_crop_path = f"data/temp_vehicle_{detection['id']}.jpg"
-            cv2.imwrite(temp_crop_path, vehicle_crop)
-            
-            plates = self.lpr_scanner.scan_plate(temp_crop_path)
-            if plates:
-                # Get the highest confidence plate
-                best_plate = max(plates, key=lambda p: p['confidence'])
-                plate_text = best_plate['text']
-                plate_conf = best_plate['confidence']
-            
-            # Clean up temp file
-            if os.path.exists(temp_crop_path):
-                os.remove(temp_crop_path)
-            
-            # Store results
-            self.results.append({
-                "frame_id": frame_id,
-                "vehicle_id": detection['id'],
-                "vehicle_class": detection['class'],
-                "detection_confidence": detection['confidence'],
-                "make_model": make_model_result['make_model'],
-                "make_model_confidence": make_model_result['confidence'],
-                "license_plate": plate_text if plate_text else "N/A",
-                "plate_confidence": plate_conf,
-                "bbox": detection['bbox']
-            })
+            crops.append(vehicle_crop)
+            self.track_cache.touch(detection['id'], frame_id)
+        
+        if self.best_shot is not None:
+            # Steps 2 and 3 on the best crops of tracks that are ready
+            for detection, crop in zip(detections, crops):
+                self.best_shot.update(detection['id'], crop, detection['bbox'], frame.shape, frame_id)
+            self._analyze_shots(self.best_shot.take_ready(frame_id), frame_id)
+        else:
+            # Step 2: Classify make/model for every track that needs it, as one batch
+            to_classify = self._tracks_to_refresh(detections, crops, 'make_model', frame_id)
+            if to_classify:
+                batch_results = self.classifier.classify_batch([crops[i] for i in to_classify])
+                for i, make_model_result in zip(to_classify, batch_results):
+                    crop_area = crops[i].shape[0] * crops[i].shape[1]
+                    self.track_cache.put(detections[i]['id'], 'make_model', make_model_result, frame_id, crop_area)
+                    self.aggregator.add_make_model(detections[i]['id'], make_model_result)
+        
+            # Step 3: Read license plates of tracks without a stable plate yet, in memory and batched
+            to_scan = self._tracks_to_refresh(detections, crops, 'plate', frame_id)
+            if to_scan:
+                batch_plates = self.lpr_scanner.scan_plates([crops[i] for i in to_scan])
+                for i, plates in zip(to_scan, batch_plates):
+                    plate_text = None
+                    plate_conf = 0.0
+                    if plates:
+                        # Get the highest confidence plate
+                        best_plate = max(plates, key=lambda p: p['confidence'])
+                        plate_text = best_plate['text']
+                        plate_conf = best_plate['confidence']
+                    self._check_hotlist(detections[i]['id'], plate_text, plate_conf, frame_id)
+                    # Rows show the consensus over all reads of the track so far
+                    consensus = self.aggregator.add_plate(detections[i]['id'], plate_text, plate_conf, frame_id)
+                    crop_area = crops[i].shape[0] * crops[i].shape[1]
+                    self.track_cache.put(detections[i]['id'], 'plate', consensus, frame_id, crop_area)
+        
+        make_models = []
+        plates = []
+        for detection in detections:
+            track_id = detection['id']
+            make_model_result = self.track_cache.get(track_id, 'make_model') or \
+                {"make_model": "Unknown", "confidence": 0.0}
+            plate_text, plate_conf = self.track_cache.get(track_id, 'plate') or (None, 0.0)
+            make_models.append(make_model_result)
+            plates.append((plate_text if plate_text else "N/A", plate_conf))
             
             # Add enhanced info for display
             enhanced_detections.append({
@@ -82,83 +181,374 @@ class VehicleAnalysisPipeline:
                 'license_plate': plate_text if plate_text else "N/A"
             })
         
+        # Store results for the whole frame at once
+        self._record_frame(frame_id, detections, make_models, plates)
+        
         return total_count, enhanced_detections
 
 
-    def process_video(self, video_path, output_video_path=None, max_frames=None):
-        """Process a video file through the pipeline."""
+    def _analyze_shots(self, shots, frame_id, ended=False):
+        """
+        Classify and OCR best-shot crops (track_id -> crops, best first).
+        ended: the tracks are over, so only their summaries are updated
+        """
+        if not shots:
+            return
+        track_ids = list(shots)
+        # Make/model from each track's single best crop, as one batch
+        batch_results = self.classifier.classify_batch([shots[track_id][0] for track_id in track_ids])
+        for track_id, make_model_result in zip(track_ids, batch_results):
+            self.aggregator.add_make_model(track_id, make_model_result)
+            if not ended:
+                crop = shots[track_id][0]
+                self.track_cache.put(track_id, 'make_model', make_model_result, frame_id,
+                                     crop.shape[0] * crop.shape[1])
+        
+        # Every buffered crop is read, so the plate consensus gets several good reads
+        plate_crops = [(track_id, crop) for track_id in track_ids for crop in shots[track_id]]
+        batch_plates = self.lpr_scanner.scan_plates([crop for _, crop in plate_crops])
+        for (track_id, crop), plates in zip(plate_crops, batch_plates):
+            best_plate = max(plates, key=lambda p: p['confidence']) if plates else None
+            plate_text = best_plate['text'] if best_plate else None
+            plate_conf = best_plate['confidence'] if best_plate else 0.0
+            self._check_hotlist(track_id, plate_text, plate_conf, frame_id)
+            consensus = self.aggregator.add_plate(track_id, plate_text, plate_conf, frame_id)
+            if not ended:
+                self.track_cache.put(track_id, 'plate', consensus, frame_id, crop.shape[0] * crop.shape[1])
+
+    def _check_hotlist(self, track_id, plate_text, plate_conf, frame_id):
+        """Match a plate read against the hotlist; alerts are delivered off this thread."""
+        if self.hotlist is not None and plate_text:
+            self.hotlist.check(plate_text, plate_conf, vehicle_id=track_id, frame_id=frame_id)
+
+    def _timed_process_frame(self, frame, frame_id):
+        """process_frame, adding its duration to the 'inference' stage."""
+        start = time.perf_counter()
+        result = self.process_frame(frame, frame_id)
+        elapsed = time.perf_counter() - start
+        self.stage_timings['inference'] += elapsed
+        metrics.observe("stage_seconds", elapsed, stage="frame")
+        return result
+
+    def draw_overlays(self, frame, detections, total_count):
+        """Draw boxes, make/model, plates and the vehicle count onto a frame in place."""
+        draw_overlays(frame, detections, total_count, self.tracker.roi)
+
+    def _write_frame(self, out, frame, detections, total_count):
+        """Draw overlays and encode one frame (the 'encode' stage)."""
+        start = time.perf_counter()
+        self.draw_overlays(frame, detections, total_count)
+        out.write(frame)
+        elapsed = time.perf_counter() - start
+        self.stage_timings['encode'] += elapsed
+        metrics.observe("stage_seconds", elapsed, stage="encode")
+
+    def _frame_done(self, decoded_at):
+        """Record one processed frame and its decode-to-result lag."""
+        metrics.inc("frames_total", pipeline="video")
+        metrics.observe("lag_seconds", time.perf_counter() - decoded_at, pipeline="video")
+
+    def _put(self, q, item, stop):
+        """Put into a bounded queue, giving up once `stop` is set."""
+        while not stop.is_set():
+            try:
+                q.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _read_frames(self, cap, frame_queue, start_frame, max_frames, stop, errors, stride=1):
+        """Reader thread: decode every stride-th frame into frame_queue, then a None sentinel."""
+        frame_id = start_frame
+        skip = 0
+        try:
+            while not stop.is_set() and not (max_frames is not None and frame_id - start_frame >= max_frames):
+                start = time.perf_counter()
+                ret, frame = read_frame(cap, skip)
+                decoded_at = time.perf_counter()
+                self.stage_timings['decode'] += decoded_at - start
+                if not ret:
+                    break
+                metrics.observe("stage_seconds", decoded_at - start, stage="decode")
+                if not self._put(frame_queue, (frame_id, frame, decoded_at), stop):
+                    return
+                frame_id += stride
+                skip = stride - 1
+        except Exception as e:
+            errors.append(e)
+        finally:
+            # The inference loop waits on the queue: it always gets the sentinel
+            self._put(frame_queue, None, stop)
+
+    def _write_frames(self, out, result_queue, errors):
+        """Writer thread: draw and encode processed frames in arrival order."""
+        while True:
+            item = result_queue.get()
+            if item is None:
+                return
+            if errors:
+                # Keep draining so the inference loop never blocks
+                continue
+            try:
+                self._write_frame(out, *item)
+            except Exception as e:
+                errors.append(e)
+
+    def _process_video_sequential(self, cap, out, start_frame, max_frames, stride=1):
+        frame_id = start_frame
+        skip = 0
+        frames_done = 0
+        last_frame_id = start_frame - 1
+        total_count = len(self.tracker.tracked_ids)
+        while cap.isOpened():
+            if max_frames is not None and frame_id - start_frame >= max_frames:
+                break
+            
+            # Frames between analyzed ones are only grabbed, never converted
+            start = time.perf_counter()
+            ret, frame = read_frame(cap, skip)
+            decoded_at = time.perf_counter()
+            self.stage_timings['decode'] += decoded_at - start
+            if not ret:
+                break
+            metrics.observe("stage_seconds", decoded_at - start, stage="decode")
+            
+            total_count, detections = self._timed_process_frame(frame, frame_id)
+            self._frame_done(decoded_at)
+            
+            # Analysis-only runs skip drawing and encoding altogether
+            if out is not None:
+                self._write_frame(out, frame, detections, total_count)
+            
+            frames_done += 1
+            last_frame_id = frame_id
+            frame_id += stride
+            skip = stride - 1
+            if frames_done % 30 == 0:
+                print(f"Processed {frames_done} frames, total vehicles tracked: {total_count}")
+        
+        return frames_done, total_count, last_frame_id
+
+    def _process_video_threaded(self, cap, out, start_frame, max_frames, queue_size, stride=1):
+        # Bounded queues give back-pressure: the reader never runs more than
+        # queue_size frames ahead of inference, nor inference ahead of the writer
+        frame_queue = queue.Queue(maxsize=queue_size)
+        result_queue = queue.Queue(maxsize=queue_size)
+        stop = threading.Event()
+        reader_errors = []
+        writer_errors = []
+        
+        reader = threading.Thread(target=self._read_frames,
+                                  args=(cap, frame_queue, start_frame, max_frames, stop, reader_errors, stride),
+                                  daemon=True)
+        reader.start()
+        # Analysis-only runs have no writer thread: nothing is drawn or encoded
+        writer = None
+        if out is not None:
+            writer = threading.Thread(target=self._write_frames, args=(out, result_queue, writer_errors), daemon=True)
+            writer.start()
+        
+        frames_done = 0
+        frame_id = start_frame - 1
+        total_count = len(self.tracker.tracked_ids)
+        try:
+            while True:
+                item = frame_queue.get()
+                if item is None:
+                    break
+                frame_id, frame, decoded_at = item
+                metrics.set_gauge("queue_depth", frame_queue.qsize(), queue="frames")
+                metrics.set_gauge("queue_depth", result_queue.qsize(), queue="results")
+                
+                total_count, detections = self._timed_process_frame(frame, frame_id)
+                self._frame_done(decoded_at)
+                
+                # A single inference thread feeding a FIFO keeps frame order
+                if writer is not None:
+                    result_queue.put((frame, detections, total_count))
+                
+                frames_done += 1
+                if frames_done % 30 == 0:
+                    print(f"Processed {frames_done} frames, total vehicles tracked: {total_count}")
+        finally:
+            stop.set()
+            reader.join()
+            if writer is not None:
+                result_queue.put(None)
+                writer.join()
+        
+        if reader_errors:
+            raise reader_errors[0]
+        if writer_errors:
+            raise writer_errors[0]
+        return frames_done, total_count, frame_id
+
+    def process_video(self, video_path, output_video_path=None, max_frames=None,
+                      threaded=False, queue_size=8, start_frame=0, writer_options=None,
+                      analysis_fps=None, start_time=None, end_time=None):
+        """
+        Process a video file through the pipeline.
+        Args:
+            video_path: input video file
+            output_video_path: annotated output video; None runs analysis only,
+                without drawing or encoding (render later with src/renderer.py)
+            max_frames: stop after this many source frames (None or 0 = no limit)
+            threaded: decode and draw/encode on their own threads, joined to the
+                inference loop by bounded queues (frame order is preserved)
+            queue_size: max frames buffered between stages, bounds memory in threaded mode
+            start_frame: seek to this frame first; frame IDs stay in source-frame units
+            writer_options: open_video_writer options for the output video, e.g.
+                {'backend': 'ffmpeg', 'codec': 'libx264', 'preset': 'fast', 'crf': 26}
+                (default: ffmpeg/libx264 when available, else OpenCV mp4v; see src/video_writer.py)
+            analysis_fps: analyze only this many frames per second; the frames in
+                between are grabbed without being converted (None = every frame,
+                see src/frame_stride.py). The output video gets the analyzed frames.
+            start_time: seek to this second first (overrides start_frame)
+            end_time: stop at this second
+        """
         if not os.path.exists(video_path):
             print(f"Error: Video file {video_path} not found.")
             return
         
+        if end_time is not None and end_time <= (start_time or 0):
+            raise ValueError(f"end_time ({end_time}) must be after start_time ({start_time or 0})")
+        # 0 keeps meaning "no limit"; from here on only None does, so a time
+        # range shorter than one frame processes nothing instead of everything
+        max_frames = max_frames or None
+        
         cap = cv2.VideoCapture(video_path)
-        fps = int(cap.get(cv2.CAP_PROP_FPS))
+        source_fps = cap.get(cv2.CAP_PROP_FPS) or 30
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        if start_time is not None or end_time is not None:
+            start_frame, span = time_range_frames(source_fps, start_time, end_time)
+            if span is not None:
+                max_frames = min(max_frames, span) if max_frames is not None else span
+        if start_frame:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, start_frame)
+        
+        # Frame IDs advance by the stride; the tracker sees the effective rate
+        stride = analysis_stride(source_fps, analysis_fps)
+        fps = source_fps / stride
+        self.tracker.frame_rate = fps
+        if stride > 1:
+            print(f"Analyzing every {stride} frames ({fps:.1f} of {source_fps:.1f} fps)")
         
         # Video writer for output
         out = None
         if output_video_path:
-            fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-            out = cv2.VideoWriter(output_video_path, fourcc, fps, (width, height))
+            out = open_video_writer(output_video_path, fps, (width, height), **(writer_options or {}))
         
-        frame_id = 0
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            if max_frames and frame_id >= max_frames:
-                break
-            
-            total_count, detections = self.process_frame(frame, frame_id)
-            
-            # Draw overlays
-            for det in detections:
-                x1, y1, x2, y2 = map(int, det['bbox'])
-                cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
-                
-                # Display make/model and license plate
-                make_model = det.get('make_model', 'Unknown')
-                plate = det.get('license_plate', 'N/A')
-                
-                # Draw make/model
-                cv2.putText(frame, make_model, (x1, y1-10), 
-                           cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 255, 0), 1)
-                
-                # Draw license plate if detected
-                if plate != "N/A":
-                    cv2.putText(frame, f"Plate: {plate}", (x1, y2+12), 
-                               cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 255, 255), 1)
-            
-            # Display total count
-            cv2.putText(frame, f"Total Vehicles: {total_count}", (10, 30), 
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
-            
+        self.stage_timings = {'decode': 0.0, 'inference': 0.0, 'encode': 0.0}
+        start = time.perf_counter()
+        try:
+            if threaded:
+                frame_count, total_count, last_frame_id = self._process_video_threaded(
+                    cap, out, start_frame, max_frames, queue_size, stride)
+            else:
+                frame_count, total_count, last_frame_id = self._process_video_sequential(
+                    cap, out, start_frame, max_frames, stride)
+            # The video is over, so every remaining track has ended
+            if self.best_shot is not None:
+                self._analyze_shots(self.best_shot.finish_all(), last_frame_id, ended=True)
+            self.track_summaries.extend(self.aggregator.finish_all())
+        finally:
+            cap.release()
             if out:
-                out.write(frame)
-            
-            frame_id += 1
-            if frame_id % 30 == 0:
-                print(f"Processed {frame_id} frames, total vehicles tracked: {total_count}")
-        
-        cap.release()
-        if out:
-            out.release()
+                out.release()
+        wall_time = time.perf_counter() - start
         
-        print(f"\nProcessing complete. Total frames: {frame_id}")
+        print(f"\nProcessing complete. Total frames: {frame_count}")
         print(f"Total unique vehicles tracked: {total_count}")
+        print(f"Track summaries: {len(self.track_summaries)}")
+        lookups = self.track_cache.hits + self.track_cache.misses
+        if lookups:
+            print(f"Track cache reuse: {self.track_cache.hits}/{lookups} stage lookups")
+        if self.tracker.motion_gate:
+            print(f"Motion gate: {self.tracker.motion_gate.stats()}")
+        if self.best_shot is not None:
+            print(self.best_shot.stats())
+        if self.hotlist is not None:
+            print(self.hotlist.stats())
+        self.print_stage_timings(frame_count, wall_time, threaded)
+
+    def print_stage_timings(self, frame_count, wall_time, threaded=False):
+        """Print per-frame stage timings of the last process_video run."""
+        if not frame_count:
+            return
+        mode = "threaded" if threaded else "sequential"
+        print(f"Stage timings ({mode}, ms/frame): " + ", ".join(
+            f"{stage} {seconds * 1000 / frame_count:.1f}" for stage, seconds in self.stage_timings.items()))
+        print(f"Wall time: {wall_time * 1000 / frame_count:.1f} ms/frame ({frame_count / wall_time:.1f} fps)")
+
+    def _record_frame(self, frame_id, detections, make_models, plates):
+        """Stream a frame's result rows to the sink, or append them to the in-memory store."""
+        if not self.per_frame_results:
+            return
+        if self.result_sink:
+            for detection, make_model, (plate_text, plate_conf) in zip(detections, make_models, plates):
+                self.result_sink.write({
+                    "frame_id": frame_id,
+                    "vehicle_id": detection['id'],
+                    "vehicle_class": detection['class'],
+                    "detection_confidence": detection['confidence'],
+                    "make_model": make_model['make_model'],
+                    "make_model_confidence": make_model['confidence'],
+                    "license_plate": plate_text,
+                    "plate_confidence": plate_conf,
+                    "bbox": detection['bbox']
+                })
+            return
+        self.results.append_frame(
+            frame_id,
+            [detection['id'] for detection in detections],
+            [detection['bbox'] for detection in detections],
+            [detection['class'] for detection in detections],
+            [detection['confidence'] for detection in detections],
+            [make_model['make_model'] for make_model in make_models],
+            [make_model['confidence'] for make_model in make_models],
+            [plate_text for plate_text, _ in plates],
+            [plate_conf for _, plate_conf in plates])
+
+    def close(self):
+        """Write out and close the result sink, if any, and deliver pending hotlist alerts."""
+        try:
+            if self.result_sink:
+                self.result_sink.close()
+        finally:
+            if self.hotlist is not None:
+                self.hotlist.close()
 
     def save_results(self, csv_path="data/results.csv"):
-        """Save results to CSV."""
+        """Save results to CSV, or Parquet for a .parquet path (with a result sink: flush it instead)."""
+        if self.result_sink:
+            self.result_sink.flush()
+            print(f"Results streamed to {self.result_sink.path}")
+            return
+        
         if not self.results:
             print("No results to save.")
             return
         
-        df = pd.DataFrame(self.results)
-        df.to_csv(csv_path, index=False)
+        if csv_path.endswith(".parquet"):
+            self.results.to_parquet(csv_path)
+        else:
+            # Same layout as before: one "[x1, y1, x2, y2]" bbox column
+            self.results.to_dataframe(bbox_as_list=True).to_csv(csv_path, index=False)
         print(f"Results saved to {csv_path}")
 
+    def save_track_summaries(self, csv_path="data/track_summary.csv"):
+        """Save one row per vehicle (first/last frame, voted class, make/model and plate) to CSV."""
+        if not self.track_summaries:
+            print("No track summaries to save.")
+            return
+        
+        import pandas as pd
+        
+        pd.DataFrame(self.track_summaries).to_csv(csv_path, index=False)
+        print(f"Track summaries saved to {csv_path}")
+
 if __name__ == "__main__":
     # Example usage
     pipeline = VehicleAnalysisPipeline()
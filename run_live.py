@@ -5,67 +5,231 @@ Press 'q' to quit, 's' to save current results.
 
 import cv2
 import os
+import time
 from datetime import datetime
 from src.detector import VehicleDetector
 from src.tracker import VehicleTracker
 from src.classifier import VehicleMakeModelClassifier
 from src.lpr import LicensePlateScanner
-import pandas as pd
+from src.model_registry import warm_up as warm_up_models
+from src.track_cache import TrackResultCache
+from src.async_analysis import AsyncAnalysisPool
+from src.result_sink import open_result_sink
+from src.motion_gate import MotionGate
+from src.best_shot import BestShotSelector
+from src.hotlist import HotlistMonitor
+from src.roi import load_roi_config, roi_for_camera
+from src.frame_stride import analysis_stride, read_frame, time_range_frames
+from src import metrics
 
 class LiveVehicleAnalysis:
-    def __init__(self):
+    def __init__(self, async_analysis=True, result_sink=None, motion_gate=None, roi=None,
+                 yolo_backend=None, metrics_port=None, best_shot=None, hotlist=None):
+        """
+        Args:
+            async_analysis: run classification and OCR on background workers so
+                the capture/display loop never waits for them
+            result_sink: path (.csv, .parquet, .db) or BackgroundSinkWriter that
+                result rows are streamed to instead of being kept in self.results
+            motion_gate: optional MotionGate that skips detection on static frames
+            roi: optional RegionOfInterest (see src/roi.py) limiting inference to
+                the camera's lanes of interest
+            yolo_backend: YOLO backend ('pytorch', 'onnx', 'openvino', ...; default
+                $YOLO_BACKEND or 'pytorch', see src/yolo_export.py)
+            metrics_port: serve stage latencies, queue depths and lag in Prometheus
+                format on this local port (see src/metrics.py); None = metrics off
+            best_shot: optional BestShotSelector; each track is then classified
+                and OCR'd on its best-quality crops once they are good enough (or
+                after its max_wait frames) instead of every 10th/30th frame
+            hotlist: hotlist CSV path or HotlistMonitor (see src/hotlist.py);
+                every plate read is fuzzy-matched against it and hits raise alerts
+                on a background thread
+        """
         print("Initializing Live Vehicle Analysis...")
-        self.detector = VehicleDetector()
-        self.tracker = VehicleTracker()
+        if metrics_port is not None:
+            metrics.start_http_server(metrics_port)
+        self.detector = VehicleDetector(roi=roi, backend=yolo_backend)
+        self.tracker = VehicleTracker(motion_gate=motion_gate, roi=roi, backend=yolo_backend)
         self.classifier = VehicleMakeModelClassifier()
         self.lpr_scanner = LicensePlateScanner()
+        # Latest make/model and plate per track, attached as results come in
+        self.track_results = TrackResultCache(max_age=30)
+        self.analysis_pool = AsyncAnalysisPool(self.classifier, self.lpr_scanner) if async_analysis else None
+        self.best_shot = best_shot
+        self.hotlist = HotlistMonitor(hotlist) if isinstance(hotlist, str) else hotlist
+        self.result_sink = open_result_sink(result_sink) if isinstance(result_sink, str) else result_sink
         self.results = []
+        # Source frame number of the last processed frame; with an analysis
+        # rate below the camera's, frames in between are skipped
         self.frame_count = 0
+        self.frames_analyzed = 0
+        # Session counters, kept even when rows are streamed to a sink
+        self.detections_logged = 0
+        self.vehicle_ids = set()
+        self.plates_read = 0
         print("✅ Live pipeline ready!\n")
 
-    def process_frame(self, frame):
-        """Process a single frame with all components."""
-        self.frame_count += 1
+    def warm_up(self, parallel=True, dummy_pass=True):
+        """
+        Load every model the live loop uses before the camera is opened.
+        Args:
+            parallel: load the models concurrently in a thread pool
+            dummy_pass: run one dummy inference per model to absorb first-call costs
+        Returns:
+            dict of per-model load and warm-up seconds
+        """
+        return warm_up_models([self.tracker, self.classifier, self.lpr_scanner],
+                              parallel=parallel, dummy_pass=dummy_pass)
+
+    def _analyze_async(self, detections, crops, run_classify, run_ocr):
+        """Submit crops to the worker pool and attach results that came back."""
+        for detection, crop in zip(detections, crops):
+            if crop.size == 0:
+                continue
+            if run_classify:
+                self.analysis_pool.submit('make_model', detection['id'], crop, self.frame_count)
+            if run_ocr:
+                self.analysis_pool.submit('plate', detection['id'], crop, self.frame_count)
+        
+        for stage, track_id, result, frame_id in self.analysis_pool.collect():
+            # Results for tracks that already left the scene are dropped, but
+            # their plates are still checked against the hotlist
+            if track_id in self.track_results:
+                self._attach_result(track_id, stage, result, frame_id)
+            elif stage == 'plate':
+                self._check_hotlist(track_id, result, frame_id)
+
+    def _check_hotlist(self, track_id, plate, frame_id):
+        """Match a (text, confidence) plate read against the hotlist."""
+        if self.hotlist is not None and plate[0]:
+            self.hotlist.check(plate[0], plate[1], vehicle_id=track_id, frame_id=frame_id)
+
+    def _attach_result(self, track_id, stage, result, frame_id):
+        """Store a stage result on its track."""
+        if stage == 'plate':
+            self._check_hotlist(track_id, result, frame_id)
+        # A failed plate read doesn't erase an earlier successful one
+        if stage == 'plate' and not result[0]:
+            return
+        self.track_results.put(track_id, stage, result, frame_id, 0)
+
+    def _analyze_inline(self, detections, crops, run_classify, run_ocr):
+        """Run classification and OCR on this thread, blocking the loop."""
+        to_analyze = [i for i, crop in enumerate(crops) if crop.size > 0]
+        if not to_analyze:
+            return
+        
+        # Classify make/model of all vehicles in the frame as one batch
+        if run_classify:
+            try:
+                batch_results = self.classifier.classify_batch([crops[i] for i in to_analyze])
+                for i, result in zip(to_analyze, batch_results):
+                    self._attach_result(detections[i]['id'], 'make_model', result, self.frame_count)
+            except Exception as e:
+                print(f"Classification error: {e}")
+        
+        # OCR license plates, all crops in one batched call
+        if run_ocr:
+            try:
+                batch_plates = self.lpr_scanner.scan_plates([crops[i] for i in to_analyze])
+                for i, plates in zip(to_analyze, batch_plates):
+                    plate = (None, 0.0)
+                    if plates:
+                        best = max(plates, key=lambda p: p['confidence'])
+                        plate = (best['text'], best['confidence'])
+                    self._attach_result(detections[i]['id'], 'plate', plate, self.frame_count)
+            except Exception as e:
+                print(f"OCR error: {e}")
+
+    def _analyze_ended(self, shots):
+        """
+        Read the plates of tracks that ended before their best shot was ready
+        (track_id -> crops, best first). They get no more rows, so only the
+        hotlist check is left to do; make/model is not worth a model call.
+        """
+        if not shots:
+            return
+        if self.analysis_pool:
+            for track_id, crops in shots.items():
+                self.analysis_pool.submit('plate', track_id, crops[0], self.frame_count, ended=True)
+            return
+        
+        plate_crops = [(track_id, crop) for track_id, crops in shots.items() for crop in crops]
+        try:
+            batch_plates = self.lpr_scanner.scan_plates([crop for _, crop in plate_crops])
+            for (track_id, _), plates in zip(plate_crops, batch_plates):
+                if plates:
+                    best = max(plates, key=lambda p: p['confidence'])
+                    self._check_hotlist(track_id, (best['text'], best['confidence']), self.frame_count)
+        except Exception as e:
+            print(f"OCR error: {e}")
+
+    def process_frame(self, frame, frame_id=None):
+        """
+        Process a single frame with all components.
+        Args:
+            frame: BGR frame (drawn on in place)
+            frame_id: source frame number (default: the frame after the last one)
+        """
+        previous = self.frame_count
+        self.frame_count = previous + 1 if frame_id is None else frame_id
+        self.frames_analyzed += 1
         
         # Track vehicles
         detections, total_count = self.tracker.track_and_count(frame)
+        metrics.set_gauge("active_tracks", len(detections), pipeline="live")
+        
+        # Only do expensive operations every N source frames (a multiple of N
+        # passed since the last processed frame, so skipped frames don't hide it)
+        run_classify = self.frame_count // 10 > previous // 10  # Process every 10th frame
+        run_ocr = self.frame_count // 30 > previous // 30  # OCR is slower, every 30 frames
+        
+        # Extract vehicle crops
+        crops = []
+        for detection in detections:
+            x1, y1, x2, y2 = map(int, detection['bbox'])
+            crops.append(frame[y1:y2, x1:x2])
+            self.track_results.touch(detection['id'], self.frame_count)
+        
+        # Crops to analyze this frame: all of them on the cadence above, or the
+        # best shot of each track that just became ready
+        analyze_detections, analyze_crops = detections, crops
+        if self.best_shot is not None:
+            for detection, crop in zip(detections, crops):
+                self.best_shot.update(detection['id'], crop, detection['bbox'], frame.shape, self.frame_count)
+            # Ended tracks no longer get rows, but their last shots are still OCR'd
+            self._analyze_ended(self.best_shot.finish_stale(self.frame_count))
+            shots = self.best_shot.take_ready(self.frame_count, [d['id'] for d in detections])
+            analyze_detections = [d for d in detections if d['id'] in shots]
+            analyze_crops = [shots[d['id']][0] for d in analyze_detections]
+            run_classify = run_ocr = True
+        
+        if self.analysis_pool:
+            self.analysis_pool.update_active_tracks(d['id'] for d in detections)
+            self._analyze_async(analyze_detections, analyze_crops, run_classify, run_ocr)
+            if metrics.enabled():
+                metrics.set_gauge("queue_depth", self.analysis_pool.pending(), queue="analysis")
+        else:
+            self._analyze_inline(analyze_detections, analyze_crops, run_classify, run_ocr)
+        self.track_results.evict_stale(self.frame_count)
         
         # Process each detected vehicle
         for detection in detections:
             x1, y1, x2, y2 = map(int, detection['bbox'])
-            vehicle_crop = frame[y1:y2, x1:x2]
-            
-            # Only do expensive operations every N frames or for new vehicles
-            skip_expensive = self.frame_count % 10 != 0  # Process every 10th frame
             
             make_model = "N/A"
             make_model_conf = 0.0
             plate_text = "N/A"
             plate_conf = 0.0
             
-            if not skip_expensive and vehicle_crop.size > 0:
-                # Classify make/model
-                try:
-                    result = self.classifier.classify(vehicle_crop)
-                    make_model = result['make_model']
-                    make_model_conf = result['confidence']
-                except Exception as e:
-                    print(f"Classification error: {e}")
-                
-                # OCR license plate (slower, do less frequently)
-                if self.frame_count % 30 == 0:  # Every 30 frames
-                    try:
-                        temp_path = f"data/temp_live_{detection['id']}.jpg"
-                        cv2.imwrite(temp_path, vehicle_crop)
-                        plates = self.lpr_scanner.scan_plate(temp_path)
-                        if plates:
-                            best = max(plates, key=lambda p: p['confidence'])
-                            plate_text = best['text']
-                            plate_conf = best['confidence']
-                        if os.path.exists(temp_path):
-                            os.remove(temp_path)
-                    except Exception as e:
-                        print(f"OCR error: {e}")
+            make_model_result = self.track_results.get(detection['id'], 'make_model')
+            if make_model_result:
+                make_model = make_model_result['make_model']
+                make_model_conf = make_model_result['confidence']
+            
+            plate_result = self.track_results.get(detection['id'], 'plate')
+            if plate_result and plate_result[0]:
+                plate_text, plate_conf = plate_result
             
             # Draw bounding box
             cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
@@ -81,7 +245,7 @@ class LiveVehicleAnalysis:
                        cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 255, 0), 1)
             
             # Store result
-            self.results.append({
+            self._record({
                 "timestamp": datetime.now().isoformat(),
                 "frame_id": self.frame_count,
                 "vehicle_id": detection['id'],
@@ -94,6 +258,9 @@ class LiveVehicleAnalysis:
                 "bbox": detection['bbox']
             })
         
+        if self.tracker.roi is not None:
+            self.tracker.roi.draw(frame)
+        
         # Draw info overlay (smaller)
         cv2.putText(frame, f"Total Vehicles: {total_count}", (10, 20),
                    cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
@@ -104,18 +271,36 @@ class LiveVehicleAnalysis:
         
         return frame, total_count
 
+    def _record(self, row):
+        """Stream a result row to the sink, or keep it in memory."""
+        self.detections_logged += 1
+        self.vehicle_ids.add(row['vehicle_id'])
+        if row['license_plate'] != "N/A":
+            self.plates_read += 1
+        if self.result_sink:
+            self.result_sink.write(row)
+        else:
+            self.results.append(row)
+
     def save_results(self, filename="data/live_results.csv"):
-        """Save accumulated results to CSV."""
+        """Save accumulated results to CSV (with a result sink: flush it instead)."""
+        if self.result_sink:
+            self.result_sink.flush()
+            print(f"✅ Results streamed to: {self.result_sink.path}")
+            return
+        
         if not self.results:
             print("No results to save.")
             return
         
+        import pandas as pd
+        
         os.makedirs(os.path.dirname(filename) if os.path.dirname(filename) else '.', exist_ok=True)
         df = pd.DataFrame(self.results)
         df.to_csv(filename, index=False)
         print(f"✅ Results saved to: {filename}")
 
-    def run_live(self, camera_source=0):
+    def run_live(self, camera_source=0, analysis_fps=None, start_time=None, end_time=None):
         """
         Run live processing from camera.
         
@@ -123,6 +308,11 @@ class LiveVehicleAnalysis:
             camera_source: 0 for default webcam, or a stream URL like:
                           'rtsp://...' for IP camera
                           'http://...' for HTTP stream
+                          or a video file path
+            analysis_fps: analyze only this many frames per second; the frames in
+                between are grabbed without being converted (None = every frame)
+            start_time: video files only, seek to this second first
+            end_time: video files only, stop at this second
         """
         print("=" * 70)
         print("Starting Live Camera Feed...")
@@ -144,18 +334,42 @@ class LiveVehicleAnalysis:
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
         
+        # Time ranges only apply to files; live sources start now and run until stopped
+        position, max_frames = 0, None
+        if isinstance(camera_source, str) and os.path.isfile(camera_source):
+            position, max_frames = time_range_frames(cap.get(cv2.CAP_PROP_FPS) or 30, start_time, end_time)
+            if position:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, position)
+        elif start_time is not None or end_time is not None:
+            print("⚠️  start_time/end_time ignored for live sources")
+        
+        # Frame numbers stay in source frames; the tracker sees the effective rate
+        source_fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        stride = analysis_stride(source_fps, analysis_fps)
+        self.tracker.frame_rate = source_fps / stride
+        first_frame = position
+        
         print("✅ Camera opened successfully!")
+        if stride > 1:
+            print(f"   Analyzing every {stride} frames ({source_fps / stride:.1f} of {source_fps:.1f} fps)")
         print("   Processing live feed...\n")
         
         try:
-            while True:
-                ret, frame = cap.read()
+            skip = 0
+            while not (max_frames is not None and position - first_frame >= max_frames):
+                ret, frame = read_frame(cap, skip)
+                captured_at = time.perf_counter()
                 if not ret:
                     print("❌ Failed to grab frame")
                     break
                 
                 # Process frame
-                processed_frame, total_count = self.process_frame(frame)
+                with metrics.timer("stage_seconds", stage="frame"):
+                    processed_frame, total_count = self.process_frame(frame, position + 1)
+                position += stride
+                skip = stride - 1
+                metrics.inc("frames_total", pipeline="live")
+                metrics.observe("lag_seconds", time.perf_counter() - captured_at, pipeline="live")
                 
                 # Display
                 cv2.imshow('Live Vehicle Analysis', processed_frame)
@@ -177,20 +391,32 @@ class LiveVehicleAnalysis:
             # Cleanup
             cap.release()
             cv2.destroyAllWindows()
+            if self.analysis_pool:
+                self.analysis_pool.close()
+            if self.hotlist is not None:
+                self.hotlist.close()
             
             # Save final results
             print("\n" + "=" * 70)
-            self.save_results()
+            try:
+                self.save_results()
+            finally:
+                if self.result_sink:
+                    self.result_sink.close()
             
             # Summary
-            if self.results:
-                unique_vehicles = len(set([r['vehicle_id'] for r in self.results]))
-                plates_detected = sum(1 for r in self.results if r['license_plate'] != "N/A")
+            if self.detections_logged:
                 print(f"\n📈 Session Summary:")
-                print(f"   - Total frames processed: {self.frame_count}")
-                print(f"   - Total detections logged: {len(self.results)}")
-                print(f"   - Unique vehicles: {unique_vehicles}")
-                print(f"   - License plates read: {plates_detected}")
+                print(f"   - Total frames processed: {self.frames_analyzed}")
+                print(f"   - Total detections logged: {self.detections_logged}")
+                print(f"   - Unique vehicles: {len(self.vehicle_ids)}")
+                print(f"   - License plates read: {self.plates_read}")
+            if self.tracker.motion_gate:
+                print(f"   - {self.tracker.motion_gate.stats()}")
+            if self.best_shot is not None:
+                print(f"   - {self.best_shot.stats()}")
+            if self.hotlist is not None:
+                print(f"   - {self.hotlist.stats()}")
             print("=" * 70)
 
 def main():
@@ -217,9 +443,25 @@ def main():
     else:
         camera_source = source_input
     
-    # Run live analysis
-    analyzer = LiveVehicleAnalysis()
-    analyzer.run_live(camera_source)
+    # Run live analysis (models load in parallel before the camera opens).
+    # Set METRICS_PORT to expose Prometheus metrics while running, HOTLIST to a
+    # plate CSV to get alerts for listed plates, ANALYSIS_FPS to analyze fewer
+    # frames per second than the camera delivers, RESULT_SINK to a .csv,
+    # .parquet or .db path to stream results to disk instead of keeping them in
+    # memory, MOTION_GATE=1 to skip YOLO while the scene is static, and
+    # BEST_SHOT=1 to classify and OCR each vehicle on its best crop only, and
+    # ROI_CONFIG to a JSON file of polygons (keyed by camera source or
+    # "default") to analyze only those regions.
+    roi_config = os.environ.get("ROI_CONFIG")
+    roi = roi_for_camera(load_roi_config(roi_config), camera_source) if roi_config else None
+    analyzer = LiveVehicleAnalysis(result_sink=os.environ.get("RESULT_SINK") or None, roi=roi,
+                                   motion_gate=MotionGate() if os.environ.get("MOTION_GATE") == "1" else None,
+                                   metrics_port=os.environ.get("METRICS_PORT"),
+                                   best_shot=BestShotSelector() if os.environ.get("BEST_SHOT") == "1" else None,
+                                   hotlist=os.environ.get("HOTLIST"))
+    analyzer.warm_up()
+    analysis_fps = os.environ.get("ANALYSIS_FPS")
+    analyzer.run_live(camera_source, analysis_fps=float(analysis_fps) if analysis_fps else None)
 
 if __name__ == "__main__":
     main()
@@ -4,6 +4,9 @@ Supports both local files and video URLs (YouTube, direct video links).
 """
 
 from main import VehicleAnalysisPipeline
+from src.best_shot import BestShotSelector
+from src.renderer import parse_range
+from src.roi import load_roi_config, roi_for_camera
 import os
 import urllib.request
 import urllib.parse
@@ -94,12 +97,11 @@ def main():
     
     print(f"\n✅ Video ready: {video_input}")
     
-    # Ask for output location
-    print("\nWhere should I save the processed video?")
-    default_output = "data/output_video.mp4"
-    video_output = input(f"Output video path (press Enter for '{default_output}'): ").strip().strip('"')
-    if not video_output:
-        video_output = default_output
+    # Ask for output location; without one only the data is produced (much faster),
+    # and the annotated video can be rendered later from the results
+    print("\nWhere should I save the annotated video?")
+    video_output = input("Output video path (press Enter to skip and only save the results): ").strip().strip('"')
+    video_output = video_output or None
     
     # Ask for CSV output location
     print("\nWhere should I save the results CSV?")
@@ -123,8 +125,26 @@ def main():
         except ValueError:
             print("Invalid number, processing entire video...")
     
+    # Ask for a time range (seeks instead of decoding from the start)
+    time_range = input("Time range to process, e.g. 1:30-2:00 (press Enter for entire video): ").strip()
+    start_time = end_time = None
+    if time_range:
+        try:
+            start_time, end_time = parse_range(time_range)
+        except ValueError:
+            print("Invalid range, processing entire video...")
+    
+    # Ask for the analysis rate (frames in between are skipped cheaply)
+    analysis_fps_input = input("Frames per second to analyze (press Enter for every frame): ").strip()
+    analysis_fps = None
+    if analysis_fps_input:
+        try:
+            analysis_fps = float(analysis_fps_input)
+        except ValueError:
+            print("Invalid number, analyzing every frame...")
+    
     # Create output directories if needed
-    video_dir = os.path.dirname(video_output)
+    video_dir = os.path.dirname(video_output) if video_output else None
     if video_dir and video_dir != '.':
         os.makedirs(video_dir, exist_ok=True)
     
@@ -137,26 +157,51 @@ def main():
     print("Starting processing...")
     print("=" * 70)
     print(f"Input:  {video_input}")
-    print(f"Output: {video_output}")
+    print(f"Output: {video_output or 'none (analysis only)'}")
     print(f"CSV:    {csv_output}")
     if max_frames:
         print(f"Frames: {max_frames} (testing mode)")
     else:
         print(f"Frames: All (full video)")
+    if start_time is not None:
+        print(f"Range:  {start_time:g}s - {end_time:g}s")
+    if analysis_fps:
+        print(f"Rate:   {analysis_fps:g} frames/s analyzed")
     print("=" * 70)
     print()
     
     # Initialize and run pipeline
-    pipeline = VehicleAnalysisPipeline()
-    pipeline.process_video(video_input, video_output, max_frames=max_frames)
+    # Set METRICS_PORT to expose Prometheus metrics while the video is
+    # processed, HOTLIST to a plate CSV to get alerts for listed plates,
+    # BEST_SHOT=1 to classify and OCR each vehicle on its best crops only, and
+    # THREADED=1 to decode frames on a background thread, and ROI_CONFIG to a
+    # JSON file of polygons (keyed by input path or "default") to analyze only
+    # those regions.
+    best_shot = BestShotSelector() if os.environ.get("BEST_SHOT") == "1" else None
+    roi_config = os.environ.get("ROI_CONFIG")
+    roi = roi_for_camera(load_roi_config(roi_config), video_input) if roi_config else None
+    pipeline = VehicleAnalysisPipeline(metrics_port=os.environ.get("METRICS_PORT"), best_shot=best_shot,
+                                       hotlist=os.environ.get("HOTLIST"), roi=roi)
+    pipeline.warm_up()
+    pipeline.process_video(video_input, video_output, max_frames=max_frames,
+                           threaded=os.environ.get("THREADED") == "1",
+                           analysis_fps=analysis_fps, start_time=start_time, end_time=end_time)
     pipeline.save_results(csv_output)
+    summary_csv = os.path.splitext(csv_output)[0] + '_tracks.csv'
+    pipeline.save_track_summaries(summary_csv)
+    pipeline.close()
     
     # Summary
     print("\n" + "=" * 70)
     print("✅ Processing Complete!")
     print("=" * 70)
-    print(f"\n📹 Annotated video saved to: {video_output}")
+    if video_output:
+        print(f"\n📹 Annotated video saved to: {video_output}")
+    else:
+        print(f"\n📹 No video written. Render one later with:")
+        print(f"   python -m src.renderer \"{video_input}\" \"{csv_output}\" data/output_video.mp4")
     print(f"📊 Results CSV saved to: {csv_output}")
+    print(f"🚙 Per-vehicle summary saved to: {summary_csv}")
     
     if pipeline.results:
         unique_vehicles = len(set([r['vehicle_id'] for r in pipeline.results]))
@@ -0,0 +1,132 @@
+"""
+Background worker pool for the expensive per-track stages.
+
+The live loop submits vehicle crops keyed by track ID and keeps tracking and
+drawing at camera rate; classification and plate OCR run on one worker thread
+per stage and results are collected on a later frame. A newer crop for a track
+replaces its pending one, and jobs for tracks that have left the frame are
+dropped before they reach a model, unless they were submitted as the track's
+final analysis (ended=True).
+"""
+
+import queue
+import threading
+from collections import OrderedDict
+
+from src import metrics
+
+STAGES = ('make_model', 'plate')
+
+class AsyncAnalysisPool:
+    def __init__(self, classifier, lpr_scanner, max_batch_size=8):
+        """
+        Args:
+            classifier: VehicleMakeModelClassifier used for 'make_model' jobs
+            lpr_scanner: LicensePlateScanner used for 'plate' jobs
+            max_batch_size: max pending jobs a worker takes per batched model call
+        """
+        self.classifier = classifier
+        self.lpr_scanner = lpr_scanner
+        self.max_batch_size = max_batch_size
+
+        # stage -> OrderedDict(track_id -> (crop, frame_id, ended)), oldest first
+        self.jobs = {stage: OrderedDict() for stage in STAGES}
+        self.active_ids = set()
+        self.condition = threading.Condition()
+        self.completed = queue.Queue()
+        self.dropped_jobs = 0
+        self.running = True
+
+        # One worker per stage: each model is only ever called from one thread
+        self.workers = [threading.Thread(target=self._worker, args=(stage,), daemon=True,
+                                         name=f"analysis-{stage}")
+                        for stage in STAGES]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, stage, track_id, crop, frame_id, ended=False):
+        """
+        Queue a crop for `stage`; replaces any job still pending for this track.
+        ended: the track has left, keep the job although it is no longer active
+        """
+        with self.condition:
+            jobs = self.jobs[stage]
+            if track_id in jobs:
+                self.dropped_jobs += 1
+                metrics.inc("dropped_jobs_total", stage=stage)
+            # Copy: the caller draws on the frame the crop is a view of
+            jobs[track_id] = (crop.copy(), frame_id, ended)
+            jobs.move_to_end(track_id)
+            self.condition.notify_all()
+
+    def update_active_tracks(self, track_ids):
+        """Set the tracks currently in frame and drop pending jobs for all others."""
+        with self.condition:
+            self.active_ids = set(track_ids)
+            for stage, jobs in self.jobs.items():
+                stale = [track_id for track_id, (_, _, ended) in jobs.items()
+                         if track_id not in self.active_ids and not ended]
+                for track_id in stale:
+                    del jobs[track_id]
+                self.dropped_jobs += len(stale)
+                if stale:
+                    metrics.inc("dropped_jobs_total", len(stale), stage=stage)
+
+    def pending(self):
+        """Number of jobs waiting for a worker."""
+        with self.condition:
+            return sum(len(jobs) for jobs in self.jobs.values())
+
+    def collect(self):
+        """Return all finished jobs as (stage, track_id, result, frame_id) tuples."""
+        finished = []
+        while True:
+            try:
+                finished.append(self.completed.get_nowait())
+            except queue.Empty:
+                return finished
+
+    def _run_batch(self, stage, crops):
+        if stage == 'make_model':
+            return self.classifier.classify_batch(crops)
+
+        results = []
+        for plates in self.lpr_scanner.scan_plates(crops):
+            if plates:
+                best = max(plates, key=lambda p: p['confidence'])
+                results.append((best['text'], best['confidence']))
+            else:
+                results.append((None, 0.0))
+        return results
+
+    def _worker(self, stage):
+        jobs = self.jobs[stage]
+        while True:
+            with self.condition:
+                while self.running and not jobs:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                batch = []
+                while jobs and len(batch) < self.max_batch_size:
+                    track_id, (crop, frame_id, _) = jobs.popitem(last=False)
+                    batch.append((track_id, crop, frame_id))
+
+            try:
+                results = self._run_batch(stage, [crop for _, crop, _ in batch])
+            except Exception as e:
+                print(f"{stage} worker error: {e}")
+                continue
+
+            for (track_id, _, frame_id), result in zip(batch, results):
+                self.completed.put((stage, track_id, result, frame_id))
+
+    def close(self):
+        """Stop the workers; pending jobs are discarded."""
+        with self.condition:
+            self.running = False
+            for jobs in self.jobs.values():
+                jobs.clear()
+            self.condition.notify_all()
+        for worker in self.workers:
+            worker.join()
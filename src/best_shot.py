@@ -0,0 +1,221 @@
+"""
+Best-shot selection of vehicle crops for classification and plate OCR.
+
+Instead of analyzing whatever crop falls on a fixed frame cadence, every crop
+of a track gets a quality score from its size, sharpness, aspect ratio and
+distance from the frame edge. Each track keeps its few best crops in a small
+buffer, and they are handed out for analysis once:
+    - the best crop reaches quality_threshold, or
+    - the track has waited max_wait frames without reaching it, or
+    - the track ends (only if it never fired, or a clearly better crop
+      arrived since it did).
+
+The score is a weighted geometric mean of components in [0, 1], so a crop
+that is cut off by the frame edge or badly blurred can't make up for it by
+being large.
+"""
+
+import heapq
+
+import cv2
+import numpy as np
+
+# Relative importance of the quality components (exponents of the geometric mean)
+WEIGHTS = {"area": 0.35, "sharpness": 0.35, "aspect": 0.1, "edge": 0.2}
+
+def laplacian_sharpness(crop, width=128):
+    """Variance of the Laplacian of the grayscale crop, measured at a fixed width."""
+    gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY) if crop.ndim == 3 else crop
+    if gray.shape[1] != width:
+        # A fixed scale keeps scores comparable between near and far crops
+        # (upscaling a small crop does not add detail, so it scores lower)
+        height = max(1, round(gray.shape[0] * width / gray.shape[1]))
+        gray = cv2.resize(gray, (width, height),
+                          interpolation=cv2.INTER_AREA if gray.shape[1] > width else cv2.INTER_LINEAR)
+    return float(cv2.Laplacian(gray, cv2.CV_64F).var())
+
+def geometry_scores(bbox, frame_shape, target_area=160 * 120, target_aspect=1.4, edge_margin=16):
+    """
+    The cheap quality components of a box: area, aspect and edge scores in [0, 1].
+    Args:
+        bbox: x1, y1, x2, y2 in frame coordinates
+        frame_shape: shape of the frame the box belongs to
+        target_area: box area (pixels) from which size stops adding quality
+        target_aspect: width / height of a well-framed vehicle
+        edge_margin: distance (pixels) from the frame edge below which the
+            vehicle is likely cut off
+    """
+    height, width = frame_shape[:2]
+    x1, y1, x2, y2 = bbox
+    box_w = max(0.0, x2 - x1)
+    box_h = max(0.0, y2 - y1)
+    if box_w < 1 or box_h < 1:
+        return {"area": 0.0, "aspect": 0.0, "edge": 0.0}
+    aspect = box_w / box_h
+    edge_distance = min(x1, y1, width - x2, height - y2)
+    return {
+        "area": min(1.0, np.sqrt(box_w * box_h / target_area)),
+        "aspect": min(aspect / target_aspect, target_aspect / aspect),
+        "edge": float(np.clip(edge_distance / edge_margin, 0.0, 1.0))
+    }
+
+def combine_scores(scores):
+    """Weighted geometric mean of the quality components present in `scores`."""
+    total = sum(WEIGHTS[name] for name in scores)
+    quality = 1.0
+    for name, value in scores.items():
+        quality *= max(value, 0.0) ** (WEIGHTS[name] / total)
+    return quality
+
+def crop_quality(crop, bbox, frame_shape, sharpness_ref=300.0, **geometry):
+    """
+    Quality score in [0, 1] of a vehicle crop.
+    Args:
+        crop: BGR crop of the vehicle
+        bbox: its box in frame coordinates
+        frame_shape: shape of the frame the crop was cut from
+        sharpness_ref: Laplacian variance that scores 0.5 (blur vs. detail)
+        **geometry: passed to geometry_scores
+    """
+    if crop.size == 0:
+        return 0.0
+    scores = geometry_scores(bbox, frame_shape, **geometry)
+    variance = laplacian_sharpness(crop)
+    scores["sharpness"] = variance / (variance + sharpness_ref)
+    return combine_scores(scores)
+
+class BestShotSelector:
+    def __init__(self, buffer_size=2, quality_threshold=0.8, max_wait=30, max_age=30, min_gain=0.15,
+                 sharpness_ref=300.0, target_area=160 * 120):
+        """
+        Args:
+            buffer_size: best crops kept per track (all of them are handed out,
+                so OCR gets several reads of the best views)
+            quality_threshold: quality at which a track fires right away
+            max_wait: frames after its first crop a track fires with the best it
+                has, even below the threshold (None = wait for the threshold or
+                the end of the track)
+            max_age: frames a track may go unseen before it is considered ended
+            min_gain: at track end, fire again only if the best new crop beats the
+                one analyzed earlier by this much quality
+            sharpness_ref: Laplacian variance that scores 0.5 sharpness
+            target_area: box area (pixels) from which size stops adding quality
+        """
+        self.buffer_size = buffer_size
+        self.quality_threshold = quality_threshold
+        self.max_wait = max_wait
+        self.max_age = max_age
+        self.min_gain = min_gain
+        self.sharpness_ref = sharpness_ref
+        self.target_area = target_area
+        # track_id -> state; the buffer is a min-heap of (quality, frame_id, crop)
+        self.tracks = {}
+        self.scored = 0
+        self.skipped = 0
+        self.fired = 0
+
+    def update(self, track_id, crop, bbox, frame_shape, frame_id):
+        """
+        Score a track's crop in this frame and keep it if it is among its best.
+        Returns:
+            the crop's quality, or None if it could not beat the buffer
+        """
+        state = self.tracks.get(track_id)
+        if state is None:
+            state = self.tracks[track_id] = {"buffer": [], "first_frame": frame_id, "last_seen": frame_id,
+                                             "fired_quality": None}
+        state["last_seen"] = max(state["last_seen"], frame_id)
+        if crop.size == 0:
+            return None
+
+        buffer = state["buffer"]
+        scores = geometry_scores(bbox, frame_shape, target_area=self.target_area)
+        if len(buffer) >= self.buffer_size and combine_scores({**scores, "sharpness": 1.0}) <= buffer[0][0]:
+            # Even perfectly sharp, this crop could not displace the worst kept one
+            self.skipped += 1
+            return None
+        variance = laplacian_sharpness(crop)
+        scores["sharpness"] = variance / (variance + self.sharpness_ref)
+        quality = combine_scores(scores)
+        self.scored += 1
+
+        if len(buffer) < self.buffer_size:
+            # Copy: the caller draws on the frame the crop is a view of
+            heapq.heappush(buffer, (quality, frame_id, crop.copy()))
+        elif quality > buffer[0][0]:
+            heapq.heapreplace(buffer, (quality, frame_id, crop.copy()))
+        else:
+            return None
+        return quality
+
+    @staticmethod
+    def _best(state):
+        return max(quality for quality, _, _ in state["buffer"]) if state["buffer"] else 0.0
+
+    def best_quality(self, track_id):
+        """Quality of the best buffered crop of a track (0.0 if none)."""
+        state = self.tracks.get(track_id)
+        return self._best(state) if state is not None else 0.0
+
+    def _take(self, state):
+        crops = [crop for _, _, crop in sorted(state["buffer"], key=lambda item: item[:2], reverse=True)]
+        state["fired_quality"] = self._best(state)
+        state["buffer"] = []
+        self.fired += 1
+        return crops
+
+    def take_ready(self, frame_id, track_ids=None):
+        """
+        Hand out the crops of tracks that are ready for analysis in this frame.
+        Args:
+            frame_id: current frame
+            track_ids: only consider these tracks (e.g. the ones in view); None = all
+        Returns:
+            dict of track_id -> list of buffered crops, best first
+        """
+        ready = {}
+        candidates = self.tracks if track_ids is None else [t for t in track_ids if t in self.tracks]
+        for track_id in candidates:
+            state = self.tracks[track_id]
+            if not state["buffer"] or state["fired_quality"] is not None:
+                continue
+            waited = self.max_wait is not None and frame_id - state["first_frame"] >= self.max_wait
+            if waited or self._best(state) >= self.quality_threshold:
+                ready[track_id] = self._take(state)
+        return ready
+
+    def _finish(self, track_id):
+        state = self.tracks.pop(track_id)
+        if not state["buffer"]:
+            return None
+        fired = state["fired_quality"]
+        if fired is not None and self._best(state) < fired + self.min_gain:
+            return None
+        return self._take(state)
+
+    def finish_stale(self, frame_id):
+        """
+        End tracks unseen for more than max_age frames.
+        Returns:
+            dict of track_id -> crops, best first, for ended tracks that still
+            deserve an analysis
+        """
+        ended = [track_id for track_id, state in self.tracks.items()
+                 if frame_id - state["last_seen"] > self.max_age]
+        shots = {track_id: self._finish(track_id) for track_id in ended}
+        return {track_id: crops for track_id, crops in shots.items() if crops}
+
+    def finish_all(self):
+        """End every open track (e.g. at the end of a video); same return value as finish_stale."""
+        shots = {track_id: self._finish(track_id) for track_id in list(self.tracks)}
+        return {track_id: crops for track_id, crops in shots.items() if crops}
+
+    def stats(self):
+        return (f"Best shot: {self.fired} analyses, {self.scored} crops scored, "
+                f"{self.skipped} skipped on geometry")
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __contains__(self, track_id):
+        return track_id in self.tracks
@@ -1,20 +1,47 @@
-from transformers import AutoImageProcessor, AutoModelForImageClassification
-from PIL import Image
-import torch
 import cv2
 import numpy as np
+from src import metrics
+from src.model_registry import get_vit
 
 class VehicleMakeModelClassifier:
-    def __init__(self, model_name="dima806/car_models_image_detection"):
+    def __init__(self, model_name="dima806/car_models_image_detection", max_batch_size=32,
+                 fast_preprocess=False, quantize=False, num_threads=None):
         """
         Initialize the vehicle make/model classifier.
         Using a lightweight model from HuggingFace.
+        Args:
+            model_name: HuggingFace model ID
+            max_batch_size: max crops per forward pass in classify_batch (bounds memory)
+            fast_preprocess: resize/normalize the uint8 crops with cv2 and torch
+                directly instead of going through PIL and the image processor
+            quantize: use a dynamically int8-quantized copy of the model's Linear layers
+            num_threads: torch intra-op threads for inference (None = torch default)
         """
-        print(f"Loading vehicle classifier: {model_name}...")
-        self.processor = AutoImageProcessor.from_pretrained(model_name)
-        self.model = AutoModelForImageClassification.from_pretrained(model_name)
-        self.model.eval()
-        print("Vehicle classifier loaded.")
+        # Processor and model come from the shared registry on first use
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.fast_preprocess = fast_preprocess
+        self.quantize = quantize
+        self.num_threads = num_threads
+        # (height, width, scale, offset) for the fast path, read from the processor once
+        self._fast_params = None
+        print(f"Vehicle classifier ({model_name}) initialized.")
+
+    @property
+    def processor(self):
+        return get_vit(self.model_name, self.quantize)[0]
+
+    @property
+    def model(self):
+        return get_vit(self.model_name, self.quantize)[1]
+
+    @property
+    def model_spec(self):
+        return ("vit", self.model_name, {"quantize": True} if self.quantize else {})
+
+    def warm_up(self):
+        """Runs one dummy forward pass so the first real crop is not slowed by setup."""
+        self.classify_batch([np.zeros((224, 224, 3), dtype=np.uint8)])
 
     def classify(self, image):
         """
@@ -24,28 +51,101 @@ class VehicleMakeModelClassifier:
         Returns:
             dict with 'make_model' and 'confidence'
         """
+        return self.classify_batch([image])[0]
+
+    def _preprocess(self, images):
+        """Reference path: BGR -> RGB -> PIL -> image processor."""
+        from PIL import Image
+
         # Convert BGR to RGB if numpy array
-        if isinstance(image, np.ndarray):
-            image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            image = Image.fromarray(image)
-        
-        # Process and predict
-        inputs = self.processor(images=image, return_tensors="pt")
-        
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            predicted_class_idx = logits.argmax(-1).item()
-            probabilities = torch.nn.functional.softmax(logits, dim=-1)
-            confidence = probabilities[0][predicted_class_idx].item()
-        
-        # Get the label
-        label = self.model.config.id2label[predicted_class_idx]
-        
-        return {
-            "make_model": label,
-            "confidence": confidence
-        }
+        pil_images = []
+        for image in images:
+            if isinstance(image, np.ndarray):
+                image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+                image = Image.fromarray(image)
+            pil_images.append(image)
+        return self.processor(images=pil_images, return_tensors="pt")["pixel_values"]
+
+    def _preprocess_fast(self, images):
+        """Fast path: cv2 resize into one uint8 batch, then a single fused normalize in torch."""
+        import torch
+
+        if self._fast_params is None:
+            processor = self.processor
+            size = processor.size
+            # shortest_edge processors resize by aspect ratio and center-crop,
+            # which the fixed-size cv2 resize below would not reproduce
+            if "height" not in size or "width" not in size:
+                raise ValueError(f"fast_preprocess needs a processor with a fixed height/width size, "
+                                 f"got {dict(size)}; use fast_preprocess=False for {self.model_name}")
+            height, width = size["height"], size["width"]
+            # (x * rescale - mean) / std folded into x * scale + offset
+            rescale = processor.rescale_factor if processor.do_rescale else 1.0
+            mean = np.asarray(processor.image_mean if processor.do_normalize else [0.0] * 3, dtype=np.float32)
+            std = np.asarray(processor.image_std if processor.do_normalize else [1.0] * 3, dtype=np.float32)
+            scale = torch.from_numpy(rescale / std).view(1, 3, 1, 1)
+            offset = torch.from_numpy(-mean / std).view(1, 3, 1, 1)
+            self._fast_params = (height, width, scale, offset)
+        height, width, scale, offset = self._fast_params
+
+        batch = np.empty((len(images), height, width, 3), dtype=np.uint8)
+        for i, image in enumerate(images):
+            if not isinstance(image, np.ndarray):
+                # PIL input is RGB; flip to BGR like the cv2 crops
+                image = np.asarray(image.convert("RGB"))[:, :, ::-1]
+            # INTER_AREA when shrinking approximates PIL's antialiased bilinear resize
+            shrinking = image.shape[0] > height or image.shape[1] > width
+            batch[i] = cv2.resize(image, (width, height),
+                                  interpolation=cv2.INTER_AREA if shrinking else cv2.INTER_LINEAR)
+
+        # BGR -> RGB and NHWC -> NCHW as views, then one float conversion
+        pixels = torch.from_numpy(batch).flip(-1).permute(0, 3, 1, 2).float()
+        return pixels.mul_(scale).add_(offset).contiguous()
+
+    def classify_batch(self, images, max_batch_size=None):
+        """
+        Classify several vehicle images with one forward pass per chunk.
+        Args:
+            images: list of numpy arrays (BGR format from cv2) or PIL Images
+            max_batch_size: max images per forward pass (default: self.max_batch_size)
+        Returns:
+            list of dicts with 'make_model' and 'confidence', in input order;
+            None or empty images get "Unknown" without reaching the model
+        """
+        # Deferred so importing this module stays cheap
+        import torch
+
+        if max_batch_size is None:
+            max_batch_size = self.max_batch_size
+        if self.num_threads and torch.get_num_threads() != self.num_threads:
+            torch.set_num_threads(self.num_threads)
+        preprocess = self._preprocess_fast if self.fast_preprocess else self._preprocess
+
+        results = [{"make_model": "Unknown", "confidence": 0.0} for _ in images]
+        valid = [i for i, image in enumerate(images)
+                 if image is not None and not (isinstance(image, np.ndarray) and image.size == 0)]
+        for start in range(0, len(valid), max_batch_size):
+            indices = valid[start:start + max_batch_size]
+            chunk = [images[i] for i in indices]
+            metrics.observe("batch_size", len(chunk), stage="classify")
+
+            # Process and predict the whole chunk as one tensor
+            with metrics.timer("stage_seconds", stage="classify_preprocess"):
+                pixel_values = preprocess(chunk)
+
+            with torch.no_grad(), metrics.timer("stage_seconds", stage="classify"):
+                outputs = self.model(pixel_values=pixel_values)
+                probabilities = torch.nn.functional.softmax(outputs.logits, dim=-1)
+                confidences, predicted_class_idxs = probabilities.max(dim=-1)
+
+            # Get the labels
+            for i, class_idx, confidence in zip(indices, predicted_class_idxs.tolist(), confidences.tolist()):
+                results[i] = {
+                    "make_model": self.model.config.id2label[class_idx],
+                    "confidence": confidence
+                }
+
+        return results
 
 if __name__ == "__main__":
     # Test initialization
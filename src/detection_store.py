@@ -0,0 +1,182 @@
+"""
+Columnar, array-backed store for per-frame detection results.
+
+Each result field is a preallocated numpy column that grows by doubling, and
+the string fields (vehicle class, make/model, plate) are interned into integer
+codes. Whole frames are appended at once. Compared with one Python dict per
+detection this needs a fraction of the memory and creates no per-detection
+objects for the garbage collector to track.
+
+The store still behaves like the old list of result dicts where the scripts
+rely on it (len, iteration, indexing and slicing yield row dicts), and
+exports to pandas/Parquet reuse the column buffers instead of copying them.
+"""
+
+import numpy as np
+
+# Column name -> dtype, in the order of the results CSV
+COLUMNS = {
+    "frame_id": np.int64,
+    "vehicle_id": np.int64,
+    "vehicle_class": np.int32,
+    "detection_confidence": np.float32,
+    "make_model": np.int32,
+    "make_model_confidence": np.float32,
+    "license_plate": np.int32,
+    "plate_confidence": np.float32,
+}
+# Columns holding codes into a StringInterner
+INTERNED = ("vehicle_class", "make_model", "license_plate")
+
+class StringInterner:
+    """Maps each distinct string to a stable integer code."""
+
+    def __init__(self):
+        self.codes = {}
+        self.values = []
+
+    def intern(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def intern_many(self, values):
+        return np.fromiter((self.intern(value) for value in values), dtype=np.int32, count=len(values))
+
+    def __len__(self):
+        return len(self.values)
+
+class DetectionStore:
+    def __init__(self, capacity=4096):
+        """
+        Args:
+            capacity: initial number of rows to preallocate (grows by doubling)
+        """
+        self.size = 0
+        self.columns = {name: np.empty(capacity, dtype=dtype) for name, dtype in COLUMNS.items()}
+        self.boxes = np.empty((capacity, 4), dtype=np.float32)
+        self.interners = {name: StringInterner() for name in INTERNED}
+
+    @property
+    def capacity(self):
+        return len(self.boxes)
+
+    def _reserve(self, extra):
+        needed = self.size + extra
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        for name, column in self.columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.columns[name] = grown
+        grown = np.empty((capacity, 4), dtype=np.float32)
+        grown[:self.size] = self.boxes[:self.size]
+        self.boxes = grown
+
+    def append_frame(self, frame_id, vehicle_ids, boxes, vehicle_classes, detection_confidences,
+                     make_models, make_model_confidences, license_plates, plate_confidences):
+        """
+        Append every detection of one frame.
+        Args:
+            frame_id: frame the detections belong to
+            vehicle_ids: track IDs, one per detection
+            boxes: (N, 4) array-like of x1, y1, x2, y2
+            vehicle_classes, make_models, license_plates: strings, one per detection
+            detection_confidences, make_model_confidences, plate_confidences: floats
+        """
+        count = len(vehicle_ids)
+        if count == 0:
+            return
+        self._reserve(count)
+        rows = slice(self.size, self.size + count)
+
+        self.columns["frame_id"][rows] = frame_id
+        self.columns["vehicle_id"][rows] = vehicle_ids
+        self.columns["detection_confidence"][rows] = detection_confidences
+        self.columns["make_model_confidence"][rows] = make_model_confidences
+        self.columns["plate_confidence"][rows] = plate_confidences
+        self.columns["vehicle_class"][rows] = self.interners["vehicle_class"].intern_many(vehicle_classes)
+        self.columns["make_model"][rows] = self.interners["make_model"].intern_many(make_models)
+        self.columns["license_plate"][rows] = self.interners["license_plate"].intern_many(license_plates)
+        self.boxes[rows] = np.asarray(boxes, dtype=np.float32).reshape(count, 4)
+        self.size += count
+
+    def column(self, name):
+        """View (no copy) of a numeric or code column over the stored rows."""
+        if name == "bbox":
+            return self.boxes[:self.size]
+        return self.columns[name][:self.size]
+
+    def row(self, index):
+        """One stored detection as a result dict (same keys as the results CSV)."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("detection index out of range")
+        row = {}
+        for name in COLUMNS:
+            value = self.columns[name][index].item()
+            row[name] = self.interners[name].values[value] if name in self.interners else value
+        row["bbox"] = self.boxes[index].tolist()
+        return row
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self.row(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.row(i) for i in range(*index.indices(self.size))]
+        return self.row(index)
+
+    def to_dataframe(self, bbox_as_list=False):
+        """
+        Export to a pandas DataFrame backed by the store's column buffers.
+        String columns become Categoricals over the interned codes; boxes
+        become x1/y1/x2/y2 columns, or one list-valued 'bbox' column (a copy,
+        matching the CSV layout) with bbox_as_list=True.
+        """
+        import pandas as pd
+
+        data = {}
+        for name in COLUMNS:
+            column = self.column(name)
+            if name in self.interners:
+                data[name] = pd.Categorical.from_codes(column, categories=self.interners[name].values)
+            else:
+                data[name] = column
+        if bbox_as_list:
+            data["bbox"] = self.column("bbox").tolist()
+        else:
+            for i, name in enumerate(("x1", "y1", "x2", "y2")):
+                data[name] = self.boxes[:self.size, i]
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """Export to a pyarrow Table; numeric columns wrap the numpy buffers."""
+        import pyarrow as pa
+
+        arrays = {}
+        for name in COLUMNS:
+            column = self.column(name)
+            if name in self.interners:
+                arrays[name] = pa.DictionaryArray.from_arrays(column, pa.array(self.interners[name].values))
+            else:
+                arrays[name] = pa.array(column)
+        # Each box component is a strided view; arrow needs contiguous buffers
+        for i, name in enumerate(("x1", "y1", "x2", "y2")):
+            arrays[name] = pa.array(np.ascontiguousarray(self.boxes[:self.size, i]))
+        return pa.table(arrays)
+
+    def to_parquet(self, path):
+        """Write the stored detections to a Parquet file (string columns stay dictionary-encoded)."""
+        import pyarrow.parquet as pq
+
+        pq.write_table(self.to_arrow(), path)
@@ -1,38 +1,85 @@
-from ultralytics import YOLO
 import cv2
+import numpy as np
 import os
+from src.model_registry import get_yolo, yolo_spec
+
+# COCO class IDs of vehicles: 2=car, 3=motorcycle, 5=bus, 7=truck
+VEHICLE_CLASSES = [2, 3, 5, 7]
+
+def vehicle_mask(class_ids, vehicle_classes=VEHICLE_CLASSES):
+    """Boolean mask of the rows whose class ID is a vehicle class (torch tensor or numpy array)."""
+    mask = class_ids == vehicle_classes[0]
+    for class_id in vehicle_classes[1:]:
+        mask |= class_ids == class_id
+    return mask
 
 class VehicleDetector:
-    def __init__(self, model_name='yolo11n.pt'):
-        # Load pre-trained YOLO11 model
-        self.model = YOLO(model_name)
+    def __init__(self, model_name='yolo11n.pt', roi=None, backend=None):
+        """
+        Args:
+            model_name: YOLO weights, shared through the model registry
+            roi: optional RegionOfInterest; inference runs on its bounding crop
+                and vehicles outside its polygons are dropped
+            backend: YOLO inference backend ('pytorch', 'onnx', 'openvino', ...;
+                default $YOLO_BACKEND or 'pytorch', see src/yolo_export.py)
+        """
+        # Pre-trained YOLO11 model, loaded from the shared registry on first use
+        self.model_name = model_name
+        self.backend = backend
+        self.roi = roi
         # Class names for COCO (0=person, 2=car, 3=motorcycle, 5=bus, 7=truck)
-        self.vehicle_classes = [2, 3, 5, 7]
+        self.vehicle_classes = VEHICLE_CLASSES
         print(f"Vehicle Detector ({model_name}) initialized.")
 
+    @property
+    def model(self):
+        return get_yolo(self.model_name, self.backend)
+
+    @property
+    def model_spec(self):
+        return yolo_spec(self.model_name, self.backend)
+
+    def warm_up(self):
+        """Runs one dummy inference so the first real frame is not slowed by setup."""
+        self.model(np.zeros((640, 640, 3), dtype=np.uint8), verbose=False)
+
+    def detect_arrays(self, image):
+        """
+        Detects vehicles in a frame, one array per field.
+        Returns:
+            dict with 'boxes' (N, 4) x1, y1, x2, y2, 'confidences' (N,) and 'class_ids' (N,)
+        """
+        frame = image
+        if self.roi is not None:
+            image, offset = self.roi.crop(frame)
+        # Non-vehicle classes are dropped inside NMS instead of afterwards
+        result = self.model(image, classes=self.vehicle_classes, verbose=False)[0]
+        boxes = result.boxes
+        # Guard for backends that ignore `classes`; the mask runs on the device tensor
+        data = boxes[vehicle_mask(boxes.cls, self.vehicle_classes)].cpu().numpy().data
+        if self.roi is not None:
+            # Map boxes from the ROI crop back to frame coordinates
+            data = data.copy()
+            data[:, [0, 2]] += offset[0]
+            data[:, [1, 3]] += offset[1]
+            data = data[self.roi.contains(data[:, :4], frame.shape)]
+        return {
+            "boxes": data[:, :4].astype(np.float32),
+            "confidences": data[:, 4].astype(np.float32),
+            "class_ids": data[:, 5].astype(np.int64)
+        }
+
     def detect_vehicles(self, image):
         """Detects vehicles in a frame."""
-        results = self.model(image, verbose=False)
-        
-        detections = []
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                cls_id = int(box.cls[0])
-                if cls_id in self.vehicle_classes:
-                    # Get box coordinates (x1, y1, x2, y2)
-                    coords = box.xyxy[0].tolist()
-                    conf = float(box.conf[0])
-                    label = self.model.names[cls_id]
-                    
-                    detections.append({
-                        "bbox": coords,
-                        "confidence": conf,
-                        "class": label,
-                        "class_id": cls_id
-                    })
-        
-        return detections
+        arrays = self.detect_arrays(image)
+        names = self.model.names
+        return [{
+            "bbox": bbox,
+            "confidence": conf,
+            "class": names[cls_id],
+            "class_id": cls_id
+        } for bbox, conf, cls_id in zip(arrays["boxes"].tolist(), arrays["confidences"].tolist(),
+                                        arrays["class_ids"].tolist())]
 
 if __name__ == "__main__":
     detector = VehicleDetector()
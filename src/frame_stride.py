@@ -0,0 +1,55 @@
+"""
+Frame-stride decoding: analyze every Nth frame without paying for the rest.
+
+cap.read() is grab() (demux and decode) followed by retrieve() (convert the
+decoded picture to a BGR array). Frames the pipeline does not analyze only
+need grab(): the codec still decodes them, since later frames reference them,
+but the color conversion and copy are skipped. A grabbed frame costs about
+half a read one at 1080p (benchmarks/bench_decode_stride.py). For live
+sources grab() also keeps the capture buffer drained at the camera's rate.
+
+Frame IDs stay in source-frame units (they advance by the stride), so
+timestamps (frame_id / fps), the renderer and every frame-count setting keep
+their meaning; the tracker is told the effective rate (source fps / stride).
+"""
+
+import math
+
+def analysis_stride(source_fps, analysis_fps=None):
+    """
+    Source frames per analyzed frame for a target analysis rate.
+    Args:
+        source_fps: frame rate of the video or camera
+        analysis_fps: frames per second to analyze (None = every frame)
+    Returns:
+        stride >= 1 (1 = every frame)
+    """
+    if not analysis_fps or not source_fps or analysis_fps >= source_fps:
+        return 1
+    return max(1, int(round(source_fps / analysis_fps)))
+
+def read_frame(cap, skip=0):
+    """
+    Skip `skip` frames with grab(), then decode the next one.
+    Returns:
+        (ret, frame) like cap.read(); ret is False once the source ends
+    """
+    for _ in range(skip):
+        if not cap.grab():
+            return False, None
+    return cap.read()
+
+def time_range_frames(fps, start_time=None, end_time=None):
+    """
+    Frame span of a time range.
+    Args:
+        fps: frame rate of the video
+        start_time: first second to process (None = from the start)
+        end_time: second to stop at (None = to the end)
+    Returns:
+        (start_frame, max_frames); max_frames is None without an end_time
+    """
+    start_frame = int(round(start_time * fps)) if start_time else 0
+    if end_time is None:
+        return start_frame, None
+    return start_frame, max(0, int(math.ceil(end_time * fps)) - start_frame)
@@ -5,19 +5,38 @@ import cv2
 import numpy as np
 import os
 
-def generate_demo_video(output_path="data/demo_video.mp4", num_frames=100):
-    """Generate a simple demo video with moving rectangles simulating cars."""
-    width, height = 1280, 720
+def generate_demo_video(output_path="data/demo_video.mp4", num_frames=100, num_cars=3,
+                        width=1280, height=720, seed=0):
+    """
+    Generate a simple demo video with moving rectangles simulating cars.
+    Args:
+        output_path: video file to write
+        num_frames: number of frames
+        num_cars: vehicles on screen (density); the first three are the classic demo cars
+        width, height: frame resolution; the scene is scaled to it
+        seed: random seed for the extra cars' lanes, speeds and colors
+    """
     fps = 30
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    sx, sy = width / 1280, height / 720
+    car_w, car_h = int(120 * sx), int(60 * sy)
     
     # Simulate 3 cars moving across the screen
     cars = [
         {"x": 0, "y": 200, "speed": 8, "color": (150, 150, 150)},
         {"x": 0, "y": 400, "speed": 5, "color": (100, 100, 150)},
         {"x": 200, "y": 300, "speed": 6, "color": (120, 140, 120)},
-    ]
+    ][:num_cars]
+    # Extra cars for denser scenes, spread over the road
+    rng = np.random.default_rng(seed)
+    for _ in range(num_cars - len(cars)):
+        cars.append({
+            "x": int(rng.integers(-120, 1280)),
+            "y": int(rng.integers(150, 490)),
+            "speed": int(rng.integers(3, 10)),
+            "color": tuple(int(c) for c in rng.integers(60, 220, 3))
+        })
     
     for frame_num in range(num_frames):
         # Create background
@@ -25,25 +44,25 @@ def generate_demo_video(output_path="data/demo_video.mp4", num_frames=100):
         frame[:] = (50, 50, 50)  # Dark gray
         
         # Draw road
-        cv2.rectangle(frame, (0, 150), (width, 550), (70, 70, 70), -1)
+        cv2.rectangle(frame, (0, int(150 * sy)), (width, int(550 * sy)), (70, 70, 70), -1)
         
         # Draw lane markings
-        for i in range(0, width, 100):
-            cv2.rectangle(frame, (i, 345), (i+50, 355), (200, 200, 200), -1)
+        for i in range(0, width, max(1, int(100 * sx))):
+            cv2.rectangle(frame, (i, int(345 * sy)), (i + int(50 * sx), int(355 * sy)), (200, 200, 200), -1)
         
         # Draw and move cars
         for car in cars:
+            x, y = int(car['x'] * sx), int(car['y'] * sy)
             # Draw car body
-            cv2.rectangle(frame, (car['x'], car['y']), 
-                         (car['x']+120, car['y']+60), car['color'], -1)
+            cv2.rectangle(frame, (x, y), (x + car_w, y + car_h), car['color'], -1)
             
             # Draw "license plate"
-            cv2.rectangle(frame, (car['x']+30, car['y']+45), 
-                         (car['x']+90, car['y']+55), (255, 255, 255), -1)
+            cv2.rectangle(frame, (x + int(30 * sx), y + int(45 * sy)), 
+                         (x + int(90 * sx), y + int(55 * sy)), (255, 255, 255), -1)
             
             # Move car
             car['x'] += car['speed']
-            if car['x'] > width:
+            if car['x'] > 1280:
                 car['x'] = -120
         
         out.write(frame)
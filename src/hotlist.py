@@ -0,0 +1,277 @@
+"""
+Fuzzy plate hotlist (stolen/wanted vehicles) with non-blocking alerts.
+
+OCR reads and hotlist plates are normalized the same way: uppercase
+alphanumerics (normalize_plate), then characters EasyOCR commonly confuses
+are folded into one class (O/Q/D -> 0, I/L -> 1, Z -> 2, S -> 5, G -> 6,
+B -> 8). A read of "8ABC-1O2" and a listed "BABC102" both become "8A8C102".
+
+Matching allows a bounded edit distance on top of that. A BK-tree in pure
+Python has to visit thousands of nodes per query at this scale, so the index
+uses symmetric deletions instead: every listed plate is stored under the
+hashes of all strings obtained by deleting up to max_distance characters.
+Two plates within edit distance k always share such a variant, so a query
+only looks up its own deletion variants (a few binary searches in sorted
+numpy arrays) and verifies the handful of candidates with Levenshtein.
+
+Hotlist file: CSV with a plate and an optional note per line, '#' comments:
+    ABC1234,stolen 2024-05-02
+    XYZ987
+"""
+
+import csv
+import os
+import queue
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from datetime import datetime
+
+import numpy as np
+
+from src import metrics
+from src.track_aggregator import normalize_plate
+
+# Characters EasyOCR mixes up, mapped to one representative
+CONFUSIONS = str.maketrans({"O": "0", "Q": "0", "D": "0", "I": "1", "L": "1", "Z": "2", "S": "5",
+                            "G": "6", "B": "8"})
+
+def canonical_plate(text):
+    """Normalized plate with OCR-confusable characters folded together."""
+    return normalize_plate(text).translate(CONFUSIONS)
+
+def deletion_variants(text, max_deletions):
+    """All strings obtained from `text` by deleting up to max_deletions characters (including text)."""
+    variants = {text}
+    frontier = {text}
+    for _ in range(max_deletions):
+        frontier = {s[:i] + s[i + 1:] for s in frontier for i in range(len(s))}
+        variants |= frontier
+    return variants
+
+def edit_distance(a, b, max_distance):
+    """Levenshtein distance of a and b, or max_distance + 1 once it is known to be larger."""
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous = current
+    return previous[-1]
+
+class Hotlist:
+    def __init__(self, plates=(), max_distance=1):
+        """
+        Args:
+            plates: iterable of plate strings or (plate, note) pairs
+            max_distance: largest edit distance (after confusion folding) the
+                index can answer; 1 covers one misread, dropped or extra character
+        """
+        self.max_distance = max_distance
+        self.plates = []
+        self.notes = []
+        canonicals = []
+        # Typed arrays: a million plates make several million variants
+        hashes = array("q")
+        ids = array("i")
+        for entry in plates:
+            plate, note = (entry, "") if isinstance(entry, str) else (entry[0], entry[1] if len(entry) > 1 else "")
+            canonical = canonical_plate(plate)
+            if not canonical:
+                continue
+            index = len(canonicals)
+            self.plates.append(plate)
+            self.notes.append(note)
+            canonicals.append(canonical)
+            variants = deletion_variants(canonical, max_distance)
+            hashes.extend(hash(variant) for variant in variants)
+            ids.extend([index] * len(variants))
+        self.canonicals = canonicals
+
+        # Sorted variant hashes with the entry each belongs to; the index lives in
+        # this process only, so str hashing is fine and collisions just add a
+        # candidate that fails verification
+        hashes = np.frombuffer(hashes, dtype=np.int64)
+        order = np.argsort(hashes, kind="stable")
+        self._hashes = hashes[order]
+        self._ids = np.frombuffer(ids, dtype=np.int32)[order]
+
+    @classmethod
+    def from_file(cls, path, max_distance=1):
+        """Load a hotlist CSV (plate[,note] per line, '#' comments)."""
+        with open(path, newline="") as f:
+            rows = [row for row in csv.reader(f) if row and row[0].strip() and not row[0].startswith("#")]
+        return cls(((row[0].strip(), ",".join(row[1:]).strip()) for row in rows), max_distance)
+
+    def lookup(self, text, max_distance=None):
+        """
+        Hotlist entries within max_distance edits of a plate read.
+        Returns:
+            list of {'plate', 'note', 'distance'} dicts, closest first
+        """
+        max_distance = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        query = canonical_plate(text)
+        if not query or not len(self._hashes):
+            return []
+
+        variants = np.fromiter((hash(v) for v in deletion_variants(query, max_distance)), dtype=np.int64)
+        starts = np.searchsorted(self._hashes, variants, side="left")
+        ends = np.searchsorted(self._hashes, variants, side="right")
+        candidates = set()
+        for start, end in zip(starts.tolist(), ends.tolist()):
+            candidates.update(self._ids[start:end].tolist())
+
+        matches = []
+        for index in candidates:
+            distance = edit_distance(query, self.canonicals[index], max_distance)
+            if distance <= max_distance:
+                matches.append({"plate": self.plates[index], "note": self.notes[index], "distance": distance})
+        matches.sort(key=lambda match: (match["distance"], match["plate"]))
+        return matches
+
+    def __len__(self):
+        return len(self.plates)
+
+def print_alert(alert):
+    """Default alert callback."""
+    where = ", ".join(f"{key} {alert[key]}" for key in ("stream_id", "vehicle_id", "frame_id") if key in alert)
+    print(f"🚨 HOTLIST HIT: read '{alert['read']}' matches {alert['plate']} "
+          f"(distance {alert['distance']}, conf {alert['confidence']:.2f}) {alert['note']} [{where}]")
+
+class HotlistMonitor:
+    def __init__(self, source, callback=print_alert, max_distance=1, min_confidence=0.3,
+                 fuzzy_min_confidence=0.5, reload_interval=10.0, dedup_size=10000):
+        """
+        Args:
+            source: hotlist CSV path (reloaded when it changes) or a Hotlist
+            callback: called with each alert dict on a background thread, so a
+                slow callback never blocks the frame loop (None = only queue them
+                in self.alerts)
+            max_distance: edit distance allowed between a read and a listed plate
+            min_confidence: OCR confidence needed for an exact (folded) match
+            fuzzy_min_confidence: OCR confidence needed for a match with edits
+            reload_interval: seconds between checks of the file's mtime
+            dedup_size: (vehicle, listed plate) pairs remembered so a vehicle
+                raises each alert only once
+        """
+        self.path = source if isinstance(source, str) else None
+        self.max_distance = max_distance
+        self.hotlist = Hotlist.from_file(source, max_distance) if self.path else source
+        self.callback = callback
+        self.min_confidence = min_confidence
+        self.fuzzy_min_confidence = fuzzy_min_confidence
+        self.reload_interval = reload_interval
+        self.dedup_size = dedup_size
+        self.alerts = queue.Queue()
+        self.alerted = OrderedDict()
+        self.reads_checked = 0
+        self.alert_count = 0
+        self._mtime = os.path.getmtime(self.path) if self.path else None
+        self._last_reload_check = time.monotonic()
+        self._reloading = None
+        self._dispatcher = None
+        if callback is not None:
+            self._dispatcher = threading.Thread(target=self._dispatch, daemon=True, name="hotlist-alerts")
+            self._dispatcher.start()
+        print(f"Hotlist loaded: {len(self.hotlist)} plates")
+
+    def check(self, text, confidence, **context):
+        """
+        Match one plate read against the hotlist and raise alerts for new hits.
+        Args:
+            text: raw OCR text
+            confidence: OCR confidence of the read
+            **context: attached to the alert (vehicle_id, frame_id, stream_id, ...)
+        Returns:
+            list of alerts raised by this read
+        """
+        self._maybe_reload()
+        if not text or confidence < self.min_confidence:
+            return []
+        self.reads_checked += 1
+        with metrics.timer("stage_seconds", stage="hotlist"):
+            matches = self.hotlist.lookup(text, self.max_distance)
+
+        raised = []
+        for match in matches:
+            if match["distance"] > 0 and confidence < self.fuzzy_min_confidence:
+                continue
+            key = (context.get("stream_id"), context.get("vehicle_id"), match["plate"])
+            if key in self.alerted:
+                continue
+            self.alerted[key] = True
+            if len(self.alerted) > self.dedup_size:
+                self.alerted.popitem(last=False)
+            alert = {**match, "read": text, "confidence": confidence,
+                     "timestamp": datetime.now().isoformat(), **context}
+            self.alerts.put(alert)
+            self.alert_count += 1
+            metrics.inc("hotlist_alerts_total")
+            raised.append(alert)
+        return raised
+
+    def drain(self):
+        """Take all queued alerts (only useful without a callback)."""
+        alerts = []
+        while True:
+            try:
+                alerts.append(self.alerts.get_nowait())
+            except queue.Empty:
+                return alerts
+
+    def reload(self, wait=False):
+        """Rebuild the index from the file on a background thread, then swap it in."""
+        if self.path is None or (self._reloading is not None and self._reloading.is_alive()):
+            return
+        self._reloading = threading.Thread(target=self._reload, daemon=True, name="hotlist-reload")
+        self._reloading.start()
+        if wait:
+            self._reloading.join()
+
+    def _reload(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+            hotlist = Hotlist.from_file(self.path, self.max_distance)
+        except Exception as e:
+            print(f"Hotlist reload failed, keeping the current list: {e}")
+            return
+        # A single reference swap: lookups in flight keep using the old index
+        self.hotlist = hotlist
+        self._mtime = mtime
+        print(f"Hotlist reloaded: {len(hotlist)} plates")
+
+    def _maybe_reload(self):
+        if self.path is None or time.monotonic() - self._last_reload_check < self.reload_interval:
+            return
+        self._last_reload_check = time.monotonic()
+        try:
+            changed = os.path.getmtime(self.path) != self._mtime
+        except OSError:
+            return
+        if changed:
+            self.reload()
+
+    def _dispatch(self):
+        while True:
+            alert = self.alerts.get()
+            if alert is None:
+                return
+            try:
+                self.callback(alert)
+            except Exception as e:
+                print(f"Hotlist alert callback error: {e}")
+
+    def close(self):
+        """Deliver queued alerts and stop the dispatcher thread."""
+        if self._dispatcher is not None:
+            self.alerts.put(None)
+            self._dispatcher.join()
+            self._dispatcher = None
+
+    def stats(self):
+        return f"Hotlist: {self.alert_count} alerts from {self.reads_checked} reads checked"
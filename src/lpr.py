@@ -1,29 +1,72 @@
 import cv2
-import easyocr
+import numpy as np
 import os
+from src import metrics
+from src.model_registry import get_ocr_reader
 
 class LicensePlateScanner:
-    def __init__(self):
-        # Initialize EasyOCR (gpu=False for broad compatibility)
-        # verbose=False to avoid UnicodeEncodeError in progress bar
-        self.reader = easyocr.Reader(['en'], gpu=False, verbose=False)
+    def __init__(self, languages=('en',), gpu=False, max_batch_size=16):
+        """
+        Args:
+            languages: EasyOCR language codes
+            gpu: run EasyOCR on the GPU (False for broad compatibility)
+            max_batch_size: max crops per batched EasyOCR call in scan_plates
+        """
+        # EasyOCR reader comes from the shared registry on first use
+        self.languages = tuple(languages)
+        self.gpu = gpu
+        self.max_batch_size = max_batch_size
         print("LPR Scanner (EasyOCR) initialized.")
 
-    def scan_plate(self, image_path):
-        """Scans the image for text (specifically license plates)."""
-        if not os.path.exists(image_path):
-            print(f"Error: {image_path} not found.")
-            return []
+    @property
+    def reader(self):
+        return get_ocr_reader(self.languages, gpu=self.gpu)
+
+    @property
+    def model_spec(self):
+        return ("easyocr", ",".join(self.languages), {"gpu": self.gpu})
+
+    def warm_up(self):
+        """Runs one dummy read so the first real crop is not slowed by setup."""
+        self.reader.readtext(np.zeros((64, 256, 3), dtype=np.uint8))
+
+    def _load_image(self, image):
+        """Returns a 3-channel BGR numpy array for a path or array input, or None."""
+        if isinstance(image, np.ndarray):
+            if image.size == 0:
+                return None
+            # Grayscale and BGRA inputs are converted so batches share one layout
+            if image.ndim == 2 or image.shape[2] == 1:
+                return cv2.cvtColor(image, cv2.COLOR_GRAY2BGR)
+            if image.shape[2] == 4:
+                return cv2.cvtColor(image, cv2.COLOR_BGRA2BGR)
+            return image
+
+        if not os.path.exists(image):
+            print(f"Error: {image} not found.")
+            return None
 
         # Load image with OpenCV first
-        image = cv2.imread(image_path)
+        loaded = cv2.imread(image)
+        if loaded is None:
+            print(f"Error: Could not read image {image}")
+        return loaded
+
+    def scan_plate(self, image):
+        """
+        Scans the image for text (specifically license plates).
+        Args:
+            image: numpy array (BGR format from cv2) or path to an image file
+        Returns:
+            list of dicts with 'text' and 'confidence'
+        """
+        image = self._load_image(image)
         if image is None:
-            print(f"Error: Could not read image {image_path}")
             return []
 
         # readtext returns a list of tuples: (bounding box, text, confidence)
-        # Pass the image array instead of the path
-        results = self.reader.readtext(image)
+        with metrics.timer("stage_seconds", stage="ocr"):
+            results = self.reader.readtext(image)
         
         plates = []
         for (bbox, text, prob) in results:
@@ -31,6 +74,48 @@ class LicensePlateScanner:
         
         return plates
 
+    def scan_plates(self, images, max_batch_size=None):
+        """
+        Scans several images in batched EasyOCR calls, without touching disk.
+        Args:
+            images: list of numpy arrays (BGR, BGRA or grayscale) or image paths
+            max_batch_size: max images per EasyOCR call (default: self.max_batch_size)
+        Returns:
+            list with one list of {'text', 'confidence'} dicts per input image
+        """
+        if max_batch_size is None:
+            max_batch_size = self.max_batch_size
+
+        images = [self._load_image(image) for image in images]
+        all_plates = [[] for _ in images]
+
+        # Sort by size so each batch is padded to a similar canvas
+        order = sorted((i for i, image in enumerate(images) if image is not None),
+                       key=lambda i: images[i].shape[0] * images[i].shape[1])
+
+        for start in range(0, len(order), max_batch_size):
+            chunk = order[start:start + max_batch_size]
+
+            # readtext_batched needs equally sized images: pad bottom/right
+            # instead of resizing so plates keep their aspect ratio
+            height = max(images[i].shape[0] for i in chunk)
+            width = max(images[i].shape[1] for i in chunk)
+            batch = []
+            for i in chunk:
+                h, w = images[i].shape[:2]
+                canvas = np.zeros((height, width, 3), dtype=images[i].dtype)
+                canvas[:h, :w] = images[i]
+                batch.append(canvas)
+
+            metrics.observe("batch_size", len(batch), stage="ocr")
+            with metrics.timer("stage_seconds", stage="ocr"):
+                batch_results = self.reader.readtext_batched(batch, batch_size=len(batch))
+            for i, results in zip(chunk, batch_results):
+                all_plates[i] = [{"text": text, "confidence": prob}
+                                 for (bbox, text, prob) in results]
+
+        return all_plates
+
 if __name__ == "__main__":
     scanner = LicensePlateScanner()
     sample_img = "data/mock_plate.jpg"
@@ -0,0 +1,201 @@
+"""
+Hot-path metrics for the pipelines, exposed in Prometheus text format.
+
+Metrics are off by default and every recording call returns after a single
+flag check, so instrumented code costs next to nothing until enable() or
+start_http_server() is called. All metrics are declared in METRICS below;
+instrumented code refers to them by name and passes labels as keywords:
+
+    with metrics.timer("stage_seconds", stage="classify"):
+        ...
+    metrics.inc("dropped_frames_total", stream="0")
+    metrics.set_gauge("active_tracks", len(detections), stream="0")
+
+Scrape with e.g. `curl localhost:9100/metrics` after start_http_server(9100).
+"""
+
+import threading
+import time
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+PREFIX = "vehicle_vision_"
+
+# Latency buckets in seconds, from a cheap tracker update to a slow OCR batch
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BATCH_BUCKETS = (1, 2, 4, 8, 16, 32, 64)
+
+# name -> (type, help); histograms use DEFAULT_BUCKETS unless listed in BUCKETS
+METRICS = {
+    "stage_seconds": ("histogram", "Time spent per pipeline stage (decode, yolo, bytetrack, classify, ocr, "
+                                   "hotlist, frame, encode)"),
+    "lag_seconds": ("histogram", "Capture-to-result lag of a frame"),
+    "batch_size": ("histogram", "Crops per batched classifier/OCR call"),
+    "frames_total": ("counter", "Frames processed"),
+    "gated_frames_total": ("counter", "Frames the motion gate let skip detection"),
+    "dropped_frames_total": ("counter", "Captured frames overwritten before the server took them"),
+    "dropped_jobs_total": ("counter", "Analysis jobs replaced or discarded before reaching a model"),
+    "hotlist_alerts_total": ("counter", "Plate reads that matched the hotlist"),
+    "queue_depth": ("gauge", "Items waiting in a pipeline queue"),
+    "active_tracks": ("gauge", "Vehicles tracked in the latest frame"),
+}
+BUCKETS = {"batch_size": BATCH_BUCKETS}
+
+_enabled = False
+_lock = threading.Lock()
+# name -> {labels tuple -> value}; histogram values are [bucket counts..., sum, count]
+_values = {name: {} for name in METRICS}
+_server = None
+
+_NULL_TIMER = nullcontext()
+
+def enabled():
+    return _enabled
+
+def enable():
+    """Start recording metrics."""
+    global _enabled
+    _enabled = True
+
+def disable():
+    """Stop recording metrics (values recorded so far are kept)."""
+    global _enabled
+    _enabled = False
+
+def reset():
+    """Drop every recorded value."""
+    with _lock:
+        for values in _values.values():
+            values.clear()
+
+def _key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def observe(name, value, **labels):
+    """Add one observation to histogram `name`."""
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        values = _values[name]
+        buckets = BUCKETS.get(name, DEFAULT_BUCKETS)
+        counts = values.get(key)
+        if counts is None:
+            counts = values[key] = [0] * (len(buckets) + 2)
+        for i, bound in enumerate(buckets):
+            if value <= bound:
+                counts[i] += 1
+                break
+        counts[-2] += value
+        counts[-1] += 1
+
+def inc(name, amount=1, **labels):
+    """Increase counter `name`."""
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        values = _values[name]
+        values[key] = values.get(key, 0) + amount
+
+def set_gauge(name, value, **labels):
+    """Set gauge `name` to `value`."""
+    if not _enabled:
+        return
+    key = _key(labels)
+    with _lock:
+        _values[name][key] = value
+
+class _Timer:
+    __slots__ = ("name", "labels", "start")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.start, **self.labels)
+        return False
+
+def timer(name, **labels):
+    """Context manager observing its duration in histogram `name` (a shared no-op when disabled)."""
+    if not _enabled:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in pairs) + "}"
+
+def render():
+    """All recorded metrics in the Prometheus text exposition format."""
+    lines = []
+    with _lock:
+        for name, (kind, help_text) in METRICS.items():
+            values = _values[name]
+            if not values:
+                continue
+            full_name = PREFIX + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+            for key, value in sorted(values.items()):
+                if kind != "histogram":
+                    lines.append(f"{full_name}{_format_labels(key)} {value}")
+                    continue
+                # Prometheus buckets are cumulative
+                cumulative = 0
+                for bound, count in zip(BUCKETS.get(name, DEFAULT_BUCKETS), value):
+                    cumulative += count
+                    lines.append(f"{full_name}_bucket{_format_labels(key, [('le', bound)])} {cumulative}")
+                lines.append(f"{full_name}_bucket{_format_labels(key, [('le', '+Inf')])} {value[-1]}")
+                lines.append(f"{full_name}_sum{_format_labels(key)} {value[-2]}")
+                lines.append(f"{full_name}_count{_format_labels(key)} {value[-1]}")
+    return "\n".join(lines) + "\n"
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Scrapes every few seconds would flood the console
+        pass
+
+def start_http_server(port=9100, host="127.0.0.1"):
+    """
+    Enable metrics and serve them at http://host:port/metrics from a daemon thread.
+    Args:
+        port: TCP port (0 picks a free one)
+        host: interface to bind, local-only by default
+    Returns:
+        the (host, port) the endpoint listens on
+    """
+    global _server
+    enable()
+    if _server is None:
+        _server = ThreadingHTTPServer((host, int(port)), _MetricsHandler)
+        _server.daemon_threads = True
+        threading.Thread(target=_server.serve_forever, daemon=True, name="metrics-http").start()
+        print(f"Metrics endpoint: http://{_server.server_address[0]}:{_server.server_address[1]}/metrics")
+    return _server.server_address[:2]
+
+def stop_http_server():
+    """Shut the endpoint down (metrics stay enabled)."""
+    global _server
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
@@ -0,0 +1,157 @@
+"""
+Process-wide registry of shared model instances.
+
+Models are built lazily on first request and shared by every caller that asks
+for the same name and config, so the YOLO weights, the ViT classifier and the
+EasyOCR reader are each loaded at most once per process. The heavy libraries
+are only imported when a model of that kind is first built.
+
+Shared models carry no per-stream state (tracking state lives in
+VehicleTracker), but their inference calls are not thread-safe: run each
+model from a single thread at a time.
+"""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# (kind, name, config) -> model instance
+_models = {}
+# (kind, name, config) -> seconds spent building the model
+load_times = {}
+# (kind, name, config) -> lock guarding the build of that model
+_build_locks = {}
+_registry_lock = threading.Lock()
+
+def _load_yolo(name, backend="pytorch"):
+    from ultralytics import YOLO
+    if backend == "pytorch":
+        return YOLO(name)
+    from src.yolo_export import export_yolo
+    return YOLO(export_yolo(name, backend), task="detect")
+
+def _load_vit(name, quantize=False):
+    from transformers import AutoImageProcessor, AutoModelForImageClassification
+    processor = AutoImageProcessor.from_pretrained(name)
+    model = AutoModelForImageClassification.from_pretrained(name)
+    model.eval()
+    if quantize:
+        import torch
+        # Dynamic int8 quantization of the Linear layers (almost all of a ViT's compute)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return processor, model
+
+def _load_easyocr(name, gpu=False):
+    import easyocr
+    # verbose=False to avoid UnicodeEncodeError in progress bar
+    return easyocr.Reader(name.split(','), gpu=gpu, verbose=False)
+
+LOADERS = {
+    "yolo": _load_yolo,
+    "vit": _load_vit,
+    "easyocr": _load_easyocr,
+}
+
+def _key(kind, name, config):
+    return (kind, name, tuple(sorted(config.items())))
+
+def get_model(kind, name, **config):
+    """
+    Return the shared model of `kind` for `name` and `config`, building it on first use.
+    Args:
+        kind: one of LOADERS ('yolo', 'vit', 'easyocr')
+        name: weights file or model ID
+        **config: extra loader options, part of the cache key
+    """
+    if kind not in LOADERS:
+        raise ValueError(f"Unknown model kind '{kind}', expected one of {sorted(LOADERS)}")
+
+    key = _key(kind, name, config)
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _registry_lock:
+        build_lock = _build_locks.setdefault(key, threading.Lock())
+
+    # Only callers of the same model wait on each other
+    with build_lock:
+        if key not in _models:
+            print(f"Loading {kind} model: {name}...")
+            start = time.perf_counter()
+            _models[key] = LOADERS[kind](name, **config)
+            load_times[key] = time.perf_counter() - start
+            print(f"Loaded {kind} model {name} in {load_times[key]:.2f}s")
+    return _models[key]
+
+def is_loaded(kind, name, **config):
+    """Return True if the model has already been built in this process."""
+    return _key(kind, name, config) in _models
+
+def clear():
+    """Drop every cached model (mainly for tests)."""
+    with _registry_lock:
+        _models.clear()
+        _build_locks.clear()
+        load_times.clear()
+
+def warm_up(components, parallel=True, dummy_pass=True):
+    """
+    Load the models behind several components, optionally in parallel, and
+    run one dummy inference through each to absorb first-call setup costs.
+    Args:
+        components: objects exposing `model_spec` (kind, name, config) and `warm_up()`
+        parallel: load the models concurrently in a thread pool
+        dummy_pass: call each component's warm_up() once its model is loaded
+    Returns:
+        dict of "kind:name" -> {"load": seconds, "warm_up": seconds}
+    """
+    if parallel:
+        # torch is a shared dependency of every loader; importing it once up
+        # front avoids concurrent first imports of the same package
+        try:
+            import torch  # noqa: F401
+        except ImportError:
+            pass
+
+    def load(component):
+        kind, name, config = component.model_spec
+        start = time.perf_counter()
+        get_model(kind, name, **config)
+        timing = {"load": time.perf_counter() - start, "warm_up": 0.0}
+        if dummy_pass:
+            start = time.perf_counter()
+            component.warm_up()
+            timing["warm_up"] = time.perf_counter() - start
+        return f"{kind}:{name}", timing
+
+    start = time.perf_counter()
+    if parallel:
+        with ThreadPoolExecutor(max_workers=max(1, len(components))) as pool:
+            timings = dict(pool.map(load, components))
+    else:
+        timings = dict(load(component) for component in components)
+
+    for model, timing in timings.items():
+        print(f"  {model}: load {timing['load']:.2f}s, warm-up {timing['warm_up']:.2f}s")
+    print(f"Models ready in {time.perf_counter() - start:.2f}s")
+    return timings
+
+def yolo_spec(model_name='yolo11n.pt', backend=None):
+    """(kind, name, config) of a YOLO model; backend defaults to $YOLO_BACKEND or 'pytorch'."""
+    from src.yolo_export import resolve_backend
+    backend = resolve_backend(backend)
+    return ("yolo", model_name, {} if backend == "pytorch" else {"backend": backend})
+
+def get_yolo(model_name='yolo11n.pt', backend=None):
+    """Shared ultralytics YOLO model, run by the given backend (see src/yolo_export.py)."""
+    kind, name, config = yolo_spec(model_name, backend)
+    return get_model(kind, name, **config)
+
+def get_vit(model_name="dima806/car_models_image_detection", quantize=False):
+    """Shared (image processor, classification model) pair, optionally int8-quantized."""
+    return get_model("vit", model_name, **({"quantize": True} if quantize else {}))
+
+def get_ocr_reader(languages=('en',), gpu=False):
+    """Shared EasyOCR reader."""
+    return get_model("easyocr", ",".join(languages), gpu=gpu)
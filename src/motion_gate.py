@@ -0,0 +1,87 @@
+"""
+Motion gate in front of the tracker.
+
+Empty or static scenes (night-time, low-traffic feeds) don't need a YOLO pass
+on every frame. MotionGate compares a small, blurred grayscale copy of each
+frame with the copy taken at the last detection, region by region. Only when
+some region changed, or when a full detection is overdue, does the frame go
+through detection; otherwise the tracker lets its current tracks coast.
+"""
+
+import cv2
+import numpy as np
+
+class MotionGate:
+    def __init__(self, width=160, grid=(4, 4), pixel_threshold=15, region_threshold=0.01, force_every=30):
+        """
+        Args:
+            width: frames are downscaled to this width before differencing
+            grid: (rows, cols) of regions checked independently, so a small
+                moving vehicle isn't averaged away by a large static scene
+            pixel_threshold: min gray-level change for a pixel to count as changed
+            region_threshold: fraction of changed pixels that marks a region as moving
+            force_every: run a full detection at least every N frames regardless
+        """
+        self.width = width
+        self.grid = grid
+        self.pixel_threshold = pixel_threshold
+        self.region_threshold = region_threshold
+        self.force_every = force_every
+        self.reference = None
+        self.frames_since_detection = 0
+        self.frames = 0
+        self.gated_frames = 0
+        # (row, col) of the regions that triggered the last detection
+        self.changed_regions = []
+
+    def _prepare(self, frame):
+        height, width = frame.shape[:2]
+        rows, cols = self.grid
+        # Round the small frame to a multiple of the grid so regions split evenly
+        small_width = max(cols, self.width // cols * cols)
+        small_height = max(rows, int(round(height * small_width / width / rows)) * rows)
+        small = cv2.resize(frame, (small_width, small_height), interpolation=cv2.INTER_AREA)
+        if small.ndim == 3:
+            small = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY)
+        # Blur away sensor noise and compression artifacts
+        return cv2.GaussianBlur(small, (5, 5), 0)
+
+    def _changed_regions(self, small):
+        rows, cols = self.grid
+        changed = cv2.absdiff(small, self.reference) > self.pixel_threshold
+        height, width = changed.shape
+        fractions = changed.reshape(rows, height // rows, cols, width // cols).mean(axis=(1, 3))
+        return [tuple(cell) for cell in np.argwhere(fractions > self.region_threshold).tolist()]
+
+    def should_detect(self, frame):
+        """
+        Decide whether a frame needs a detection pass.
+        Returns:
+            True to run detection, False to let the existing tracks coast
+        """
+        self.frames += 1
+        small = self._prepare(frame)
+        if self.reference is None or self.reference.shape != small.shape:
+            changed = [(0, 0)]
+        else:
+            changed = self._changed_regions(small)
+
+        if changed or self.frames_since_detection + 1 >= self.force_every:
+            self.reference = small
+            self.frames_since_detection = 0
+            self.changed_regions = changed
+            return True
+
+        self.frames_since_detection += 1
+        self.gated_frames += 1
+        return False
+
+    def reset(self):
+        """Forget the reference frame (the next frame is always detected)."""
+        self.reference = None
+        self.frames_since_detection = 0
+
+    def stats(self):
+        """Gated/total frame counts as a short string."""
+        share = self.gated_frames / self.frames * 100 if self.frames else 0.0
+        return f"{self.gated_frames}/{self.frames} frames skipped by the motion gate ({share:.1f}%)"
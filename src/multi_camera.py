@@ -0,0 +1,344 @@
+"""
+Multi-camera server: one process, one shared YOLO model, N video sources.
+
+Each source gets a capture thread that keeps only its latest frame. The server
+loop gathers the newest frame of every source into a single batched YOLO
+predict call and hands each result to that stream's own VehicleTracker, so
+ByteTrack state never mixes between cameras. Classification and OCR run on
+one shared AsyncAnalysisPool keyed by (stream_id, track_id). Every result is
+tagged with its stream ID.
+
+Usage:
+    python -m src.multi_camera rtsp://cam1/stream rtsp://cam2/stream data/traffic.mp4
+"""
+
+import argparse
+import threading
+import time
+from datetime import datetime
+
+import cv2
+
+from src.tracker import VehicleTracker
+from src.detector import VEHICLE_CLASSES
+from src.classifier import VehicleMakeModelClassifier
+from src.lpr import LicensePlateScanner
+from src.model_registry import get_yolo
+from src.track_cache import TrackResultCache
+from src.async_analysis import AsyncAnalysisPool
+from src.result_sink import open_result_sink
+from src.motion_gate import MotionGate
+from src.roi import load_roi_config, roi_for_camera
+from src.yolo_export import BACKENDS
+from src import metrics
+
+class CameraStream:
+    def __init__(self, stream_id, source, realtime=True):
+        """
+        Args:
+            stream_id: ID attached to every result of this source
+            source: camera index, stream URL or video file
+            realtime: pace file sources at their native fps, like a live camera;
+                if False, file frames are handed over one by one without drops
+        """
+        self.stream_id = stream_id
+        self.source = source
+        self.realtime = realtime
+        self.cap = None
+        self.fps = 30
+        self.frame = None
+        self.frame_id = 0
+        self.captured_at = None
+        self.dropped_frames = 0
+        self.finished = False
+        self.running = False
+        self.lock = threading.Lock()
+        # Signalled by latest() when the server takes the pending frame
+        self.frame_taken = threading.Condition(self.lock)
+        self.thread = None
+
+    def start(self):
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            print(f"Error: Could not open source {self.source} (stream {self.stream_id})")
+            self.finished = True
+            return False
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or 30
+        self.running = True
+        self.thread = threading.Thread(target=self._capture, daemon=True, name=f"capture-{self.stream_id}")
+        self.thread.start()
+        return True
+
+    def _capture(self):
+        is_file = isinstance(self.source, str) and "://" not in self.source
+        next_time = time.perf_counter()
+        while self.running:
+            ret, frame = self.cap.read()
+            if not ret:
+                break
+            with self.lock:
+                if is_file and not self.realtime:
+                    # Offline file: wait until the server took the previous frame
+                    while self.running and self.frame is not None:
+                        self.frame_taken.wait(0.1)
+                # The previous frame was never picked up by the server
+                if self.frame is not None:
+                    self.dropped_frames += 1
+                    metrics.inc("dropped_frames_total", stream=self.stream_id)
+                self.frame = frame
+                self.frame_id += 1
+                self.captured_at = time.time()
+            if is_file and self.realtime:
+                next_time += 1.0 / self.fps
+                time.sleep(max(0.0, next_time - time.perf_counter()))
+        self.finished = True
+        self.cap.release()
+
+    def latest(self):
+        """Take the newest unseen frame as (frame, frame_id, captured_at), or None."""
+        with self.lock:
+            if self.frame is None:
+                return None
+            item = (self.frame, self.frame_id, self.captured_at)
+            self.frame = None
+            self.frame_taken.notify()
+            return item
+
+    def stop(self):
+        with self.lock:
+            self.running = False
+            self.frame_taken.notify()
+        if self.thread:
+            self.thread.join()
+
+class MultiCameraServer:
+    def __init__(self, sources, model_name='yolo11n.pt', analyze=True, analysis_interval=10, realtime=True,
+                 result_sink=None, motion_gate=False, roi_config=None, backend=None, metrics_port=None):
+        """
+        Args:
+            sources: list of sources (stream IDs 0..N-1) or dict of stream_id -> source
+            model_name: YOLO weights shared by every stream
+            analyze: run make/model classification and plate OCR on tracked vehicles
+            analysis_interval: submit analysis jobs every N batched steps
+            realtime: pace file sources at their native fps
+            result_sink: path (.csv, .parquet, .db) or BackgroundSinkWriter that
+                result rows are streamed to instead of being kept in self.results
+            motion_gate: give every stream a MotionGate; static frames are left out
+                of the batch and reuse that stream's last tracks
+            roi_config: ROI JSON file or dict of stream_id -> RegionOfInterest;
+                each stream's YOLO input is cropped to its ROI
+            backend: YOLO backend ('pytorch', 'onnx', 'openvino', ...; default
+                $YOLO_BACKEND or 'pytorch', see src/yolo_export.py)
+            metrics_port: serve stage latencies, queue depths, dropped frames and
+                lag in Prometheus format on this local port (see src/metrics.py)
+        """
+        if metrics_port is not None:
+            metrics.start_http_server(metrics_port)
+        if not isinstance(sources, dict):
+            sources = dict(enumerate(sources))
+        print(f"Initializing Multi-Camera Server ({len(sources)} streams)...")
+        self.model_name = model_name
+        self.backend = backend
+        self.streams = {stream_id: CameraStream(stream_id, source, realtime)
+                        for stream_id, source in sources.items()}
+        # Separate ByteTrack state per stream, one shared YOLO model
+        if isinstance(roi_config, str):
+            roi_config = load_roi_config(roi_config)
+        self.trackers = {stream_id: VehicleTracker(model_name, motion_gate=MotionGate() if motion_gate else None,
+                                                   roi=roi_for_camera(roi_config, stream_id), backend=backend)
+                         for stream_id in sources}
+
+        self.analysis_interval = analysis_interval
+        self.analysis_pool = None
+        if analyze:
+            self.analysis_pool = AsyncAnalysisPool(VehicleMakeModelClassifier(), LicensePlateScanner())
+        # (stream_id, track_id) -> latest make/model and plate
+        self.track_results = TrackResultCache(max_age=30)
+        # stream_id -> (stream_id, track_id) keys in that stream's latest frame
+        self.active_keys = {stream_id: [] for stream_id in sources}
+        self.step_count = 0
+        self.result_sink = open_result_sink(result_sink) if isinstance(result_sink, str) else result_sink
+        self.results = []
+        print("Multi-camera server ready.\n")
+
+    def step(self):
+        """
+        Run one batched inference over the newest frame of every stream.
+        Returns:
+            list of dicts with stream_id, frame_id, detections, total_count and lag
+        """
+        batch = []
+        for stream_id, stream in self.streams.items():
+            item = stream.latest()
+            if item is not None:
+                batch.append((stream_id,) + item)
+        if not batch:
+            return []
+
+        self.step_count += 1
+        # Static streams coast on their last tracks and stay out of the batch
+        tracked = [self.trackers[stream_id].coast() if self.trackers[stream_id].gated(frame) else None
+                   for stream_id, frame, _, _ in batch]
+        to_detect = [i for i, item in enumerate(tracked) if item is None]
+        if to_detect:
+            # Each stream contributes its ROI crop (or full frame)
+            inputs = [self.trackers[batch[i][0]].inference_input(batch[i][1]) for i in to_detect]
+            # One forward pass for all cameras (ByteTrack needs low-confidence boxes)
+            with metrics.timer("stage_seconds", stage="yolo"):
+                results = get_yolo(self.model_name, self.backend).predict([image for image, _ in inputs], conf=0.1,
+                                                                          classes=VEHICLE_CLASSES, verbose=False)
+            for i, result, (_, offset) in zip(to_detect, results, inputs):
+                stream_id, frame = batch[i][:2]
+                tracked[i] = self.trackers[stream_id].update_arrays(result, frame, offset)
+
+        outputs = []
+        for (stream_id, frame, frame_id, captured_at), item in zip(batch, tracked):
+            detections, total_count = self.trackers[stream_id].as_detections(item)
+            self.active_keys[stream_id] = [(stream_id, detection['id']) for detection in detections]
+            for detection in detections:
+                key = (stream_id, detection['id'])
+                self.track_results.touch(key, self.step_count)
+                if self.analysis_pool and self.step_count % self.analysis_interval == 0:
+                    self._submit_analysis(key, frame, detection, frame_id)
+            lag = time.time() - captured_at
+            metrics.inc("frames_total", stream=stream_id)
+            metrics.set_gauge("active_tracks", len(detections), stream=stream_id)
+            metrics.observe("lag_seconds", lag, stream=stream_id)
+            outputs.append({
+                "stream_id": stream_id,
+                "frame_id": frame_id,
+                "frame": frame,
+                "detections": detections,
+                "total_count": total_count,
+                "lag": lag
+            })
+
+        if self.analysis_pool:
+            self._collect_analysis()
+            if metrics.enabled():
+                metrics.set_gauge("queue_depth", self.analysis_pool.pending(), queue="analysis")
+        self.track_results.evict_stale(self.step_count)
+
+        for output in outputs:
+            self._record(output)
+        return outputs
+
+    def _submit_analysis(self, key, frame, detection, frame_id):
+        """Queue the stages a track has no result for yet."""
+        x1, y1, x2, y2 = map(int, detection['bbox'])
+        crop = frame[y1:y2, x1:x2]
+        if crop.size == 0:
+            return
+        if self.track_results.get(key, 'make_model') is None:
+            self.analysis_pool.submit('make_model', key, crop, frame_id)
+        if self.track_results.get(key, 'plate') is None:
+            self.analysis_pool.submit('plate', key, crop, frame_id)
+
+    def _collect_analysis(self):
+        # Only tracks still in view on any stream keep their pending jobs
+        self.analysis_pool.update_active_tracks(
+            key for keys in self.active_keys.values() for key in keys)
+        for stage, key, result, frame_id in self.analysis_pool.collect():
+            if key not in self.track_results:
+                continue
+            # A failed plate read doesn't erase an earlier successful one
+            if stage == 'plate' and not result[0]:
+                continue
+            self.track_results.put(key, stage, result, self.step_count, 0)
+
+    def _record(self, output):
+        for detection in output['detections']:
+            key = (output['stream_id'], detection['id'])
+            make_model = self.track_results.get(key, 'make_model') or {"make_model": "N/A", "confidence": 0.0}
+            plate_text, plate_conf = self.track_results.get(key, 'plate') or (None, 0.0)
+            detection['make_model'] = make_model['make_model']
+            detection['license_plate'] = plate_text or "N/A"
+            row = {
+                "timestamp": datetime.now().isoformat(),
+                "stream_id": output['stream_id'],
+                "frame_id": output['frame_id'],
+                "vehicle_id": detection['id'],
+                "vehicle_class": detection['class'],
+                "detection_confidence": detection['confidence'],
+                "make_model": make_model['make_model'],
+                "make_model_confidence": make_model['confidence'],
+                "license_plate": plate_text or "N/A",
+                "plate_confidence": plate_conf,
+                "bbox": detection['bbox']
+            }
+            if self.result_sink:
+                self.result_sink.write(row)
+            else:
+                self.results.append(row)
+
+    def run(self, on_result=None, max_steps=None):
+        """
+        Serve all streams until every source ends (or max_steps batches ran).
+        Args:
+            on_result: optional callback receiving each per-stream output dict
+            max_steps: stop after this many batched inference steps
+        """
+        for stream_id, stream in self.streams.items():
+            if stream.start():
+                # Scale each tracker's track buffer to its camera's frame rate
+                self.trackers[stream_id].frame_rate = int(round(stream.fps))
+
+        try:
+            while not (max_steps and self.step_count >= max_steps):
+                outputs = self.step()
+                if not outputs:
+                    if all(stream.finished for stream in self.streams.values()):
+                        break
+                    # Nothing new from any camera yet
+                    time.sleep(0.001)
+                    continue
+                if on_result:
+                    for output in outputs:
+                        on_result(output)
+                if self.step_count % 30 == 0:
+                    counts = ", ".join(f"{o['stream_id']}: {o['total_count']}" for o in outputs)
+                    print(f"Step {self.step_count}: {len(outputs)} streams in batch, vehicles {counts}")
+        except KeyboardInterrupt:
+            print("\nInterrupted by user")
+        finally:
+            for stream in self.streams.values():
+                stream.stop()
+            if self.analysis_pool:
+                self.analysis_pool.close()
+            if self.result_sink:
+                self.result_sink.close()
+
+        for stream_id, stream in self.streams.items():
+            print(f"Stream {stream_id}: {stream.frame_id} frames captured, "
+                  f"{stream.dropped_frames} dropped, {len(self.trackers[stream_id].tracked_ids)} vehicles")
+            if self.trackers[stream_id].motion_gate:
+                print(f"  {self.trackers[stream_id].motion_gate.stats()}")
+
+    def save_results(self, csv_path="data/multi_camera_results.csv"):
+        """Save results of all streams to one CSV (with a stream_id column)."""
+        if not self.results:
+            print("No results to save.")
+            return
+
+        import pandas as pd
+
+        pd.DataFrame(self.results).to_csv(csv_path, index=False)
+        print(f"Results saved to {csv_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve several cameras from one process.")
+    parser.add_argument("sources", nargs="+", help="camera indices, stream URLs or video files")
+    parser.add_argument("--results", default="data/multi_camera_results.csv",
+                        help="results file, streamed while running (.csv, .parquet or .db)")
+    parser.add_argument("--no-analysis", action="store_true", help="track only, skip make/model and OCR")
+    parser.add_argument("--motion-gate", action="store_true", help="skip detection on static frames")
+    parser.add_argument("--roi", help="JSON file with ROI polygons per stream ID (see src/roi.py)")
+    parser.add_argument("--backend", choices=BACKENDS, help="YOLO inference backend (default: $YOLO_BACKEND or pytorch)")
+    parser.add_argument("--metrics-port", type=int, help="serve Prometheus metrics on this local port")
+    args = parser.parse_args()
+
+    sources = [int(s) if s.isdigit() else s for s in args.sources]
+    server = MultiCameraServer(sources, analyze=not args.no_analysis, result_sink=args.results,
+                               motion_gate=args.motion_gate, roi_config=args.roi, backend=args.backend,
+                               metrics_port=args.metrics_port)
+    server.run()
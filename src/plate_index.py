@@ -0,0 +1,496 @@
+"""
+Persistent search index over historical result files.
+
+Ingests the results files written by save_results and the result sinks
+(CSV, Parquet or SQLite) into one SQLite database and answers "when did plate X pass
+camera Y" without loading any CSV into pandas.
+
+Layout:
+    plates      - one row per distinct plate, in canonical form (normalized
+                  and OCR-confusion folded, see src/hotlist.py), with an FTS5
+                  trigram index for substring search
+    models      - one row per distinct make/model label
+    detections  - one row per result row, pointing at its plate and model;
+                  indexed by plate, camera and model, each with time
+    files       - every ingested file with the byte offset read so far, so
+                  re-running ingest on a growing CSV or SQLite file only
+                  reads the new rows
+
+Plate queries match substrings of the canonical plate ("ABC-1234", "abc1234"
+and "A8C1234" are the same plate), or whole plates within a few edits
+(candidates contain one of the query's pieces, verified with Levenshtein).
+Only the small plates table is searched; detections are then fetched through
+the plate index.
+
+Usage:
+    python -m src.plate_index ingest data/*.csv --camera 3
+    python -m src.plate_index search ABC1234 --camera 3 --since 2024-05-01
+    python -m src.plate_index search ABC1Z34 --fuzzy 1 --rows
+    python -m src.plate_index stats
+"""
+
+import argparse
+import csv
+import glob
+import hashlib
+import io
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime, timedelta
+
+from src.hotlist import canonical_plate, edit_distance
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE,
+    camera TEXT,
+    header TEXT,
+    head_hash TEXT,
+    offset INTEGER,
+    size INTEGER,
+    mtime REAL,
+    rows INTEGER,
+    ingested_at TEXT
+);
+CREATE TABLE IF NOT EXISTS plates (
+    id INTEGER PRIMARY KEY,
+    plate TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS models (
+    id INTEGER PRIMARY KEY,
+    make_model TEXT UNIQUE
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS plates_fts USING fts5(
+    plate, content='plates', content_rowid='id', tokenize='trigram'
+);
+CREATE TABLE IF NOT EXISTS detections (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER,
+    camera TEXT,
+    timestamp TEXT,
+    frame_id INTEGER,
+    vehicle_id INTEGER,
+    vehicle_class TEXT,
+    model_id INTEGER,
+    plate_id INTEGER,
+    license_plate TEXT,
+    plate_confidence REAL,
+    detection_confidence REAL
+);
+CREATE INDEX IF NOT EXISTS detections_plate ON detections (plate_id, timestamp);
+CREATE INDEX IF NOT EXISTS detections_camera ON detections (camera, timestamp);
+CREATE INDEX IF NOT EXISTS detections_model ON detections (model_id, timestamp);
+CREATE INDEX IF NOT EXISTS detections_file ON detections (file_id);
+"""
+
+DETECTION_COLUMNS = ("file_id", "camera", "timestamp", "frame_id", "vehicle_id", "vehicle_class", "model_id",
+                     "plate_id", "license_plate", "plate_confidence", "detection_confidence")
+
+# Bytes of a CSV read per batch, and bytes hashed to detect a rewritten file
+CHUNK_BYTES = 16 * 1024 * 1024
+HEAD_BYTES = 4096
+SQLITE_EXTENSIONS = (".db", ".sqlite")
+
+def _number(value, cast):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return None
+
+class PlateIndex:
+    def __init__(self, path="data/plate_index.db"):
+        """
+        Args:
+            path: SQLite database file, created if missing
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        # canonical plate -> id and make/model label -> id, filled lazily for ingest
+        self._plate_ids = None
+        self._model_ids = None
+
+    # ---- ingest ----
+
+    def _plate_id(self, text):
+        """ID of a plate read's canonical form (None for no plate), added if new."""
+        if not text or text == "N/A":
+            return None
+        plate = canonical_plate(text)
+        if not plate:
+            return None
+        plate_id = self._plate_ids.get(plate)
+        if plate_id is None:
+            plate_id = self.connection.execute("INSERT INTO plates (plate) VALUES (?)", (plate,)).lastrowid
+            self.connection.execute("INSERT INTO plates_fts (rowid, plate) VALUES (?, ?)", (plate_id, plate))
+            self._plate_ids[plate] = plate_id
+        return plate_id
+
+    def _model_id(self, make_model):
+        if not make_model or make_model == "N/A":
+            return None
+        model_id = self._model_ids.get(make_model)
+        if model_id is None:
+            model_id = self.connection.execute("INSERT INTO models (make_model) VALUES (?)", (make_model,)).lastrowid
+            self._model_ids[make_model] = model_id
+        return model_id
+
+    def _rows(self, records, header, file_id, camera, start_time, fps):
+        """Turn raw records (lists in `header` order) into detections rows."""
+        columns = {name: i for i, name in enumerate(header)}
+
+        def field(record, name):
+            i = columns.get(name)
+            return record[i] if i is not None and i < len(record) else None
+
+        for record in records:
+            frame_id = _number(field(record, "frame_id"), int)
+            timestamp = field(record, "timestamp") or None
+            if timestamp is None and start_time is not None and fps and frame_id is not None:
+                timestamp = (start_time + timedelta(seconds=frame_id / fps)).isoformat()
+            plate_text = field(record, "license_plate")
+            yield (file_id, field(record, "stream_id") or camera, timestamp, frame_id,
+                   _number(field(record, "vehicle_id"), int), field(record, "vehicle_class"),
+                   self._model_id(field(record, "make_model")), self._plate_id(plate_text),
+                   plate_text if plate_text != "N/A" else None,
+                   _number(field(record, "plate_confidence"), float),
+                   _number(field(record, "detection_confidence"), float))
+
+    def _insert(self, rows):
+        # Counted here: executemany's rowcount also includes the plate inserts made while it runs
+        placeholders = ", ".join("?" for _ in DETECTION_COLUMNS)
+        count = 0
+
+        def counted():
+            nonlocal count
+            for row in rows:
+                count += 1
+                yield row
+
+        self.connection.executemany(
+            f"INSERT INTO detections ({', '.join(DETECTION_COLUMNS)}) VALUES ({placeholders})", counted())
+        return count
+
+    def _head_hash(self, path, offset):
+        """Hash of the start of the already-ingested part, to notice a rewritten file."""
+        with open(path, "rb") as f:
+            return hashlib.sha1(f.read(min(HEAD_BYTES, offset))).hexdigest()
+
+    def _forget_file(self, file_id):
+        self.connection.execute("DELETE FROM detections WHERE file_id = ?", (file_id,))
+        self.connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+
+    def ingest(self, path, camera=None, start_time=None, fps=None, maintain=True):
+        """
+        Add a results file to the index, or only its new rows if it was ingested before.
+        Args:
+            path: results CSV, Parquet or SQLite (.db/.sqlite) file
+            camera: camera/source label for rows without a stream_id column
+            start_time: datetime of frame 0, to time-stamp rows without a
+                timestamp column (with fps)
+            fps: frame rate used with start_time
+            maintain: refresh statistics and checkpoint the WAL afterwards
+                (see maintain(); ingest_paths does it once for all files)
+        Returns:
+            number of detection rows added
+        """
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        if self._plate_ids is None:
+            self._plate_ids = dict(self.connection.execute("SELECT plate, id FROM plates"))
+            self._model_ids = dict(self.connection.execute("SELECT make_model, id FROM models"))
+
+        # SQLite sink files are read by rowid, so offset is the last rowid read
+        database = path.endswith(SQLITE_EXTENSIONS)
+        known = self.connection.execute(
+            "SELECT id, header, head_hash, offset, size, mtime, camera FROM files WHERE path = ?", (path,)).fetchone()
+        if known is not None:
+            file_id, header, old_hash, offset, size, mtime, old_camera = known
+            # (new rows of a SQLite file may still be in its WAL, leaving the file untouched)
+            if size == stat.st_size and mtime == stat.st_mtime and not database:
+                return 0
+            appendable = database or (path.endswith(".csv") and stat.st_size >= offset
+                                      and self._head_hash(path, offset) == old_hash)
+            if not appendable:
+                # Rewritten (e.g. save_results overwrote it): index it from scratch
+                self._forget_file(file_id)
+                known = None
+            else:
+                camera = camera if camera is not None else old_camera
+                header = json.loads(header)
+
+        with self.connection:
+            if known is None:
+                file_id = self.connection.execute(
+                    "INSERT INTO files (path, camera, offset, rows) VALUES (?, ?, 0, 0)", (path, camera)).lastrowid
+                header, offset = None, 0
+            if path.endswith(".parquet"):
+                added = self._ingest_parquet(path, file_id, camera, start_time, fps)
+                header, offset = [], stat.st_size
+            elif database:
+                added, header, offset = self._ingest_sqlite(path, file_id, offset, camera, start_time, fps)
+            else:
+                added, header, offset = self._ingest_csv(path, file_id, header, offset, camera, start_time, fps)
+            self.connection.execute(
+                "UPDATE files SET header = ?, head_hash = ?, offset = ?, size = ?, mtime = ?, rows = rows + ?, "
+                "ingested_at = ? WHERE id = ?",
+                (json.dumps(header), None if database else self._head_hash(path, offset), offset,
+                 stat.st_size, stat.st_mtime, added, datetime.now().isoformat(), file_id))
+        if maintain:
+            self.maintain()
+        return added
+
+    def maintain(self):
+        """Refresh query planner statistics and fold the WAL back into the database."""
+        # Statistics keep plate queries on the plate index even with camera/time filters
+        # (sampled, so this stays cheap on large indexes)
+        self.connection.execute("PRAGMA analysis_limit=1000")
+        self.connection.execute("ANALYZE")
+        self.connection.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def _ingest_csv(self, path, file_id, header, offset, camera, start_time, fps):
+        """Parse complete lines from `offset` on; returns (rows added, header, new offset)."""
+        added = 0
+        with open(path, "rb") as f:
+            f.seek(offset)
+            pending = b""
+            while True:
+                chunk = f.read(CHUNK_BYTES)
+                data = pending + chunk
+                # Only complete lines: a sink may be mid-write on the last one
+                end = data.rfind(b"\n") + 1
+                if end == 0:
+                    if not chunk:
+                        break
+                    pending = data
+                    continue
+                pending = data[end:]
+                records = csv.reader(io.StringIO(data[:end].decode("utf-8")))
+                if header is None:
+                    header = next(records, None)
+                added += self._insert(self._rows(records, header or [], file_id, camera, start_time, fps))
+                offset += end
+                if not chunk:
+                    break
+        return added, header, offset
+
+    def _ingest_parquet(self, path, file_id, camera, start_time, fps):
+        import pyarrow.parquet as pq
+
+        added = 0
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=100000):
+            header = batch.schema.names
+            columns = [column.to_pylist() for column in batch.columns]
+            records = ([None if value is None else str(value) for value in record] for record in zip(*columns))
+            added += self._insert(self._rows(records, header, file_id, camera, start_time, fps))
+        return added
+
+    def _ingest_sqlite(self, path, file_id, offset, camera, start_time, fps, table="results"):
+        """Read rows of a SQLiteResultSink table after rowid `offset`; returns (rows added, header, new offset)."""
+        source = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        try:
+            cursor = source.execute(f'SELECT rowid, * FROM "{table}" WHERE rowid > ? ORDER BY rowid', (offset,))
+            header = [description[0] for description in cursor.description][1:]
+            added = 0
+            while True:
+                batch = cursor.fetchmany(100000)
+                if not batch:
+                    break
+                offset = batch[-1][0]
+                records = ([None if value is None else str(value) for value in row[1:]] for row in batch)
+                added += self._insert(self._rows(records, header, file_id, camera, start_time, fps))
+        finally:
+            source.close()
+        return added, header, offset
+
+    def ingest_paths(self, patterns, camera=None, start_time=None, fps=None):
+        """Ingest every file matching the glob patterns. Returns total rows added."""
+        total = 0
+        for pattern in patterns:
+            for path in sorted(glob.glob(pattern)) or [pattern]:
+                added = self.ingest(path, camera=camera, start_time=start_time, fps=fps, maintain=False)
+                print(f"{path}: {added} new rows")
+                total += added
+        if total:
+            self.maintain()
+        return total
+
+    # ---- queries ----
+
+    def find_plates(self, query, fuzzy=0, limit=1000):
+        """
+        Canonical plates matching a query.
+        Args:
+            query: plate text or part of it (any formatting, OCR-confusion tolerant)
+            fuzzy: 0 = substring match; N = whole plates within N edits
+            limit: max plates returned
+        Returns:
+            list of (plate_id, plate)
+        """
+        query = canonical_plate(query)
+        if not query:
+            return []
+        if fuzzy:
+            return self._find_fuzzy(query, fuzzy, limit)
+        if len(query) < 3:
+            # Too short for trigrams: scan the (distinct) plates table
+            return self.connection.execute("SELECT id, plate FROM plates WHERE instr(plate, ?) > 0 LIMIT ?",
+                                           (query, limit)).fetchall()
+        return self.connection.execute(
+            "SELECT rowid, plate FROM plates_fts WHERE plates_fts MATCH ? LIMIT ?",
+            ('"' + query + '"', limit)).fetchall()
+
+    def _find_fuzzy(self, query, max_distance, limit):
+        # Cut the query into max_distance + 1 pieces: max_distance edits leave at
+        # least one of them intact, so every match contains one of the pieces
+        pieces = max_distance + 1
+        bounds = [len(query) * i // pieces for i in range(pieces + 1)]
+        candidates = {}
+        for start, end in zip(bounds, bounds[1:]):
+            piece = query[start:end]
+            if not piece:
+                continue
+            candidates.update(self.find_plates(piece, limit=-1))
+        matches = []
+        for plate_id, plate in candidates.items():
+            if abs(len(plate) - len(query)) > max_distance:
+                continue
+            distance = edit_distance(query, plate, max_distance)
+            if distance <= max_distance:
+                matches.append((distance, plate_id, plate))
+        return [(plate_id, plate) for _, plate_id, plate in sorted(matches)[:limit]]
+
+    def search(self, plate=None, fuzzy=0, camera=None, since=None, until=None, make_model=None,
+               vehicle_class=None, sightings=True, limit=100):
+        """
+        Search the index.
+        Args:
+            plate: plate text or substring (None = any, including no plate)
+            fuzzy: match whole plates within this many edits instead of substrings
+            camera: only this camera/source
+            since, until: ISO timestamps (inclusive) bounding the detection time
+            make_model: substring of the make/model label (case-insensitive)
+            vehicle_class: exact vehicle class ('car', 'truck', ...)
+            sightings: one row per vehicle pass (file, camera, vehicle_id) with
+                its first/last time and frame, instead of one per detection
+            limit: max rows returned
+        Returns:
+            list of dicts, newest first
+        """
+        conditions = []
+        params = []
+        if plate is not None:
+            plate_ids = [plate_id for plate_id, _ in self.find_plates(plate, fuzzy)]
+            if not plate_ids:
+                return []
+            conditions.append(f"d.plate_id IN ({', '.join('?' for _ in plate_ids)})")
+            params += plate_ids
+        if camera is not None:
+            conditions.append("d.camera = ?")
+            params.append(str(camera))
+        if since is not None:
+            conditions.append("d.timestamp >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("d.timestamp <= ?")
+            params.append(until)
+        if make_model is not None:
+            model_ids = [model_id for (model_id,) in self.connection.execute(
+                "SELECT id FROM models WHERE make_model LIKE ?", (f"%{make_model}%",))]
+            if not model_ids:
+                return []
+            conditions.append(f"d.model_id IN ({', '.join('?' for _ in model_ids)})")
+            params += model_ids
+        if vehicle_class is not None:
+            conditions.append("d.vehicle_class = ?")
+            params.append(vehicle_class)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        if sightings:
+            sql = f"""
+                SELECT d.camera, MIN(d.timestamp) AS first_seen, MAX(d.timestamp) AS last_seen,
+                       MIN(d.frame_id) AS first_frame, MAX(d.frame_id) AS last_frame, d.vehicle_id,
+                       d.vehicle_class, m.make_model, p.plate, MAX(d.plate_confidence) AS plate_confidence,
+                       COUNT(*) AS detections, f.path AS file
+                FROM detections d LEFT JOIN plates p ON p.id = d.plate_id LEFT JOIN models m ON m.id = d.model_id
+                     JOIN files f ON f.id = d.file_id
+                {where}
+                GROUP BY d.file_id, d.camera, d.vehicle_id, d.plate_id
+                ORDER BY first_seen DESC, first_frame DESC LIMIT ?"""
+        else:
+            sql = f"""
+                SELECT d.camera, d.timestamp, d.frame_id, d.vehicle_id, d.vehicle_class, m.make_model,
+                       d.license_plate, p.plate, d.plate_confidence, d.detection_confidence, f.path AS file
+                FROM detections d LEFT JOIN plates p ON p.id = d.plate_id LEFT JOIN models m ON m.id = d.model_id
+                     JOIN files f ON f.id = d.file_id
+                {where}
+                ORDER BY d.timestamp DESC, d.frame_id DESC LIMIT ?"""
+        cursor = self.connection.execute(sql, params + [limit])
+        names = [description[0] for description in cursor.description]
+        return [dict(zip(names, row)) for row in cursor]
+
+    def stats(self):
+        """Row, plate and file counts of the index."""
+        count = lambda table: self.connection.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+        return {"detections": count("detections"), "plates": count("plates"), "files": count("files")}
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+            self.connection = None
+
+def main():
+    parser = argparse.ArgumentParser(description="Index result files and search them by plate, camera and time.")
+    parser.add_argument("--db", default="data/plate_index.db", help="index database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="add result files (only new rows of known files)")
+    ingest.add_argument("paths", nargs="+", help="result CSV/Parquet/SQLite files or glob patterns")
+    ingest.add_argument("--camera", help="camera/source label for files without a stream_id column")
+    ingest.add_argument("--start-time", help="ISO time of frame 0, for files without a timestamp column")
+    ingest.add_argument("--fps", type=float, default=30.0, help="frame rate used with --start-time")
+
+    search = commands.add_parser("search", help="find detections by plate and filters")
+    search.add_argument("plate", nargs="?", help="plate or part of a plate (omit to filter by the options only)")
+    search.add_argument("--fuzzy", type=int, default=0, help="match whole plates within N edits")
+    search.add_argument("--camera")
+    search.add_argument("--since", help="ISO timestamp, e.g. 2024-05-01 or 2024-05-01T08:00")
+    search.add_argument("--until", help="ISO timestamp")
+    search.add_argument("--make-model", help="substring of the make/model")
+    search.add_argument("--vehicle-class")
+    search.add_argument("--rows", action="store_true", help="one line per detection instead of per sighting")
+    search.add_argument("--limit", type=int, default=50)
+
+    commands.add_parser("stats", help="show index size")
+    args = parser.parse_args()
+
+    index = PlateIndex(args.db)
+    try:
+        if args.command == "ingest":
+            start_time = datetime.fromisoformat(args.start_time) if args.start_time else None
+            total = index.ingest_paths(args.paths, camera=args.camera, start_time=start_time, fps=args.fps)
+            print(f"Ingested {total} rows. Index: {index.stats()}")
+        elif args.command == "search":
+            start = time.perf_counter()
+            rows = index.search(args.plate, fuzzy=args.fuzzy, camera=args.camera, since=args.since,
+                                until=args.until, make_model=args.make_model, vehicle_class=args.vehicle_class,
+                                sightings=not args.rows, limit=args.limit)
+            elapsed = (time.perf_counter() - start) * 1000
+            for row in rows:
+                print("  ".join(f"{key}={value}" for key, value in row.items() if key != "file"))
+            print(f"{len(rows)} results in {elapsed:.1f} ms")
+        else:
+            print(index.stats())
+    finally:
+        index.close()
+
+if __name__ == "__main__":
+    main()
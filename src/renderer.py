@@ -0,0 +1,270 @@
+"""
+Overlay rendering, decoupled from analysis.
+
+The pipeline can run analysis-only (process_video without an output path):
+no drawing and no encoding, just the per-frame result rows (boxes, make/model,
+plate). This module turns those rows plus the original video back into an
+annotated video, when someone actually wants to watch it, optionally only for
+some time ranges or vehicles. The overlays are the same ones process_video
+draws when it writes a video itself.
+
+Reads the layouts written by save_results and the result sinks: CSV with a
+"[x1, y1, x2, y2]" bbox column, Parquet (bbox list or x1/y1/x2/y2 columns)
+and the SQLite sink's .db. Needs per-frame rows (per_frame_results=True).
+
+Usage:
+    python -m src.renderer input.mp4 data/results.csv data/annotated.mp4
+    python -m src.renderer input.mp4 data/results.csv data/clip.mp4 --range 1:30-2:00 --range 300-310
+    python -m src.renderer input.mp4 data/results.csv data/vehicle_7.mp4 --vehicles 7 12
+"""
+
+import argparse
+import json
+import os
+import sqlite3
+import time
+
+import cv2
+import numpy as np
+
+from src.video_writer import BACKENDS, open_video_writer
+
+def draw_overlays(frame, detections, total_count, roi=None):
+    """
+    Draw boxes, make/model, plates and the vehicle count onto a frame in place.
+    Args:
+        frame: BGR frame
+        detections: dicts with 'bbox' and optional 'make_model'/'license_plate'
+        total_count: vehicles counted so far
+        roi: optional RegionOfInterest whose polygons are outlined
+    """
+    if roi is not None:
+        roi.draw(frame)
+    for det in detections:
+        x1, y1, x2, y2 = map(int, det['bbox'])
+        cv2.rectangle(frame, (x1, y1), (x2, y2), (0, 255, 0), 2)
+
+        # Display make/model and license plate
+        make_model = det.get('make_model', 'Unknown')
+        plate = det.get('license_plate', 'N/A')
+
+        # Draw make/model
+        cv2.putText(frame, make_model, (x1, y1-10),
+                   cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 255, 0), 1)
+
+        # Draw license plate if detected
+        if plate != "N/A":
+            cv2.putText(frame, f"Plate: {plate}", (x1, y2+12),
+                       cv2.FONT_HERSHEY_SIMPLEX, 0.3, (0, 255, 255), 1)
+
+    # Display total count
+    cv2.putText(frame, f"Total Vehicles: {total_count}", (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 255), 1)
+
+def load_results(path, stream_id=None):
+    """
+    Load per-frame result rows for rendering.
+    Args:
+        path: results file (.csv, .parquet, .db/.sqlite)
+        stream_id: keep only this stream of a multi-camera results file
+    Returns:
+        DataFrame with frame_id, vehicle_id, x1, y1, x2, y2, make_model and
+        license_plate columns, sorted by frame
+    """
+    import pandas as pd
+
+    if path.endswith(".parquet"):
+        df = pd.read_parquet(path)
+    elif path.endswith((".db", ".sqlite")):
+        with sqlite3.connect(path) as connection:
+            df = pd.read_sql('SELECT * FROM "results"', connection)
+    else:
+        df = pd.read_csv(path)
+
+    if stream_id is not None and "stream_id" in df.columns:
+        df = df[df["stream_id"].astype(str) == str(stream_id)]
+    if "bbox" in df.columns:
+        boxes = [json.loads(box) if isinstance(box, str) else list(box) for box in df["bbox"]]
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        df = df.drop(columns="bbox").assign(x1=boxes[:, 0], y1=boxes[:, 1], x2=boxes[:, 2], y2=boxes[:, 3])
+    for column, default in (("make_model", "Unknown"), ("license_plate", "N/A")):
+        df[column] = df[column].astype(object).fillna(default) if column in df.columns else default
+    columns = ["frame_id", "vehicle_id", "x1", "y1", "x2", "y2", "make_model", "license_plate"]
+    return df[columns].sort_values("frame_id", kind="stable").reset_index(drop=True)
+
+def parse_time(text):
+    """Seconds from '75', '75.5', '1:15' or '0:01:15'."""
+    seconds = 0.0
+    for part in text.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+def parse_range(text):
+    """(start, end) seconds from 'START-END', e.g. '1:30-2:00' or '90-120'."""
+    start, end = text.split("-")
+    return parse_time(start), parse_time(end)
+
+def merge_ranges(ranges):
+    """Sort [start, end) frame ranges and merge the overlapping/adjacent ones."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def frame_ranges(results, fps, total_frames, time_ranges=None, vehicle_ids=None, padding=1.0):
+    """
+    Frame ranges to render.
+    Args:
+        results: DataFrame from load_results
+        fps: frame rate of the source video
+        total_frames: frames in the source video
+        time_ranges: list of (start, end) seconds (None = whole video)
+        vehicle_ids: only where these vehicles are visible, plus `padding`
+            seconds before and after (None = every vehicle)
+        padding: seconds added around each selected vehicle's appearance
+    Returns:
+        sorted, merged list of [start, end) frame ranges
+    """
+    ranges = [(0, total_frames)]
+    if time_ranges:
+        ranges = merge_ranges((int(start * fps), min(total_frames, int(np.ceil(end * fps))))
+                              for start, end in time_ranges)
+    if vehicle_ids:
+        spans = results[results["vehicle_id"].isin(vehicle_ids)].groupby("vehicle_id")["frame_id"].agg(["min", "max"])
+        pad = int(round(padding * fps))
+        spans = merge_ranges((max(0, first - pad), min(total_frames, last + 1 + pad))
+                             for first, last in zip(spans["min"], spans["max"]))
+        # Intersect with the time ranges
+        ranges = [(max(start, span_start), min(end, span_end))
+                  for start, end in ranges for span_start, span_end in spans
+                  if max(start, span_start) < min(end, span_end)]
+    return [(int(start), int(end)) for start, end in ranges if start < end]
+
+def render_video(video_path, results, output_path, time_ranges=None, vehicle_ids=None, padding=1.0,
+                 roi=None, stream_id=None, writer_options=None):
+    """
+    Draw stored results onto the original video.
+    Args:
+        video_path: the video that was analyzed
+        results: results file path or a DataFrame from load_results
+        output_path: annotated video to write
+        time_ranges: list of (start, end) seconds to render (None = whole video)
+        vehicle_ids: only draw these vehicles, and only the frames they are in
+        padding: seconds of context kept around selected vehicles
+        roi: optional RegionOfInterest to outline, as process_video does
+        stream_id: stream to take from a multi-camera results file
+        writer_options: open_video_writer options (backend, codec, preset, crf, threads)
+    Returns:
+        number of frames written
+    """
+    if isinstance(results, str):
+        results = load_results(results, stream_id)
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise IOError(f"Cannot open video: {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+
+    # "Total Vehicles" counts every vehicle seen up to the frame, selected or not
+    first_seen = np.sort(results.groupby("vehicle_id")["frame_id"].min().to_numpy())
+    # Results analyzed at a stride (process_video analysis_fps) only have rows on
+    # every stride-th frame; their boxes are held over the frames in between
+    analyzed = np.unique(results["frame_id"].to_numpy())
+    hold = int(np.diff(analyzed).min()) if len(analyzed) > 1 else 1
+    if total_frames <= 0:
+        # Some containers and streams report no frame count: go up to the last result
+        total_frames = int(analyzed[-1]) + hold if len(analyzed) else 0
+    ranges = frame_ranges(results, fps, total_frames, time_ranges, vehicle_ids, padding)
+    if vehicle_ids:
+        results = results[results["vehicle_id"].isin(vehicle_ids)]
+    # Only the rows of the selected frames are grouped
+    frame_ids = results["frame_id"].to_numpy()
+    keep = np.zeros(len(results), dtype=bool)
+    for start, end in ranges:
+        keep |= (frame_ids > start - hold) & (frame_ids < end)
+    by_frame = {}
+    for row in results[keep].itertuples(index=False):
+        by_frame.setdefault(row.frame_id, []).append({
+            'bbox': (row.x1, row.y1, row.x2, row.y2),
+            'make_model': row.make_model,
+            'license_plate': row.license_plate,
+        })
+
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    out = open_video_writer(output_path, fps, (width, height), **(writer_options or {}))
+    written = 0
+    position = 0
+    detections, detections_at = [], -hold
+    start_time = time.perf_counter()
+    try:
+        for start, end in ranges:
+            if start - position > fps * 2:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, start)
+            else:
+                # Short gaps: skipping without decoding is cheaper than a seek
+                for _ in range(start - position):
+                    cap.grab()
+            position = start
+            # Rows of an analyzed frame just before the range
+            for frame_id in range(start - 1, start - hold, -1):
+                if frame_id in by_frame:
+                    detections, detections_at = by_frame[frame_id], frame_id
+                    break
+            while position < end:
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                if position in by_frame:
+                    detections, detections_at = by_frame[position], position
+                elif position - detections_at >= hold:
+                    detections = []
+                draw_overlays(frame, detections,
+                              int(np.searchsorted(first_seen, position, side="right")), roi)
+                out.write(frame)
+                written += 1
+                position += 1
+    finally:
+        cap.release()
+        out.release()
+    elapsed = time.perf_counter() - start_time
+    print(f"Rendered {written} frames in {len(ranges)} range(s) to {output_path} "
+          f"({written / elapsed if elapsed else 0:.1f} fps)")
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Render stored results onto the original video.")
+    parser.add_argument("video", help="video that was analyzed")
+    parser.add_argument("results", help="results file (.csv, .parquet, .db)")
+    parser.add_argument("output", help="annotated video to write")
+    parser.add_argument("--range", dest="ranges", action="append", type=parse_range,
+                        help="START-END in seconds or [H:]M:S, repeatable (default: whole video)")
+    parser.add_argument("--vehicles", type=int, nargs="+", help="only these vehicle IDs, and only where visible")
+    parser.add_argument("--padding", type=float, default=1.0, help="seconds kept around selected vehicles")
+    parser.add_argument("--roi", help="ROI JSON to outline (see src/roi.py)")
+    parser.add_argument("--stream-id", help="stream to render from a multi-camera results file")
+    parser.add_argument("--writer", choices=BACKENDS, help="video writer (default: $VIDEO_WRITER or auto)")
+    parser.add_argument("--codec", default="libx264", help="ffmpeg encoder")
+    parser.add_argument("--preset", default="ultrafast", help="ffmpeg encoder preset")
+    parser.add_argument("--crf", type=int, default=23, help="ffmpeg constant rate factor (lower = better)")
+    parser.add_argument("--threads", type=int, default=0, help="ffmpeg encoder threads (0 = auto)")
+    args = parser.parse_args()
+
+    roi = None
+    if args.roi:
+        from src.roi import load_roi_config, roi_for_camera
+
+        roi = roi_for_camera(load_roi_config(args.roi), args.stream_id)
+    render_video(args.video, args.results, args.output, time_ranges=args.ranges, vehicle_ids=args.vehicles,
+                 padding=args.padding, roi=roi, stream_id=args.stream_id,
+                 writer_options={"backend": args.writer, "codec": args.codec, "preset": args.preset,
+                                 "crf": args.crf, "threads": args.threads})
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Streaming result sinks.
+
+Instead of keeping every per-frame detection in memory until save_results,
+pipelines can hand each result row to a sink. BackgroundSinkWriter batches
+rows on a background thread and writes them to one of the backends below with
+periodic flushes, so memory stays flat however long the run is and a crash
+loses at most the last flush interval.
+
+Backends:
+    CSVResultSink     - append-only CSV, same layout as save_results
+    ParquetResultSink - one Parquet row group per batch (requires pyarrow)
+    SQLiteResultSink  - rows in a `results` table
+"""
+
+import csv
+import json
+from abc import ABC, abstractmethod
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+def _to_python(value):
+    """Convert numpy scalars to plain Python values."""
+    return value.item() if hasattr(value, 'item') else value
+
+class ResultSink(ABC):
+    """Base class: receives batches of result dicts."""
+
+    def __init__(self, path):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @abstractmethod
+    def write_rows(self, rows):
+        """Write a batch of result dicts."""
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class CSVResultSink(ResultSink):
+    def __init__(self, path, columns=None):
+        """
+        Args:
+            path: CSV file, appended to if it exists
+            columns: column order (default: keys of the first row)
+        """
+        super().__init__(path)
+        self.columns = columns
+        self.file = None
+        self.writer = None
+
+    def _open(self, rows):
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        if self.columns is None:
+            self.columns = list(rows[0].keys())
+        self.file = open(self.path, 'a', newline='')
+        self.writer = csv.writer(self.file)
+        if write_header:
+            self.writer.writerow(self.columns)
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        if self.writer is None:
+            self._open(rows)
+        # Lists (bbox) are written as "[x1, y1, x2, y2]", like pandas does
+        self.writer.writerows([[_to_python(row.get(column, '')) for column in self.columns]
+                               for row in rows])
+
+    def flush(self):
+        if self.file:
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            self.writer = None
+
+class ParquetResultSink(ResultSink):
+    def __init__(self, path, compression='snappy'):
+        """
+        Args:
+            path: Parquet file (overwritten); the footer is written on close
+            compression: Parquet compression codec
+        """
+        super().__init__(path)
+        self.compression = compression
+        self.writer = None
+        self.schema = None
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = [{key: _to_python(value) for key, value in row.items()} for row in rows]
+        if self.schema is None:
+            table = pa.Table.from_pylist(rows)
+            self.schema = table.schema
+            self.writer = pq.ParquetWriter(self.path, self.schema, compression=self.compression)
+        else:
+            table = pa.Table.from_pylist(rows, schema=self.schema)
+        # Every batch becomes one row group
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer:
+            self.writer.close()
+            self.writer = None
+
+class SQLiteResultSink(ResultSink):
+    def __init__(self, path, table='results'):
+        """
+        Args:
+            path: SQLite database file, appended to if it exists
+            table: table name; created from the first row's columns
+        """
+        super().__init__(path)
+        self.table = table
+        self.columns = None
+        # Used from the BackgroundSinkWriter thread, not the creating thread
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+
+    def _create_table(self, row):
+        types = []
+        for column, value in row.items():
+            value = _to_python(value)
+            if isinstance(value, bool) or isinstance(value, int):
+                types.append(f'"{column}" INTEGER')
+            elif isinstance(value, float):
+                types.append(f'"{column}" REAL')
+            else:
+                types.append(f'"{column}" TEXT')
+        self.connection.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({", ".join(types)})')
+        self.columns = list(row.keys())
+
+    def write_rows(self, rows):
+        if not rows:
+            return
+        if self.columns is None:
+            self._create_table(rows[0])
+
+        def encode(value):
+            value = _to_python(value)
+            # Lists (bbox) are stored as JSON text
+            return json.dumps(value) if isinstance(value, (list, tuple)) else value
+
+        placeholders = ", ".join("?" for _ in self.columns)
+        column_names = ", ".join(f'"{column}"' for column in self.columns)
+        self.connection.executemany(
+            f'INSERT INTO "{self.table}" ({column_names}) VALUES ({placeholders})',
+            [[encode(row.get(column)) for column in self.columns] for row in rows])
+
+    def flush(self):
+        self.connection.commit()
+
+    def close(self):
+        if self.connection:
+            self.connection.commit()
+            self.connection.close()
+            self.connection = None
+
+SINKS = {
+    '.csv': CSVResultSink,
+    '.parquet': ParquetResultSink,
+    '.db': SQLiteResultSink,
+    '.sqlite': SQLiteResultSink,
+}
+
+class BackgroundSinkWriter:
+    def __init__(self, sink, batch_size=1000, flush_interval=5.0, max_queue=100000):
+        """
+        Args:
+            sink: ResultSink backend the rows end up in
+            batch_size: rows per write_rows call
+            flush_interval: seconds between flushes of the backend
+            max_queue: max rows waiting for the writer thread (bounds memory)
+        """
+        self.sink = sink
+        self.path = sink.path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.rows_written = 0
+        self.error = None
+        self.thread = threading.Thread(target=self._run, daemon=True, name="result-sink")
+        self.thread.start()
+
+    def write(self, row):
+        """Queue one result row (blocks only if the writer falls max_queue rows behind)."""
+        if self.error:
+            raise self.error
+        self.queue.put(row)
+
+    def _run(self):
+        batch = []
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = False
+
+            # None = close, Event = explicit flush request, False = interval elapsed
+            if item is None or item is False or isinstance(item, threading.Event) or \
+                    time.monotonic() - last_flush >= self.flush_interval:
+                if isinstance(item, dict):
+                    batch.append(item)
+                self._write(batch)
+                batch = []
+                self._flush()
+                last_flush = time.monotonic()
+                if isinstance(item, threading.Event):
+                    item.set()
+                if item is None:
+                    return
+                continue
+
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write(batch)
+                batch = []
+
+    def _write(self, batch):
+        if not batch or self.error:
+            return
+        try:
+            self.sink.write_rows(batch)
+            self.rows_written += len(batch)
+        except Exception as e:
+            print(f"Result sink error: {e}")
+            self.error = e
+
+    def _flush(self):
+        if self.error:
+            return
+        try:
+            self.sink.flush()
+        except Exception as e:
+            print(f"Result sink error: {e}")
+            self.error = e
+
+    def flush(self, timeout=None):
+        """
+        Block until every queued row has been written and flushed.
+        Args:
+            timeout: max seconds to wait (None = as long as the writer thread runs)
+        Returns:
+            True once flushed; False if the writer is closed or the wait timed out
+        Raises:
+            the backend's exception if a write or flush failed
+        """
+        if self.error:
+            raise self.error
+        # After close() the thread is gone (and has flushed everything): nobody would answer
+        if not self.thread.is_alive():
+            return False
+        done = threading.Event()
+        self.queue.put(done)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while not done.wait(0.1):
+            if not self.thread.is_alive() or (deadline is not None and time.monotonic() >= deadline):
+                return False
+        if self.error:
+            raise self.error
+        return True
+
+    def close(self):
+        """Write remaining rows and close the backend; raises the backend's exception if a write failed."""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+        self.sink.close()
+        if self.error:
+            raise self.error
+
+def open_result_sink(path, batch_size=1000, flush_interval=5.0):
+    """
+    Open a background-written sink, picking the backend from the file extension
+    (.csv, .parquet, .db/.sqlite).
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in SINKS:
+        raise ValueError(f"Unsupported result sink '{path}', expected one of {sorted(SINKS)}")
+    return BackgroundSinkWriter(SINKS[extension](path), batch_size=batch_size,
+                                flush_interval=flush_interval)
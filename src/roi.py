@@ -0,0 +1,91 @@
+"""
+Per-camera regions of interest.
+
+Each camera can have one or more ROI polygons (road lanes, gates) in frame
+coordinates. Inference only runs on the bounding crop of their union and the
+boxes are mapped back to frame coordinates; vehicles whose ground point
+(bottom-center of the box) lies outside every polygon are dropped before
+classification and OCR.
+
+Config file (JSON), keyed by camera/stream ID, with an optional fallback:
+    {
+        "default": [[[0, 300], [1280, 300], [1280, 720], [0, 720]]],
+        "0": [[[100, 350], [900, 350], [1200, 720], [0, 720]]]
+    }
+"""
+
+import json
+
+import cv2
+import numpy as np
+
+class RegionOfInterest:
+    def __init__(self, polygons):
+        """
+        Args:
+            polygons: list of polygons, each a list of (x, y) points in frame pixels
+        """
+        self.polygons = [np.asarray(polygon, dtype=np.int32).reshape(-1, 2) for polygon in polygons]
+        if not self.polygons or any(len(polygon) < 3 for polygon in self.polygons):
+            raise ValueError("ROI needs at least one polygon with three or more points")
+        points = np.concatenate(self.polygons)
+        self.bounds = (int(points[:, 0].min()), int(points[:, 1].min()),
+                       int(points[:, 0].max()) + 1, int(points[:, 1].max()) + 1)
+        # Rasterized polygons, built per frame size
+        self.mask = None
+
+    def crop_bounds(self, frame_shape):
+        """(x1, y1, x2, y2) of the polygons' bounding box, clipped to the frame."""
+        height, width = frame_shape[:2]
+        x1, y1, x2, y2 = self.bounds
+        return max(0, x1), max(0, y1), min(width, x2), min(height, y2)
+
+    def crop(self, frame):
+        """
+        Cut the ROI's bounding box out of a frame (a view, no copy).
+        Returns:
+            (crop, (offset_x, offset_y))
+        """
+        x1, y1, x2, y2 = self.crop_bounds(frame.shape)
+        return frame[y1:y2, x1:x2], (x1, y1)
+
+    def _mask_for(self, frame_shape):
+        height, width = frame_shape[:2]
+        if self.mask is None or self.mask.shape != (height, width):
+            self.mask = np.zeros((height, width), dtype=np.uint8)
+            cv2.fillPoly(self.mask, self.polygons, 1)
+        return self.mask
+
+    def contains(self, boxes, frame_shape):
+        """
+        Boolean mask of the boxes whose ground point lies inside any polygon.
+        Args:
+            boxes: (N, 4) array of x1, y1, x2, y2 in frame coordinates
+            frame_shape: shape of the frame the boxes belong to
+        """
+        mask = self._mask_for(frame_shape)
+        height, width = mask.shape
+        boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        x = np.clip(((boxes[:, 0] + boxes[:, 2]) / 2).astype(np.int64), 0, width - 1)
+        y = np.clip(boxes[:, 3].astype(np.int64), 0, height - 1)
+        return mask[y, x].astype(bool)
+
+    def draw(self, frame, color=(255, 128, 0)):
+        """Outline the ROI polygons on a frame in place."""
+        cv2.polylines(frame, self.polygons, True, color, 1)
+
+def load_roi_config(path):
+    """
+    Load per-camera ROIs from a JSON file.
+    Returns:
+        dict of camera ID (str) -> RegionOfInterest
+    """
+    with open(path) as f:
+        config = json.load(f)
+    return {str(camera_id): RegionOfInterest(polygons) for camera_id, polygons in config.items()}
+
+def roi_for_camera(config, camera_id):
+    """The ROI configured for a camera, else the 'default' one, else None (full frame)."""
+    if not config:
+        return None
+    return config.get(str(camera_id), config.get("default"))
@@ -0,0 +1,261 @@
+"""
+Segment-parallel processing of long video files.
+
+The video is split into time segments that are processed by separate worker
+processes, each running its own VehicleAnalysisPipeline (and so its own
+VehicleTracker). Every segment also processes a few frames past its end; the
+merge step matches tracks of neighbouring segments by box overlap on those
+shared frames, remaps them to global vehicle IDs and writes one results file
+and, optionally, one output video.
+
+Usage:
+    python -m src.segment_parallel input.mp4 data/results.csv --workers 8 --output data/output.mp4
+"""
+
+import argparse
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+from collections import defaultdict
+
+import cv2
+
+from src.video_writer import open_video_writer
+
+def plan_segments(video_path, num_segments, align=None):
+    """
+    Split a video into [start, end) frame ranges.
+    Args:
+        video_path: input video file
+        num_segments: number of segments wanted
+        align: boundaries are snapped to multiples of this many frames so each
+            segment starts near a keyframe (default: one second of video)
+    Returns:
+        list of (start_frame, end_frame) tuples covering the whole video
+    Raises:
+        ValueError: the container does not report a frame count
+    """
+    cap = cv2.VideoCapture(video_path)
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    cap.release()
+    # Some containers and streams report 0 or -1; segments can't be planned blind
+    if total_frames <= 0:
+        raise ValueError(f"Frame count of {video_path} is unknown ({total_frames})")
+
+    if align is None:
+        align = max(1, int(round(fps)))
+    num_segments = max(1, min(num_segments, total_frames // align))
+
+    boundaries = [0]
+    for i in range(1, num_segments):
+        boundary = int(round(total_frames * i / num_segments / align)) * align
+        if boundary > boundaries[-1]:
+            boundaries.append(boundary)
+    boundaries.append(total_frames)
+    return list(zip(boundaries[:-1], boundaries[1:]))
+
+def _process_segment(job):
+    """Worker process: run a fresh pipeline over one segment (plus overlap)."""
+    video_path, start, end, overlap, segment_video_path, threads, pipeline_kwargs = job
+
+    # Split the cores between workers instead of oversubscribing them
+    if threads:
+        import torch
+        torch.set_num_threads(threads)
+        cv2.setNumThreads(threads)
+
+    from main import VehicleAnalysisPipeline
+
+    pipeline = VehicleAnalysisPipeline(**pipeline_kwargs)
+    # Segment videos are re-encoded by the merge, so favour speed over size here
+    pipeline.process_video(video_path, segment_video_path, max_frames=end + overlap - start,
+                           start_frame=start, writer_options={"preset": "ultrafast", "crf": 18,
+                                                              "threads": threads or 0})
+    return pipeline.results
+
+def _process_sequential(video_path, results_csv, output_video_path, pipeline_kwargs):
+    """Fallback for videos that can't be split: one pipeline over the whole file."""
+    from main import VehicleAnalysisPipeline
+
+    pipeline = VehicleAnalysisPipeline(**pipeline_kwargs)
+    pipeline.process_video(video_path, output_video_path)
+    pipeline.save_results(results_csv)
+    return list(pipeline.results)
+
+def _iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+def _match_tracks(previous_rows, next_rows, iou_threshold):
+    """Match track IDs of two segments by mean box IoU over their shared frames."""
+    previous_by_frame = defaultdict(list)
+    for row in previous_rows:
+        previous_by_frame[row['frame_id']].append(row)
+
+    iou_sums = defaultdict(float)
+    for row in next_rows:
+        for other in previous_by_frame.get(row['frame_id'], []):
+            iou = _iou(other['bbox'], row['bbox'])
+            if iou > 0:
+                iou_sums[(other['vehicle_id'], row['vehicle_id'])] += iou
+
+    # Normalise by how many shared frames the next-segment track appears in
+    frames_seen = defaultdict(int)
+    for row in next_rows:
+        frames_seen[row['vehicle_id']] += 1
+
+    scores = sorted(((total / frames_seen[next_id], prev_id, next_id)
+                     for (prev_id, next_id), total in iou_sums.items()), reverse=True)
+
+    # Greedy one-to-one assignment, best overlap first
+    matches = {}
+    used_previous = set()
+    for score, prev_id, next_id in scores:
+        if score < iou_threshold:
+            break
+        if prev_id in used_previous or next_id in matches:
+            continue
+        matches[next_id] = prev_id
+        used_previous.add(prev_id)
+    return matches
+
+def stitch_segments(segment_results, segments, overlap, iou_threshold=0.3):
+    """
+    Merge per-segment results into one list with globally consistent vehicle IDs.
+    Args:
+        segment_results: list of per-segment result dicts (frame_id, vehicle_id, bbox, ...)
+        segments: the (start_frame, end_frame) ranges the results belong to
+        overlap: frames each segment processed past its end_frame
+        iou_threshold: min mean IoU on shared frames to treat two tracks as one vehicle
+    Returns:
+        merged list of result dicts, ordered by frame
+    """
+    merged = []
+    next_global_id = 1
+    previous_map = {}
+    previous_rows = []
+
+    for rows, (start, end) in zip(segment_results, segments):
+        # Tracks that continue from the previous segment keep its global ID
+        shared_rows = [row for row in rows if row['frame_id'] < start + overlap]
+        matches = _match_tracks(previous_rows, shared_rows, iou_threshold)
+
+        id_map = {}
+        for row in rows:
+            local_id = row['vehicle_id']
+            if local_id not in id_map:
+                if local_id in matches:
+                    id_map[local_id] = previous_map[matches[local_id]]
+                else:
+                    id_map[local_id] = next_global_id
+                    next_global_id += 1
+
+        # Frames past `end` belong to the next segment and are only used for matching
+        for row in rows:
+            if row['frame_id'] < end:
+                merged.append({**row, 'vehicle_id': id_map[row['vehicle_id']]})
+
+        previous_map = id_map
+        previous_rows = [row for row in rows if row['frame_id'] >= end]
+
+    merged.sort(key=lambda row: row['frame_id'])
+    return merged
+
+def concat_segment_videos(segment_videos, segments, output_video_path):
+    """Concatenate segment videos, dropping each segment's overlap frames."""
+    out = None
+    for path, (start, end) in zip(segment_videos, segments):
+        cap = cv2.VideoCapture(path)
+        if out is None:
+            fps = cap.get(cv2.CAP_PROP_FPS)
+            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            out = open_video_writer(output_video_path, fps, (width, height))
+        for _ in range(end - start):
+            ret, frame = cap.read()
+            if not ret:
+                break
+            out.write(frame)
+        cap.release()
+    if out:
+        out.release()
+
+def process_video_parallel(video_path, results_csv, output_video_path=None, num_workers=None,
+                           overlap=15, iou_threshold=0.3, pipeline_kwargs=None):
+    """
+    Process a long video in parallel time segments and merge the results.
+    Args:
+        video_path: input video file
+        results_csv: merged results CSV (same columns as save_results)
+        output_video_path: optional merged annotated video
+        num_workers: worker processes (default: CPU count)
+        overlap: frames each segment processes past its end for track stitching
+        iou_threshold: min mean box IoU to stitch two tracks across a boundary
+        pipeline_kwargs: keyword arguments for each worker's VehicleAnalysisPipeline
+    Returns:
+        merged list of result dicts
+    """
+    if not os.path.exists(video_path):
+        print(f"Error: Video file {video_path} not found.")
+        return []
+
+    num_workers = num_workers or os.cpu_count() or 1
+    try:
+        segments = plan_segments(video_path, num_workers)
+    except ValueError as e:
+        print(f"{e}: processing sequentially instead")
+        return _process_sequential(video_path, results_csv, output_video_path, pipeline_kwargs or {})
+    threads = max(1, (os.cpu_count() or 1) // len(segments))
+    print(f"Processing {video_path} in {len(segments)} segments "
+          f"({threads} thread(s) per worker)...")
+
+    temp_dir = tempfile.mkdtemp(prefix="segments_") if output_video_path else None
+    segment_videos = [os.path.join(temp_dir, f"segment_{i}.mp4") if temp_dir else None
+                      for i in range(len(segments))]
+    jobs = [(video_path, start, end, overlap, segment_video, threads, pipeline_kwargs or {})
+            for (start, end), segment_video in zip(segments, segment_videos)]
+
+    start_time = time.perf_counter()
+    try:
+        # spawn: every worker loads its own models instead of forking torch state
+        with multiprocessing.get_context("spawn").Pool(len(jobs)) as pool:
+            segment_results = pool.map(_process_segment, jobs)
+
+        results = stitch_segments(segment_results, segments, overlap, iou_threshold)
+
+        if results:
+            import pandas as pd
+            pd.DataFrame(results).to_csv(results_csv, index=False)
+            print(f"Results saved to {results_csv}")
+        else:
+            print("No results to save.")
+
+        if output_video_path:
+            concat_segment_videos(segment_videos, segments, output_video_path)
+            print(f"Annotated video saved to {output_video_path}")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    unique_vehicles = len(set(row['vehicle_id'] for row in results))
+    print(f"Processed {segments[-1][1]} frames in {time.perf_counter() - start_time:.1f}s, "
+          f"{unique_vehicles} unique vehicles")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Process a long video in parallel segments.")
+    parser.add_argument("video", help="input video file")
+    parser.add_argument("results_csv", help="merged results CSV")
+    parser.add_argument("--output", help="merged annotated output video")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--overlap", type=int, default=15, help="frames shared by neighbouring segments")
+    args = parser.parse_args()
+
+    process_video_parallel(args.video, args.results_csv, args.output,
+                           num_workers=args.workers, overlap=args.overlap)
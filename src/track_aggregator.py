@@ -0,0 +1,187 @@
+"""
+Track-level aggregation of per-frame results.
+
+Instead of one row per vehicle per frame, TrackAggregator keeps running state
+for every track (first/last frame, class votes, confidence-weighted make/model
+votes and a character-level plate consensus over all OCR reads) and emits one
+summary row per vehicle when its track ends.
+
+The plate consensus first votes on the plate length, then on each character
+position among the reads of that length. Once the consensus text has survived
+a few reads unchanged it is considered stable and OCR stops for that track;
+until then the track's plate is re-read every few frames.
+"""
+
+import re
+from collections import Counter, defaultdict
+
+def normalize_plate(text):
+    """Uppercase and keep only letters and digits (OCR adds spaces, dashes, dots)."""
+    return re.sub(r'[^A-Z0-9]', '', (text or '').upper())
+
+class PlateConsensus:
+    def __init__(self, stable_reads=3):
+        """
+        Args:
+            stable_reads: reads the consensus has to survive unchanged to be stable
+        """
+        self.stable_reads = stable_reads
+        self.length_votes = defaultdict(float)
+        # (length, position) -> character -> summed confidence
+        self.char_votes = defaultdict(lambda: defaultdict(float))
+        self.reads = 0
+        self.text = None
+        self.confidence = 0.0
+        self.unchanged_reads = 0
+
+    def add(self, text, confidence):
+        """Add one OCR read. Returns the updated consensus text."""
+        text = normalize_plate(text)
+        if not text:
+            return self.text
+        weight = max(float(confidence), 1e-3)
+        self.reads += 1
+        self.length_votes[len(text)] += weight
+        for position, char in enumerate(text):
+            self.char_votes[(len(text), position)][char] += weight
+
+        previous = self.text
+        self._update()
+        self.unchanged_reads = self.unchanged_reads + 1 if self.text == previous else 0
+        return self.text
+
+    def _update(self):
+        length = max(self.length_votes, key=self.length_votes.get)
+        chars = []
+        shares = []
+        for position in range(length):
+            votes = self.char_votes[(length, position)]
+            char = max(votes, key=votes.get)
+            chars.append(char)
+            shares.append(votes[char] / sum(votes.values()))
+        self.text = "".join(chars)
+        # How strongly the reads agree on each character
+        self.confidence = sum(shares) / len(shares)
+
+    @property
+    def stable(self):
+        return self.text is not None and self.unchanged_reads >= self.stable_reads
+
+class TrackAggregator:
+    def __init__(self, max_age=30, stable_reads=3, plate_read_interval=5):
+        """
+        Args:
+            max_age: frames a track may go unseen before it is considered ended
+            stable_reads: unchanged reads after which a track's plate is final
+            plate_read_interval: frames between OCR attempts while the plate isn't stable
+        """
+        self.max_age = max_age
+        self.stable_reads = stable_reads
+        self.plate_read_interval = plate_read_interval
+        # track_id -> running state
+        self.tracks = {}
+
+    def _state(self, track_id, frame_id):
+        state = self.tracks.get(track_id)
+        if state is None:
+            state = self.tracks[track_id] = {
+                "first_frame": frame_id,
+                "last_frame": frame_id,
+                "frames_seen": 0,
+                "confidence_sum": 0.0,
+                "class_votes": Counter(),
+                "make_model_votes": defaultdict(float),
+                "plate": PlateConsensus(self.stable_reads),
+                "last_plate_attempt": None,
+                "last_bbox": None
+            }
+        return state
+
+    def update(self, frame_id, detections):
+        """Fold one frame of tracker detections (id, class, confidence, bbox) into the track state."""
+        for detection in detections:
+            state = self._state(detection['id'], frame_id)
+            state["last_frame"] = max(state["last_frame"], frame_id)
+            state["frames_seen"] += 1
+            state["confidence_sum"] += detection['confidence']
+            state["class_votes"][detection['class']] += 1
+            state["last_bbox"] = detection['bbox']
+
+    def add_make_model(self, track_id, result):
+        """Add one classifier result ({'make_model', 'confidence'}) as a weighted vote."""
+        state = self.tracks.get(track_id)
+        if state is not None:
+            state["make_model_votes"][result['make_model']] += result['confidence']
+
+    def add_plate(self, track_id, text, confidence, frame_id):
+        """
+        Add one OCR read (text None = nothing read) to the track's plate consensus.
+        Returns:
+            (consensus_text, consensus_confidence), or (None, 0.0) with no reads yet
+        """
+        state = self.tracks.get(track_id)
+        if state is None:
+            return None, 0.0
+        state["last_plate_attempt"] = frame_id
+        plate = state["plate"]
+        plate.add(text, confidence)
+        return plate.text, plate.confidence
+
+    def plate_stable(self, track_id):
+        """True once the track's plate consensus is settled and OCR can stop."""
+        state = self.tracks.get(track_id)
+        return state is not None and state["plate"].stable
+
+    def needs_plate_read(self, track_id, frame_id):
+        """True if OCR should run on this track in the given frame."""
+        state = self.tracks.get(track_id)
+        if state is None or state["plate"].stable:
+            return False
+        last = state["last_plate_attempt"]
+        return last is None or frame_id - last >= self.plate_read_interval
+
+    def summarize(self, track_id):
+        """One summary row for a track."""
+        state = self.tracks[track_id]
+        make_model, make_model_confidence = "Unknown", 0.0
+        if state["make_model_votes"]:
+            votes = state["make_model_votes"]
+            make_model = max(votes, key=votes.get)
+            total = sum(votes.values())
+            make_model_confidence = votes[make_model] / total if total else 0.0
+        plate = state["plate"]
+        return {
+            "vehicle_id": track_id,
+            "first_frame": state["first_frame"],
+            "last_frame": state["last_frame"],
+            "frames_seen": state["frames_seen"],
+            "vehicle_class": state["class_votes"].most_common(1)[0][0] if state["class_votes"] else "N/A",
+            "detection_confidence": state["confidence_sum"] / max(1, state["frames_seen"]),
+            "make_model": make_model,
+            "make_model_confidence": make_model_confidence,
+            "license_plate": plate.text or "N/A",
+            "plate_confidence": plate.confidence,
+            "plate_reads": plate.reads,
+            "last_bbox": state["last_bbox"]
+        }
+
+    def finish_stale(self, frame_id):
+        """End tracks unseen for more than max_age frames. Returns their summary rows."""
+        ended = [track_id for track_id, state in self.tracks.items()
+                 if frame_id - state["last_frame"] > self.max_age]
+        return [self._finish(track_id) for track_id in ended]
+
+    def finish_all(self):
+        """End every open track (e.g. at the end of a video). Returns their summary rows."""
+        return [self._finish(track_id) for track_id in list(self.tracks)]
+
+    def _finish(self, track_id):
+        row = self.summarize(track_id)
+        del self.tracks[track_id]
+        return row
+
+    def __len__(self):
+        return len(self.tracks)
+
+    def __contains__(self, track_id):
+        return track_id in self.tracks
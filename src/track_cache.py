@@ -0,0 +1,79 @@
+"""
+Track-keyed result cache for the expensive per-vehicle stages.
+
+Make/model classification and plate OCR only need to run once per vehicle,
+not once per frame. Results are stored against the ByteTrack ID returned by
+VehicleTracker.track_and_count and are only recomputed when a refresh rule
+fires. Entries for tracks that have left the scene are evicted.
+"""
+
+
+class TrackResultCache:
+    def __init__(self, refresh_interval=None, growth_threshold=0.5, max_age=30):
+        """
+        Args:
+            refresh_interval: re-run a stage every N frames (None = no timed refresh)
+            growth_threshold: re-run a stage when the crop area grew by this
+                fraction since the last run, e.g. 0.5 = 50% (None = disabled)
+            max_age: frames a track may go unseen before its entry is evicted
+        """
+        self.refresh_interval = refresh_interval
+        self.growth_threshold = growth_threshold
+        self.max_age = max_age
+        # track_id -> {"last_seen": frame_id, "stages": {stage: {...}}}
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+
+    def touch(self, track_id, frame_id):
+        """Mark a track as visible in the given frame."""
+        entry = self.entries.setdefault(track_id, {"last_seen": frame_id, "stages": {}})
+        entry["last_seen"] = max(entry["last_seen"], frame_id)
+
+    def needs_refresh(self, track_id, stage, frame_id, area):
+        """Return True if `stage` has to be (re)computed for this track."""
+        entry = self.entries.get(track_id)
+        if entry is None or stage not in entry["stages"]:
+            self.misses += 1
+            return True
+
+        last = entry["stages"][stage]
+        if self.refresh_interval and frame_id - last["frame_id"] >= self.refresh_interval:
+            self.misses += 1
+            return True
+        if self.growth_threshold is not None and area > last["area"] * (1 + self.growth_threshold):
+            self.misses += 1
+            return True
+
+        self.hits += 1
+        return False
+
+    def get(self, track_id, stage):
+        """Return the cached result of `stage` for a track, or None."""
+        entry = self.entries.get(track_id)
+        if entry is None or stage not in entry["stages"]:
+            return None
+        return entry["stages"][stage]["result"]
+
+    def put(self, track_id, stage, result, frame_id, area):
+        """Store the result of `stage` computed on a crop of the given area."""
+        self.touch(track_id, frame_id)
+        self.entries[track_id]["stages"][stage] = {
+            "result": result,
+            "frame_id": frame_id,
+            "area": area
+        }
+
+    def evict_stale(self, frame_id):
+        """Drop tracks unseen for more than max_age frames. Returns evicted IDs."""
+        stale = [track_id for track_id, entry in self.entries.items()
+                 if frame_id - entry["last_seen"] > self.max_age]
+        for track_id in stale:
+            del self.entries[track_id]
+        return stale
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, track_id):
+        return track_id in self.entries
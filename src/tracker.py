@@ -1,39 +1,184 @@
 import cv2
-from ultralytics import YOLO
+import numpy as np
 import os
+import yaml
+from src import metrics
+from src.model_registry import get_yolo, yolo_spec
+from src.detector import VEHICLE_CLASSES, vehicle_mask
 
 class VehicleTracker:
-    def __init__(self, model_name='yolo11n.pt'):
-        # Load YOLO model
-        self.model = YOLO(model_name)
+    def __init__(self, model_name='yolo11n.pt', tracker_config="bytetrack.yaml", frame_rate=30,
+                 motion_gate=None, roi=None, backend=None):
+        """
+        Args:
+            model_name: YOLO weights, shared through the model registry
+            tracker_config: ultralytics tracker config (ByteTrack)
+            frame_rate: frame rate the tracker's track buffer is scaled to
+            motion_gate: optional MotionGate; frames it rejects skip YOLO and
+                ByteTrack and reuse the tracks of the last detected frame
+            roi: optional RegionOfInterest; YOLO only sees its bounding crop and
+                vehicles outside its polygons are not reported
+            backend: YOLO inference backend ('pytorch', 'onnx', 'openvino', ...;
+                default $YOLO_BACKEND or 'pytorch', see src/yolo_export.py)
+        """
+        # YOLO model comes from the shared registry on first use; the ByteTrack
+        # state is owned by this tracker so the model can be shared safely
+        self.model_name = model_name
+        self.backend = backend
+        self.tracker_config = tracker_config
+        self.byte_tracker = None
+        self.frame_rate = frame_rate
+        self.motion_gate = motion_gate
+        self.roi = roi
+        # Tracks of the last detected frame, reused while the motion gate skips frames
+        self.last_tracks = self._empty_tracks()
         # Unique vehicle IDs tracked
         self.tracked_ids = set()
         print(f"Vehicle Tracker ({model_name}) initialized with ByteTrack.")
 
+    @property
+    def frame_rate(self):
+        return self._frame_rate
+
+    @frame_rate.setter
+    def frame_rate(self, frame_rate):
+        """Rate of the frames passed to update(); ByteTrack's lost-track buffer is scaled to it."""
+        self._frame_rate = frame_rate
+        if self.byte_tracker is not None:
+            # Same scaling BYTETracker applies when it is built
+            self.byte_tracker.max_time_lost = int(frame_rate / 30.0 * self.byte_tracker.args.track_buffer)
+
+    @property
+    def model(self):
+        return get_yolo(self.model_name, self.backend)
+
+    @property
+    def model_spec(self):
+        return yolo_spec(self.model_name, self.backend)
+
+    def warm_up(self):
+        """Runs one dummy inference (tracker state untouched) to absorb setup costs."""
+        self.model.predict(np.zeros((640, 640, 3), dtype=np.uint8), conf=0.1, classes=VEHICLE_CLASSES,
+                           verbose=False)
+
+    def _build_byte_tracker(self):
+        from ultralytics.trackers.byte_tracker import BYTETracker
+        from ultralytics.utils import IterableSimpleNamespace
+        from ultralytics.utils.checks import check_yaml
+
+        with open(check_yaml(self.tracker_config)) as f:
+            cfg = IterableSimpleNamespace(**yaml.safe_load(f))
+        return BYTETracker(args=cfg, frame_rate=self.frame_rate)
+
+    def reset(self):
+        """Forget all tracks and the vehicle count."""
+        self.byte_tracker = None
+        self.last_tracks = self._empty_tracks()
+        self.tracked_ids = set()
+        if self.motion_gate:
+            self.motion_gate.reset()
+
+    @staticmethod
+    def _empty_tracks():
+        return {
+            "ids": np.empty(0, dtype=np.int64),
+            "boxes": np.empty((0, 4), dtype=np.float32),
+            "class_ids": np.empty(0, dtype=np.int64),
+            "confidences": np.empty(0, dtype=np.float32)
+        }
+
+    def gated(self, frame):
+        """True if the motion gate lets this frame skip detection."""
+        if self.motion_gate is None or self.motion_gate.should_detect(frame):
+            return False
+        metrics.inc("gated_frames_total")
+        return True
+
+    def coast(self):
+        """(tracks, total_count) of the last detected frame, for frames the motion gate skipped."""
+        return self.last_tracks, len(self.tracked_ids)
+
+    def inference_input(self, frame):
+        """The image YOLO should run on for this frame, and its (x, y) offset in the frame."""
+        if self.roi is None:
+            return frame, (0, 0)
+        return self.roi.crop(frame)
+
     def track_and_count(self, frame):
         """Processes a frame, tracks vehicles, and updates the count."""
-        # Use persist=True to maintain tracks across frames
-        results = self.model.track(frame, persist=True, tracker="bytetrack.yaml", verbose=False)
-        
-        detections = []
-        if results[0].boxes.id is not None:
-            boxes = results[0].boxes.xyxy.cpu().numpy()
-            ids = results[0].boxes.id.cpu().numpy().astype(int)
-            clss = results[0].boxes.cls.cpu().numpy().astype(int)
-            confs = results[0].boxes.conf.cpu().numpy()
-
-            for box, track_id, cls, conf in zip(boxes, ids, clss, confs):
-                # Class filter: Car, Motorcycle, Bus, Truck
-                if int(cls) in [2, 3, 5, 7]:
-                    self.tracked_ids.add(track_id)
-                    detections.append({
-                        "id": track_id,
-                        "bbox": box.tolist(),
-                        "class": self.model.names[int(cls)],
-                        "confidence": float(conf)
-                    })
-        
-        return detections, len(self.tracked_ids)
+        return self.as_detections(self.track_arrays(frame))
+
+    def track_arrays(self, frame):
+        """
+        Like track_and_count, but returns one array per field.
+        Returns:
+            (tracks, total_count), tracks being a dict of 'ids' (N,), 'boxes' (N, 4),
+            'class_ids' (N,) and 'confidences' (N,)
+        """
+        # Nothing moved: let the current tracks coast instead of running YOLO
+        if self.gated(frame):
+            return self.coast()
+        # ByteTrack needs low-confidence predictions as input (same as model.track);
+        # non-vehicle classes are dropped inside NMS
+        image, offset = self.inference_input(frame)
+        with metrics.timer("stage_seconds", stage="yolo"):
+            results = self.model.predict(image, conf=0.1, classes=VEHICLE_CLASSES, verbose=False)
+        return self.update_arrays(results[0], frame, offset)
+
+    def update(self, result, frame, offset=(0, 0)):
+        """
+        Advances the tracker with a YOLO result computed elsewhere, e.g. by a
+        batched predict call over several streams (use conf=0.1 for ByteTrack).
+        offset is the (x, y) position in `frame` of the image the result was
+        computed on (see inference_input).
+        Returns the same (detections, total_count) as track_and_count.
+        """
+        return self.as_detections(self.update_arrays(result, frame, offset))
+
+    def update_arrays(self, result, frame, offset=(0, 0)):
+        """Array version of update, returns the same (tracks, total_count) as track_arrays."""
+        # Tracker state persists across frames
+        if self.byte_tracker is None:
+            self.byte_tracker = self._build_byte_tracker()
+        # Class filter (Car, Motorcycle, Bus, Truck) as one mask on the result tensors,
+        # in case the predict call did not pass `classes`
+        boxes = result.boxes
+        boxes = boxes[vehicle_mask(boxes.cls)].cpu().numpy()
+        if offset != (0, 0):
+            # Inference ran on an ROI crop: map boxes back to frame coordinates
+            data = boxes.data.copy()
+            data[:, [0, 2]] += offset[0]
+            data[:, [1, 3]] += offset[1]
+            boxes = boxes.__class__(data, frame.shape[:2])
+        # Each track row: x1, y1, x2, y2, track_id, score, cls, detection index
+        with metrics.timer("stage_seconds", stage="bytetrack"):
+            tracks = np.asarray(self.byte_tracker.update(boxes, frame), dtype=np.float32).reshape(-1, 8)
+        if self.roi is not None:
+            # Tracking sees every box; only vehicles inside the ROI are reported
+            tracks = tracks[self.roi.contains(tracks[:, :4], frame.shape)]
+
+        ids = tracks[:, 4].astype(np.int64)
+        self.tracked_ids.update(ids.tolist())
+        self.last_tracks = {
+            "ids": ids,
+            "boxes": tracks[:, :4],
+            "class_ids": tracks[:, 6].astype(np.int64),
+            "confidences": tracks[:, 5]
+        }
+        return self.last_tracks, len(self.tracked_ids)
+
+    def as_detections(self, tracked):
+        """Turns the (tracks, total_count) arrays into the (detections, total_count) dict form."""
+        tracks, total_count = tracked
+        names = self.model.names
+        detections = [{
+            "id": track_id,
+            "bbox": bbox,
+            "class": names[cls_id],
+            "confidence": conf
+        } for track_id, bbox, cls_id, conf in zip(tracks["ids"].tolist(), tracks["boxes"].tolist(),
+                                                  tracks["class_ids"].tolist(), tracks["confidences"].tolist())]
+        return detections, total_count
 
 if __name__ == "__main__":
     # Test on a dummy video or image sequence if available
@@ -0,0 +1,155 @@
+"""
+Video writers for annotated output.
+
+cv2.VideoWriter with the mp4v FourCC encodes on the calling thread, can't be
+tuned and produces large files. FFmpegVideoWriter instead pipes raw BGR
+frames into an ffmpeg subprocess (libx264 by default, with a configurable
+codec, preset, CRF and thread count). A background thread feeds the pipe, so
+write() only queues the frame and ffmpeg encodes on its own threads.
+
+open_video_writer() picks the backend: ffmpeg when an executable is found
+($FFMPEG_BINARY, ffmpeg on PATH, or the binary bundled with the optional
+imageio-ffmpeg package), else cv2.VideoWriter with mp4v. Both expose
+write(frame) and release().
+
+Backend selection: backend= / $VIDEO_WRITER = 'auto' (default), 'ffmpeg' or 'opencv'.
+"""
+
+import os
+import queue
+import shutil
+import subprocess
+import threading
+
+import cv2
+
+BACKENDS = ("auto", "ffmpeg", "opencv")
+
+def find_ffmpeg():
+    """Path of an ffmpeg executable, or None."""
+    path = os.environ.get("FFMPEG_BINARY") or shutil.which("ffmpeg")
+    if path:
+        return path
+    try:
+        import imageio_ffmpeg
+    except ImportError:
+        return None
+    try:
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except RuntimeError:
+        return None
+
+class FFmpegVideoWriter:
+    def __init__(self, path, fps, frame_size, codec="libx264", preset="ultrafast", crf=23, threads=0,
+                 pix_fmt="yuv420p", queue_size=32, ffmpeg=None):
+        """
+        Args:
+            path: output video file (overwritten)
+            fps: frame rate of the output
+            frame_size: (width, height) of the frames passed to write()
+            codec: ffmpeg video encoder ('libx264', 'libx265', 'libvpx-vp9', 'mpeg4', ...)
+            preset: encoder speed/size trade-off ('ultrafast' ... 'veryslow'); None to omit
+            crf: constant rate factor, lower = better quality and bigger files; None to omit
+            threads: encoder threads (0 = let ffmpeg choose)
+            pix_fmt: output pixel format; yuv420p plays everywhere
+            queue_size: frames buffered between write() and the pipe, bounds memory
+            ffmpeg: ffmpeg executable (default: find_ffmpeg())
+        """
+        self.path = path
+        self.frame_size = tuple(frame_size)
+        ffmpeg = ffmpeg or find_ffmpeg()
+        if ffmpeg is None:
+            raise RuntimeError("ffmpeg not found (install it, or set FFMPEG_BINARY)")
+
+        width, height = self.frame_size
+        command = [ffmpeg, "-hide_banner", "-loglevel", "error", "-y",
+                   "-f", "rawvideo", "-pix_fmt", "bgr24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+                   "-an", "-c:v", codec]
+        if preset is not None:
+            command += ["-preset", preset]
+        if crf is not None:
+            command += ["-crf", str(crf)]
+        command += ["-threads", str(threads), "-pix_fmt", pix_fmt]
+        if pix_fmt == "yuv420p" and (width % 2 or height % 2):
+            # 4:2:0 chroma needs even dimensions
+            command += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+        if path.endswith((".mp4", ".mov")):
+            command += ["-movflags", "+faststart"]
+        command.append(path)
+        self.command = command
+
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE, stderr=subprocess.PIPE)
+        self.frames = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.frames_written = 0
+        self._thread = threading.Thread(target=self._pipe_frames, daemon=True, name="ffmpeg-writer")
+        self._thread.start()
+
+    def isOpened(self):
+        return self.process is not None and self.error is None
+
+    def write(self, frame):
+        """Queue a BGR frame for encoding (blocks only when queue_size frames are pending)."""
+        if self.error is not None:
+            raise self.error
+        if (frame.shape[1], frame.shape[0]) != self.frame_size:
+            raise ValueError(f"Frame size {frame.shape[1]}x{frame.shape[0]} does not match the writer's "
+                             f"{self.frame_size[0]}x{self.frame_size[1]}")
+        # Not copied: callers hand over each frame and don't draw on it afterwards
+        self.frames.put(frame)
+
+    def _pipe_frames(self):
+        while True:
+            frame = self.frames.get()
+            if frame is None:
+                return
+            if self.error is not None:
+                # Keep draining so write() never blocks on a dead encoder
+                continue
+            try:
+                self.process.stdin.write(memoryview(frame).cast("B") if frame.flags.c_contiguous
+                                         else frame.tobytes())
+                self.frames_written += 1
+            except (BrokenPipeError, OSError, ValueError) as e:
+                self.error = RuntimeError(f"ffmpeg stopped accepting frames: {e}")
+
+    def release(self):
+        """Encode the queued frames and wait for ffmpeg to finish the file."""
+        if self.process is None:
+            return
+        self.frames.put(None)
+        self._thread.join()
+        _, stderr = self.process.communicate()
+        returncode = self.process.returncode
+        self.process = None
+        if returncode != 0:
+            message = stderr.decode(errors="replace").strip().splitlines()[-5:]
+            raise RuntimeError(f"ffmpeg exited with status {returncode}: {' | '.join(message)}")
+        if self.error is not None:
+            raise self.error
+
+def open_video_writer(path, fps, frame_size, backend=None, **options):
+    """
+    Open a video writer for annotated output.
+    Args:
+        path: output video file
+        fps: frame rate
+        frame_size: (width, height)
+        backend: 'auto' (ffmpeg if available, else OpenCV), 'ffmpeg' or 'opencv';
+            default $VIDEO_WRITER or 'auto'
+        **options: FFmpegVideoWriter options (codec, preset, crf, threads, ...);
+            ignored by the OpenCV writer
+    Returns:
+        writer with write(frame) and release()
+    """
+    backend = backend or os.environ.get("VIDEO_WRITER", "auto")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown video writer {backend!r}, expected one of {BACKENDS}")
+    if backend != "opencv":
+        ffmpeg = options.pop("ffmpeg", None) or find_ffmpeg()
+        if ffmpeg is not None:
+            return FFmpegVideoWriter(path, fps, frame_size, ffmpeg=ffmpeg, **options)
+        if backend == "ffmpeg":
+            raise RuntimeError("ffmpeg not found (install it, or set FFMPEG_BINARY)")
+        print("ffmpeg not found, writing video with OpenCV (mp4v)")
+    return cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, tuple(frame_size))
@@ -0,0 +1,106 @@
+"""
+CPU inference backends for the YOLO detector.
+
+The PyTorch weights can be exported once to ONNX (run by ONNX Runtime) or
+OpenVINO, optionally int8-quantized. Exported models are cached next to the
+weights and loaded through ultralytics, so predict(), the `classes` filter and
+the result objects are the same for every backend.
+
+Backends:
+    pytorch        - the .pt weights as-is (default)
+    onnx           - <stem>.onnx, ONNX Runtime
+    onnx-int8      - <stem>_int8.onnx, dynamically quantized int8 weights
+    openvino       - <stem>_openvino_model/, OpenVINO
+    openvino-int8  - <stem>_int8_openvino_model/, int8 post-training quantization
+
+The backend is picked per call (backend=...) or per deployment with the
+YOLO_BACKEND environment variable.
+"""
+
+import os
+
+BACKENDS = ("pytorch", "onnx", "onnx-int8", "openvino", "openvino-int8")
+
+def resolve_backend(backend=None):
+    """The backend to use: the argument, else $YOLO_BACKEND, else 'pytorch'."""
+    backend = backend or os.environ.get("YOLO_BACKEND", "pytorch")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown YOLO backend '{backend}', expected one of {BACKENDS}")
+    return backend
+
+def exported_path(weights, backend):
+    """Where the exported model for `backend` is cached (next to the weights)."""
+    stem, _ = os.path.splitext(weights)
+    return {
+        "pytorch": weights,
+        "onnx": f"{stem}.onnx",
+        "onnx-int8": f"{stem}_int8.onnx",
+        "openvino": f"{stem}_openvino_model",
+        "openvino-int8": f"{stem}_int8_openvino_model",
+    }[backend]
+
+def _quantize_onnx(fp32_path, int8_path):
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QUInt8)
+    # ultralytics reads class names, stride and image size from the metadata
+    source = onnx.load(fp32_path)
+    quantized = onnx.load(int8_path)
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(source.metadata_props)
+    onnx.save(quantized, int8_path)
+
+def export_yolo(weights='yolo11n.pt', backend="onnx", imgsz=640):
+    """
+    Export YOLO weights for a CPU backend, reusing a cached export if present.
+    Args:
+        weights: PyTorch weights file (downloaded by ultralytics if missing)
+        backend: one of BACKENDS
+        imgsz: inference size of the exported model (exported with dynamic
+            shapes, so batched and non-square inputs work as with PyTorch)
+    Returns:
+        path of the model to load with ultralytics.YOLO
+    """
+    backend = resolve_backend(backend)
+    if backend == "pytorch":
+        return weights
+    # A cached export is used without loading the PyTorch checkpoint at all
+    target = exported_path(weights, backend)
+    if os.path.exists(target):
+        return target
+
+    if backend == "onnx-int8":
+        # Quantized from the fp32 export, itself cached
+        fp32_path = export_yolo(weights, "onnx", imgsz)
+        target = exported_path(fp32_path, backend)
+        if not os.path.exists(target):
+            print(f"Quantizing {fp32_path} to int8 (cached at {target})...")
+            _quantize_onnx(fp32_path, target)
+        return target
+
+    from ultralytics import YOLO
+
+    model = YOLO(weights)
+    # Resolve the real weights location so exports land next to it
+    weights = model.ckpt_path or weights
+    target = exported_path(weights, backend)
+    if os.path.exists(target):
+        return target
+
+    print(f"Exporting {weights} for {backend} (cached at {target})...")
+    if backend == "onnx":
+        return model.export(format="onnx", imgsz=imgsz, dynamic=True, simplify=True)
+    # OpenVINO int8 calibrates on a small sample dataset
+    return model.export(format="openvino", imgsz=imgsz, dynamic=True, int8=backend == "openvino-int8",
+                        data="coco8.yaml" if backend == "openvino-int8" else None)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export YOLO weights for a CPU inference backend.")
+    parser.add_argument("--weights", default="yolo11n.pt")
+    parser.add_argument("--backend", default="onnx", choices=BACKENDS[1:])
+    parser.add_argument("--imgsz", type=int, default=640)
+    args = parser.parse_args()
+    print(f"Exported model: {export_yolo(args.weights, args.backend, args.imgsz)}")
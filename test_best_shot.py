@@ -0,0 +1,158 @@
+"""
+Test script for best-shot crop selection (no models required).
+"""
+
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from run_live import LiveVehicleAnalysis
+from src.async_analysis import AsyncAnalysisPool
+from src.best_shot import BestShotSelector, crop_quality
+from src.track_cache import TrackResultCache
+
+FRAME_SHAPE = (720, 1280, 3)
+
+def vehicle_crop(width, height, blur=0):
+    """A textured 'vehicle' with a plate-like pattern, optionally motion blurred."""
+    crop = np.full((height, width, 3), (90, 60, 160), dtype=np.uint8)
+    # Windows, wheels and a plate give the edges a sharp view has
+    cv2.rectangle(crop, (width // 6, height // 6), (width * 5 // 6, height // 2), (40, 40, 40), -1)
+    cv2.circle(crop, (width // 5, height), height // 5, (10, 10, 10), -1)
+    cv2.circle(crop, (width * 4 // 5, height), height // 5, (10, 10, 10), -1)
+    cv2.rectangle(crop, (width // 3, height * 2 // 3), (width * 2 // 3, height * 5 // 6), (255, 255, 255), -1)
+    cv2.putText(crop, "AB123", (width // 3, height * 4 // 5), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (0, 0, 0), 1)
+    if blur:
+        crop = cv2.blur(crop, (blur, 1))
+    return crop
+
+def test_crop_quality():
+    print("=" * 60)
+    print("Best Shot - Crop Quality")
+    print("=" * 60)
+
+    centered = (500, 300, 724, 460)
+    sharp = crop_quality(vehicle_crop(224, 160), centered, FRAME_SHAPE)
+    blurred = crop_quality(vehicle_crop(224, 160, blur=25), centered, FRAME_SHAPE)
+    small = crop_quality(vehicle_crop(56, 40), (500, 300, 556, 340), FRAME_SHAPE)
+    cut_off = crop_quality(vehicle_crop(224, 160), (0, 300, 224, 460), FRAME_SHAPE)
+    tall = crop_quality(vehicle_crop(80, 300), (500, 200, 580, 500), FRAME_SHAPE)
+    print(f"  sharp {sharp:.2f}, blurred {blurred:.2f}, small {small:.2f}, "
+          f"cut off {cut_off:.2f}, tall {tall:.2f}")
+
+    assert 0.0 <= blurred < sharp <= 1.0
+    assert small < sharp
+    # Touching the frame edge means the vehicle is likely cut off
+    assert cut_off == 0.0
+    assert tall < sharp
+    assert crop_quality(np.empty((0, 0, 3), dtype=np.uint8), centered, FRAME_SHAPE) == 0.0
+
+def test_best_shot_selector():
+    print("=" * 60)
+    print("Best Shot - Selector")
+    print("=" * 60)
+
+    selector = BestShotSelector(buffer_size=2, quality_threshold=0.7, max_wait=None, max_age=5)
+
+    # Track 1 approaches the camera: small and blurred first, large and sharp later
+    for frame_id, (size, blur) in enumerate([(40, 15), (80, 9), (120, 5), (160, 0)]):
+        box = (600, 300, 600 + size * 1.4, 300 + size)
+        selector.update(1, vehicle_crop(int(size * 1.4), size, blur), box, FRAME_SHAPE, frame_id)
+        assert len(selector.tracks[1]["buffer"]) <= 2
+        ready = selector.take_ready(frame_id)
+        if ready:
+            break
+    # Fires once the best crop crosses the threshold, handing out the best first
+    assert list(ready) == [1]
+    assert len(ready[1]) == 2
+    assert ready[1][0].shape[0] >= ready[1][1].shape[0]
+    assert selector.take_ready(frame_id) == {}
+
+    # Track 2 never gets good enough: it is analyzed with its best crop when it ends
+    selector.update(2, vehicle_crop(40, 30, blur=15), (10, 10, 50, 40), FRAME_SHAPE, 0)
+    selector.update(2, vehicle_crop(48, 36, blur=15), (20, 20, 68, 56), FRAME_SHAPE, 1)
+    assert selector.take_ready(1) == {}
+    ended = selector.finish_stale(10)
+    assert list(ended) == [2]
+    assert ended[2][0].shape[:2] == (36, 48)
+    # Track 1 already fired and saw nothing better since
+    assert 1 not in ended and 1 not in selector
+
+    # A full buffer skips the Laplacian for boxes that cannot win on geometry
+    selector.update(3, vehicle_crop(224, 160), (500, 300, 724, 460), FRAME_SHAPE, 0)
+    selector.update(3, vehicle_crop(224, 160), (500, 300, 724, 460), FRAME_SHAPE, 1)
+    assert selector.update(3, vehicle_crop(20, 20), (0, 0, 20, 20), FRAME_SHAPE, 2) is None
+    assert selector.skipped == 1
+
+    # max_wait hands out the best so far even below the threshold
+    waiting = BestShotSelector(quality_threshold=1.1, max_wait=3)
+    for frame_id in range(4):
+        waiting.update(7, vehicle_crop(112, 80), (500, 300, 612, 380), FRAME_SHAPE, frame_id)
+    assert waiting.take_ready(2) == {}
+    assert list(waiting.take_ready(3)) == [7]
+    # Restricting to the tracks in view leaves the others alone
+    waiting.update(8, vehicle_crop(112, 80), (500, 300, 612, 380), FRAME_SHAPE, 0)
+    assert waiting.take_ready(10, track_ids=[7]) == {}
+    assert list(waiting.finish_all()) == [8]
+
+    print(f"  {selector.stats()}")
+    print("Best shot checks passed.")
+
+def live_analyzer(async_analysis):
+    """A LiveVehicleAnalysis with stub models: vehicle 5 is in frames 1-20, every crop reads 'AB123'."""
+    analyzer = LiveVehicleAnalysis.__new__(LiveVehicleAnalysis)
+    box = [500, 300, 556, 340]
+    analyzer.tracker = SimpleNamespace(roi=None, track_and_count=lambda frame: (
+        [{'id': 5, 'bbox': box, 'class': 'car', 'confidence': 0.9}] if analyzer.frame_count <= 20 else [], 1))
+    analyzer.classifier = SimpleNamespace(classify_batch=lambda crops: [
+        {'make_model': "Model", 'confidence': 0.5} for _ in crops])
+    analyzer.lpr_scanner = SimpleNamespace(scan_plates=lambda crops: [
+        [{'text': "AB123", 'confidence': 0.9}] for _ in crops])
+    analyzer.track_results = TrackResultCache(max_age=30)
+    analyzer.analysis_pool = (AsyncAnalysisPool(analyzer.classifier, analyzer.lpr_scanner)
+                              if async_analysis else None)
+    analyzer.best_shot = BestShotSelector(max_wait=30, max_age=30)
+    analyzer.alerts = []
+    analyzer.hotlist = SimpleNamespace(check=lambda text, conf, vehicle_id, frame_id: analyzer.alerts.append(
+        (text, vehicle_id)))
+    analyzer.result_sink = None
+    analyzer.results = []
+    analyzer.frame_count = analyzer.frames_analyzed = analyzer.detections_logged = analyzer.plates_read = 0
+    analyzer.vehicle_ids = set()
+    return analyzer, box
+
+def test_live_ended_tracks():
+    print("=" * 60)
+    print("Best Shot - Live Tracks Ending Below the Threshold")
+    print("=" * 60)
+
+    for async_analysis in (False, True):
+        analyzer, (x1, y1, x2, y2) = live_analyzer(async_analysis)
+        try:
+            # A small, blurred vehicle seen for 20 frames never reaches the threshold or max_wait
+            for _ in range(60):
+                frame = np.zeros(FRAME_SHAPE, dtype=np.uint8)
+                frame[y1:y2, x1:x2] = vehicle_crop(x2 - x1, y2 - y1, blur=9)
+                analyzer.process_frame(frame)
+                if analyzer.frame_count == 20:
+                    assert analyzer.best_shot.best_quality(5) < analyzer.best_shot.quality_threshold
+                    assert analyzer.alerts == []
+            if analyzer.analysis_pool:
+                deadline = time.time() + 5
+                while not analyzer.alerts and time.time() < deadline:
+                    time.sleep(0.01)
+                    analyzer.process_frame(np.zeros(FRAME_SHAPE, dtype=np.uint8))
+        finally:
+            if analyzer.analysis_pool:
+                analyzer.analysis_pool.close()
+        # Its last shots are still read when it ends, and the plate reaches the hotlist
+        assert analyzer.alerts and set(analyzer.alerts) == {("AB123", 5)}, analyzer.alerts
+        assert 5 not in analyzer.best_shot
+    print("Live ended-track checks passed.")
+
+if __name__ == "__main__":
+    test_crop_quality()
+    test_best_shot_selector()
+    test_live_ended_tracks()
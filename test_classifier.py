@@ -0,0 +1,144 @@
+"""
+Test script for batched make/model classification with a stub processor and model (needs torch, no weights).
+"""
+
+import importlib.util
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.classifier import VehicleMakeModelClassifier
+
+LABELS = {0: "Model A", 1: "Model B", 2: "Model C", 3: "Model D"}
+
+class StubProcessor:
+    """ViT-style image processor: resize, rescale to [0, 1], normalize per channel."""
+    size = {"height": 8, "width": 8}
+    do_rescale = True
+    rescale_factor = 1 / 255
+    do_normalize = True
+    image_mean = [0.5, 0.4, 0.3]
+    image_std = [0.2, 0.25, 0.3]
+
+    def __call__(self, images, return_tensors="pt"):
+        import torch
+        from PIL import Image
+
+        size = (self.size["width"], self.size["height"])
+        pixels = np.stack([np.asarray(image.convert("RGB").resize(size, Image.BILINEAR), dtype=np.float32)
+                           for image in images])
+        pixels = (pixels * self.rescale_factor - np.float32(self.image_mean)) / np.float32(self.image_std)
+        return {"pixel_values": torch.from_numpy(pixels).permute(0, 3, 1, 2)}
+
+class StubModel:
+    """Picks a label from the mean pixel value and records the batch sizes it receives."""
+    config = SimpleNamespace(id2label=LABELS)
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, pixel_values):
+        import torch
+
+        self.batches.append(len(pixel_values))
+        means = pixel_values.mean(dim=(1, 2, 3))
+        classes = (means * 10).floor().long() % len(LABELS)
+        logits = torch.nn.functional.one_hot(classes, len(LABELS)).float() * 3 + means[:, None]
+        return SimpleNamespace(logits=logits)
+
+class StubClassifier(VehicleMakeModelClassifier):
+    processor = StubProcessor()
+    model = None
+
+def make_crops():
+    """Vehicle-sized crops of different brightness, with a None and an empty crop mixed in."""
+    rng = np.random.default_rng(0)
+    crops = [rng.integers(level, level + 60, size=(40 + 7 * i, 60 + 5 * i, 3), dtype=np.uint8)
+             for i, level in enumerate(range(0, 180, 30))]
+    crops.insert(2, None)
+    crops.insert(5, np.zeros((0, 30, 3), dtype=np.uint8))
+    return crops
+
+def test_classify_batch():
+    print("=" * 60)
+    print("Classifier - Batched Classification")
+    print("=" * 60)
+
+    if importlib.util.find_spec("torch") is None:
+        print("  torch not installed, skipping")
+        return
+
+    classifier = StubClassifier(max_batch_size=4, fast_preprocess=True)
+    classifier.model = StubModel()
+    crops = make_crops()
+    results = classifier.classify_batch(crops)
+
+    # Chunked by max_batch_size over the 6 real crops only
+    assert classifier.model.batches == [4, 2], classifier.model.batches
+    assert len(results) == len(crops)
+    for crop, result in zip(crops, results):
+        if crop is None or crop.size == 0:
+            assert result == {"make_model": "Unknown", "confidence": 0.0}
+        else:
+            assert result["make_model"] in LABELS.values() and 0 < result["confidence"] <= 1
+
+    # Each slot matches classifying that crop on its own
+    for crop, result in zip(crops, results):
+        if crop is not None and crop.size > 0:
+            single = classifier.classify(crop)
+            assert single["make_model"] == result["make_model"]
+            assert abs(single["confidence"] - result["confidence"]) < 1e-5
+    assert len({result["make_model"] for result in results}) > 2
+
+    classifier.model.batches.clear()
+    rechunked = classifier.classify_batch(crops, max_batch_size=5)
+    assert classifier.model.batches == [5, 1]
+    assert [result["make_model"] for result in rechunked] == [result["make_model"] for result in results]
+    assert classifier.classify_batch([None]) == [{"make_model": "Unknown", "confidence": 0.0}]
+    print(f"  {len(crops)} crops -> {[result['make_model'] for result in results]}")
+    print("Batch classification checks passed.")
+
+def test_fast_preprocess_parity():
+    print("=" * 60)
+    print("Classifier - Fast Preprocessing Parity")
+    print("=" * 60)
+
+    if importlib.util.find_spec("torch") is None or importlib.util.find_spec("PIL") is None:
+        print("  torch or Pillow not installed, skipping")
+        return
+
+    import torch
+
+    classifier = StubClassifier()
+    rng = np.random.default_rng(1)
+    # Crops already at the model size only go through rescale/normalize: exact match
+    exact = [rng.integers(0, 256, size=(8, 8, 3), dtype=np.uint8) for _ in range(3)]
+    reference = classifier._preprocess(exact)
+    fast = classifier._preprocess_fast(exact)
+    assert fast.shape == reference.shape == (3, 3, 8, 8)
+    assert torch.allclose(fast, reference, atol=1e-5), (fast - reference).abs().max()
+
+    # Larger smooth crops also go through a resize; cv2 and PIL interpolate differently
+    gradient = np.linspace(0, 255, 64, dtype=np.float32)
+    smooth = [np.dstack([np.add.outer(gradient[:48] * scale, gradient) / (1 + scale)] * 3).astype(np.uint8)
+              for scale in (0.5, 1.0, 2.0)]
+    reference = classifier._preprocess(smooth)
+    fast = classifier._preprocess_fast(smooth)
+    difference = (fast - reference).abs()
+    print(f"  resized crops: mean |diff| {difference.mean():.4f}, max {difference.max():.4f}")
+    assert difference.mean() < 0.05 and difference.max() < 0.5
+
+    # Aspect-preserving processors are rejected instead of silently squashed
+    classifier = StubClassifier()
+    classifier.processor = StubProcessor()
+    classifier.processor.size = {"shortest_edge": 8}
+    try:
+        classifier._preprocess_fast(exact)
+        assert False, "expected ValueError"
+    except ValueError as e:
+        assert "shortest_edge" in str(e)
+    print("Preprocessing parity checks passed.")
+
+if __name__ == "__main__":
+    test_classify_batch()
+    test_fast_preprocess_parity()
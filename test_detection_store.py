@@ -0,0 +1,66 @@
+"""
+Test script for the columnar DetectionStore (no models required).
+"""
+
+import numpy as np
+
+from src.detection_store import DetectionStore
+
+def append_demo_frames(store, frames):
+    for frame_id in range(frames):
+        store.append_frame(
+            frame_id,
+            vehicle_ids=[1, 2],
+            boxes=[[10.0 * frame_id, 20.0, 60.0, 80.0], [100.0, 120.0, 180.0, 200.0]],
+            vehicle_classes=["car", "truck"],
+            detection_confidences=[0.9, 0.75],
+            make_models=["Toyota Camry", "Unknown"],
+            make_model_confidences=[0.8, 0.0],
+            license_plates=["ABC123" if frame_id % 2 else "N/A", "N/A"],
+            plate_confidences=[0.6 if frame_id % 2 else 0.0, 0.0])
+
+def test_detection_store():
+    print("=" * 60)
+    print("DetectionStore - Verification Test")
+    print("=" * 60)
+
+    # Small initial capacity so the columns have to grow
+    store = DetectionStore(capacity=4)
+    append_demo_frames(store, 10)
+    store.append_frame(10, [], [], [], [], [], [], [], [])
+
+    assert len(store) == 20
+    assert store.capacity >= 20
+    assert len(store.interners["make_model"]) == 2
+
+    # Rows read back like the old result dicts
+    row = store[2]
+    assert row == {"frame_id": 1, "vehicle_id": 1, "vehicle_class": "car",
+                   "detection_confidence": row["detection_confidence"],
+                   "make_model": "Toyota Camry", "make_model_confidence": row["make_model_confidence"],
+                   "license_plate": "ABC123", "plate_confidence": row["plate_confidence"],
+                   "bbox": [10.0, 20.0, 60.0, 80.0]}
+    assert abs(row["detection_confidence"] - 0.9) < 1e-6
+    assert store[-1]["frame_id"] == 9
+    assert [r["vehicle_id"] for r in store[:3]] == [1, 2, 1]
+    assert sum(1 for r in store if r["license_plate"] != "N/A") == 5
+    print(f"  {len(store)} rows, capacity {store.capacity}")
+
+    # The DataFrame shares the column buffers instead of copying them
+    df = store.to_dataframe()
+    assert np.shares_memory(df["vehicle_id"].to_numpy(), store.column("vehicle_id"))
+    assert str(df["make_model"].dtype) == "category"
+    assert (df["license_plate"] == "ABC123").sum() == 5
+    assert list(store.to_dataframe(bbox_as_list=True)["bbox"][0]) == [0.0, 20.0, 60.0, 80.0]
+
+    try:
+        table = store.to_arrow()
+        assert table.num_rows == 20
+        assert table.column("license_plate").to_pylist()[:2] == ["N/A", "N/A"]
+    except ImportError:
+        print("  pyarrow not installed, skipping Arrow export")
+
+    print("DetectionStore checks passed.")
+
+if __name__ == "__main__":
+    test_detection_store()
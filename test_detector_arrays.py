@@ -0,0 +1,141 @@
+"""
+Test script for the array paths of the detector and tracker with stub YOLO results (no models required).
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from src.detector import VehicleDetector
+from src.roi import RegionOfInterest
+from src.tracker import VehicleTracker
+
+NAMES = {0: "person", 2: "car", 3: "motorcycle", 5: "bus", 7: "truck"}
+
+# Rows in crop coordinates: x1, y1, x2, y2, confidence, class
+CROP_ROWS = np.array([
+    [60, 10, 100, 40, 0.9, 2],   # car, inside the ROI
+    [10, 10, 20, 30, 0.8, 0],    # person, not a vehicle
+    [0, 0, 20, 20, 0.7, 7],      # truck, left of the trapezoid
+    [150, 30, 178, 55, 0.6, 5],  # bus, inside the ROI
+], dtype=np.float32)
+
+class StubBoxes:
+    """numpy stand-in for ultralytics Boxes: masks, .cls, .cpu().numpy() and .data."""
+    def __init__(self, data, orig_shape):
+        self.data = np.asarray(data, dtype=np.float32)
+        self.orig_shape = orig_shape
+
+    @property
+    def cls(self):
+        return self.data[:, 5]
+
+    def __getitem__(self, index):
+        return StubBoxes(self.data[index], self.orig_shape)
+
+    def cpu(self):
+        return self
+
+    def numpy(self):
+        return self
+
+class StubModel:
+    """Returns CROP_ROWS for every image and records the image shapes it was given."""
+    names = NAMES
+
+    def __init__(self):
+        self.shapes = []
+
+    def result(self, image):
+        self.shapes.append(image.shape[:2])
+        return SimpleNamespace(boxes=StubBoxes(CROP_ROWS, image.shape[:2]))
+
+    def __call__(self, image, **kwargs):
+        return [self.result(image)]
+
+    def predict(self, image, **kwargs):
+        return [self.result(image)]
+
+class StubByteTracker:
+    """Gives every box the next track ID and records what update() received."""
+    def __init__(self):
+        self.received = []
+
+    def update(self, boxes, frame):
+        self.received.append(boxes)
+        data = boxes.data
+        ids = np.arange(1, len(data) + 1, dtype=np.float32)
+        return np.column_stack([data[:, :4], ids, data[:, 4], data[:, 5], ids - 1])
+
+class StubDetector(VehicleDetector):
+    model = StubModel()
+
+class StubTracker(VehicleTracker):
+    model = StubModel()
+
+def road_roi():
+    """Trapezoid in a 200x100 frame; its bounding crop starts at (20, 40)."""
+    return RegionOfInterest([[[60, 40], [140, 40], [199, 99], [20, 99]]])
+
+FRAME = np.zeros((100, 200, 3), dtype=np.uint8)
+
+def test_detect_arrays():
+    print("=" * 60)
+    print("Detector - detect_arrays with Stub Boxes")
+    print("=" * 60)
+
+    # Without an ROI: only the person is masked out, coordinates unchanged
+    detector = StubDetector()
+    arrays = detector.detect_arrays(FRAME)
+    assert arrays["class_ids"].tolist() == [2, 7, 5]
+    assert np.allclose(arrays["boxes"], CROP_ROWS[[0, 2, 3], :4])
+    assert arrays["boxes"].dtype == np.float32 and arrays["class_ids"].dtype == np.int64
+    assert np.allclose(arrays["confidences"], [0.9, 0.7, 0.6])
+
+    # With an ROI: YOLO sees the crop, boxes come back in frame coordinates
+    detector = StubDetector(roi=road_roi())
+    detector.model.shapes.clear()
+    arrays = detector.detect_arrays(FRAME)
+    assert detector.model.shapes == [(60, 180)]
+    assert arrays["class_ids"].tolist() == [2, 5]
+    assert arrays["boxes"].tolist() == [[80, 50, 120, 80], [170, 70, 198, 95]]
+    assert [d["class"] for d in detector.detect_vehicles(FRAME)] == ["car", "bus"]
+    print("detect_arrays checks passed.")
+
+def test_track_arrays():
+    print("=" * 60)
+    print("Tracker - track_arrays/update_arrays with Stub Boxes")
+    print("=" * 60)
+
+    tracker = StubTracker(roi=road_roi())
+    tracker.byte_tracker = StubByteTracker()
+    tracker.model.shapes.clear()
+    tracks, total = tracker.track_arrays(FRAME)
+    assert tracker.model.shapes == [(60, 180)]
+
+    # ByteTrack gets every vehicle, in frame coordinates and frame shape
+    received = tracker.byte_tracker.received[0]
+    assert received.orig_shape == FRAME.shape[:2]
+    assert received.cls.tolist() == [2, 7, 5]
+    assert received.data[:, :4].tolist() == [[80, 50, 120, 80], [20, 40, 40, 60], [170, 70, 198, 95]]
+
+    # Only vehicles inside the ROI are reported, but the IDs stay ByteTrack's
+    assert tracks["ids"].tolist() == [1, 3]
+    assert tracks["class_ids"].tolist() == [2, 5]
+    assert tracks["boxes"].tolist() == [[80, 50, 120, 80], [170, 70, 198, 95]]
+    assert np.allclose(tracks["confidences"], [0.9, 0.6])
+    assert total == 2 and tracker.last_tracks is tracks
+
+    # update_arrays with a result computed elsewhere and no offset keeps coordinates
+    tracker = StubTracker()
+    tracker.byte_tracker = StubByteTracker()
+    result = SimpleNamespace(boxes=StubBoxes(CROP_ROWS, FRAME.shape[:2]))
+    tracks, total = tracker.update_arrays(result, FRAME)
+    assert tracks["boxes"].tolist() == CROP_ROWS[[0, 2, 3], :4].tolist()
+    detections, _ = tracker.update(result, FRAME)
+    assert [d["class"] for d in detections] == ["car", "truck", "bus"]
+    print("track_arrays checks passed.")
+
+if __name__ == "__main__":
+    test_detect_arrays()
+    test_track_arrays()
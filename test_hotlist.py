@@ -0,0 +1,93 @@
+"""
+Test script for the fuzzy plate hotlist and its alerting (no models required).
+"""
+
+import os
+import tempfile
+import threading
+import time
+
+from src.hotlist import Hotlist, HotlistMonitor, canonical_plate, deletion_variants, edit_distance
+
+def test_hotlist_lookup():
+    print("=" * 60)
+    print("Plate Hotlist - Lookup")
+    print("=" * 60)
+
+    assert canonical_plate("8ab-c1O2") == canonical_plate("BABC102") == "8A8C102"
+    assert deletion_variants("ABC", 1) == {"ABC", "BC", "AC", "AB"}
+    assert edit_distance("ABC123", "ABC128", 2) == 1
+    assert edit_distance("ABC123", "XYZ987", 1) == 2
+
+    hotlist = Hotlist([("ABC1234", "stolen"), "XYZ987", "KLM5550", ""], max_distance=1)
+    assert len(hotlist) == 3
+
+    # OCR confusions match exactly after folding
+    match, = hotlist.lookup("A8C-I234")
+    assert match == {"plate": "ABC1234", "note": "stolen", "distance": 0}
+    # One substituted, dropped or extra character is still found
+    assert hotlist.lookup("ABC1284")[0]["distance"] == 1
+    assert hotlist.lookup("ABC123")[0]["plate"] == "ABC1234"
+    assert hotlist.lookup("XYZ9870")[0]["plate"] == "XYZ987"
+    # Two edits are out of range, and exact-only lookups skip fuzzy hits
+    assert hotlist.lookup("ABX1284") == []
+    assert hotlist.lookup("ABC1284", max_distance=0) == []
+    assert hotlist.lookup("") == []
+
+def test_hotlist_monitor():
+    print("=" * 60)
+    print("Plate Hotlist - Alerts and Reload")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "hotlist.csv")
+        with open(path, "w") as f:
+            f.write("# plate,note\nABC1234,stolen\nXYZ987\n")
+
+        received = []
+        delivered = threading.Event()
+        release = threading.Event()
+
+        def slow_callback(alert):
+            release.wait(5)
+            received.append(alert)
+            delivered.set()
+
+        monitor = HotlistMonitor(path, callback=slow_callback, min_confidence=0.3, fuzzy_min_confidence=0.6,
+                                 reload_interval=0.0)
+        try:
+            # A slow callback does not block check()
+            start = time.perf_counter()
+            raised = monitor.check("ABC1234", 0.9, vehicle_id=7, frame_id=12)
+            assert time.perf_counter() - start < 0.5
+            assert len(raised) == 1 and raised[0]["vehicle_id"] == 7 and raised[0]["note"] == "stolen"
+            release.set()
+            assert delivered.wait(5)
+            assert received[0]["plate"] == "ABC1234"
+
+            # The same vehicle raises each listed plate once
+            assert monitor.check("A8C1234", 0.9, vehicle_id=7, frame_id=13) == []
+            # Confidence thresholds: low-confidence reads are ignored, fuzzy hits need more
+            assert monitor.check("XYZ987", 0.2, vehicle_id=8) == []
+            assert monitor.check("XYZ98", 0.5, vehicle_id=8) == []
+            assert len(monitor.check("XYZ98", 0.7, vehicle_id=8)) == 1
+
+            # Editing the file swaps in a new index on a background thread
+            with open(path, "w") as f:
+                f.write("NEW5678,wanted\n")
+            os.utime(path, (time.time() + 5, time.time() + 5))
+            monitor.check("nothing", 0.9)
+            if monitor._reloading is not None:
+                monitor._reloading.join()
+            assert len(monitor.hotlist) == 1
+            assert len(monitor.check("NEW5678", 0.9, vehicle_id=9)) == 1
+            print(f"  {monitor.stats()}")
+        finally:
+            release.set()
+            monitor.close()
+
+    print("Hotlist checks passed.")
+
+if __name__ == "__main__":
+    test_hotlist_lookup()
+    test_hotlist_monitor()
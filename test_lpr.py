@@ -0,0 +1,55 @@
+"""
+Test script for batched plate OCR input handling (no models required).
+"""
+
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from src.lpr import LicensePlateScanner
+
+class StubReader:
+    """Records the batches readtext_batched receives and reads one fake plate per image."""
+    def __init__(self):
+        self.batches = []
+
+    def readtext_batched(self, batch, batch_size=1):
+        self.batches.append(batch)
+        return [[(None, f"PLATE{i}", 0.9)] for i in range(len(batch))]
+
+class StubScanner(LicensePlateScanner):
+    reader = None
+
+def test_mixed_channels():
+    print("=" * 60)
+    print("LPR - Mixed Grayscale/BGR Batches")
+    print("=" * 60)
+
+    scanner = StubScanner(max_batch_size=8)
+    scanner.reader = StubReader()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "plate.png")
+        cv2.imwrite(path, np.full((30, 90, 3), 200, dtype=np.uint8))
+        images = [
+            np.full((20, 60), 255, dtype=np.uint8),          # grayscale crop
+            np.full((25, 80, 3), 128, dtype=np.uint8),       # BGR crop
+            np.full((10, 40, 4), 50, dtype=np.uint8),        # BGRA crop
+            path,                                            # image file
+            np.empty((0, 0, 3), dtype=np.uint8),             # empty crop
+        ]
+        plates = scanner.scan_plates(images)
+
+    assert len(scanner.reader.batches) == 1
+    batch = scanner.reader.batches[0]
+    # Every canvas is the same 3-channel shape, whatever the input layout
+    assert {canvas.shape for canvas in batch} == {(30, 90, 3)}
+    assert [len(p) for p in plates] == [1, 1, 1, 1, 0]
+    # Grayscale content survives the conversion to BGR
+    gray_canvas = next(canvas for canvas in batch if canvas[:20, :60].min() == 255)
+    assert (gray_canvas[20:] == 0).all() and (gray_canvas[:, 60:] == 0).all()
+    print("Mixed input checks passed.")
+
+if __name__ == "__main__":
+    test_mixed_channels()
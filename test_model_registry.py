@@ -0,0 +1,123 @@
+"""
+Test script for the shared model registry with stub builders (no models required).
+"""
+
+import threading
+import time
+
+from src import model_registry
+
+class StubBuilder:
+    """Counts builds per name; each build takes `delay` seconds."""
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.builds = []
+        self.lock = threading.Lock()
+
+    def __call__(self, name, **config):
+        with self.lock:
+            self.builds.append(name)
+        time.sleep(self.delay)
+        return object()
+
+def with_stub_loader(builder, test):
+    model_registry.clear()
+    model_registry.LOADERS["stub"] = builder
+    try:
+        test()
+    finally:
+        del model_registry.LOADERS["stub"]
+        model_registry.clear()
+
+def test_concurrent_get():
+    print("=" * 60)
+    print("Model Registry - Concurrent get_model")
+    print("=" * 60)
+
+    builder = StubBuilder()
+
+    def check():
+        start = threading.Barrier(8)
+        models = []
+
+        def get(name):
+            start.wait()
+            models.append(model_registry.get_model("stub", name))
+
+        threads = [threading.Thread(target=get, args=("weights.pt",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # Eight callers at once, one build, one shared instance
+        assert builder.builds == ["weights.pt"]
+        assert len(models) == 8 and all(model is models[0] for model in models)
+        assert model_registry.is_loaded("stub", "weights.pt")
+
+        # Config is part of the key
+        other = model_registry.get_model("stub", "weights.pt", quantize=True)
+        assert other is not models[0]
+        assert builder.builds == ["weights.pt", "weights.pt"]
+        assert model_registry.get_model("stub", "weights.pt", quantize=True) is other
+
+    with_stub_loader(builder, check)
+    try:
+        model_registry.get_model("missing", "weights.pt")
+        assert False, "expected ValueError"
+    except ValueError:
+        pass
+    print("Concurrent get checks passed.")
+
+class StubComponent:
+    """Component with a model_spec and a warm_up() that records its calls."""
+    def __init__(self, name):
+        self.model_spec = ("stub", name, {})
+        self.warm_ups = 0
+
+    def warm_up(self):
+        self.warm_ups += 1
+
+class BarrierBuilder(StubBuilder):
+    """Each build waits until `parties` builds have started: sequential builds time out."""
+    def __init__(self, parties, timeout=2.0):
+        super().__init__(delay=0)
+        self.barrier = threading.Barrier(parties, timeout=timeout)
+
+    def __call__(self, name, **config):
+        self.barrier.wait()
+        return super().__call__(name, **config)
+
+def test_parallel_warm_up():
+    print("=" * 60)
+    print("Model Registry - Parallel warm_up")
+    print("=" * 60)
+
+    builder = BarrierBuilder(3)
+    components = [StubComponent(name) for name in ("yolo.pt", "vit", "en")]
+
+    def check():
+        timings = model_registry.warm_up(components)
+        assert sorted(builder.builds) == ["en", "vit", "yolo.pt"]
+        assert set(timings) == {"stub:yolo.pt", "stub:vit", "stub:en"}
+        assert all(component.warm_ups == 1 for component in components)
+
+        # Already loaded: nothing is rebuilt, only the dummy pass can run again
+        model_registry.warm_up(components, parallel=False, dummy_pass=False)
+        assert len(builder.builds) == 3
+        assert all(component.warm_ups == 1 for component in components)
+
+    with_stub_loader(builder, check)
+
+    # Without parallel loading the builds run one after another
+    builder = BarrierBuilder(2, timeout=0.3)
+    try:
+        with_stub_loader(builder, lambda: model_registry.warm_up(components[:2], parallel=False))
+        assert False, "expected the builds to run sequentially"
+    except threading.BrokenBarrierError:
+        pass
+    print("Parallel warm-up checks passed.")
+
+if __name__ == "__main__":
+    test_concurrent_get()
+    test_parallel_warm_up()
@@ -0,0 +1,47 @@
+"""
+Test script for the motion gate in front of the tracker (no models required).
+"""
+
+import numpy as np
+
+from src.motion_gate import MotionGate
+
+def road_frame(car_x=None):
+    frame = np.full((720, 1280, 3), 60, dtype=np.uint8)
+    # Static texture plus a little per-frame sensor noise
+    frame[400:] = 90
+    frame = frame + np.random.default_rng().integers(0, 4, frame.shape, dtype=np.uint8)
+    if car_x is not None:
+        frame[500:560, car_x:car_x + 90] = 200
+    return frame
+
+def test_motion_gate():
+    print("=" * 60)
+    print("Motion Gate - Verification Test")
+    print("=" * 60)
+
+    gate = MotionGate(force_every=10)
+
+    # First frame always runs detection; an empty, static road is then gated
+    assert gate.should_detect(road_frame())
+    decisions = [gate.should_detect(road_frame()) for _ in range(9)]
+    assert not any(decisions)
+
+    # The safety net forces a full detection every force_every frames
+    assert gate.should_detect(road_frame())
+    assert gate.gated_frames == 9
+
+    # A small vehicle entering one region is not averaged away
+    assert not gate.should_detect(road_frame())
+    assert gate.should_detect(road_frame(car_x=100))
+    assert len(gate.changed_regions) >= 1
+    print(f"  Regions with motion: {gate.changed_regions}")
+
+    # A parked vehicle stops triggering once it is part of the reference
+    assert not gate.should_detect(road_frame(car_x=100))
+
+    print(f"  {gate.stats()}")
+    print("Motion gate checks passed.")
+
+if __name__ == "__main__":
+    test_motion_gate()
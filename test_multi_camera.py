@@ -0,0 +1,122 @@
+"""
+Test script for the multi-camera server, with video files standing in for cameras (no models required).
+"""
+
+import os
+import tempfile
+import time
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+from src import multi_camera
+from src.multi_camera import CameraStream, MultiCameraServer
+from src.tracker import VehicleTracker
+
+class StubModel:
+    """Records the batches predict() receives; the results are ignored by StubTracker."""
+    names = {2: "car"}
+
+    def __init__(self):
+        self.batches = []
+
+    def predict(self, images, **kwargs):
+        self.batches.append(len(images))
+        return [SimpleNamespace(boxes=None) for _ in images]
+
+class StubTracker(VehicleTracker):
+    """VehicleTracker whose ByteTrack step reports one fixed vehicle per stream."""
+    model = StubModel()
+
+    def update_arrays(self, result, frame, offset=(0, 0)):
+        self.tracked_ids.add(1)
+        self.last_tracks = {
+            "ids": np.array([1], dtype=np.int64),
+            "boxes": np.array([[10, 10, 50, 40]], dtype=np.float32),
+            "class_ids": np.array([2], dtype=np.int64),
+            "confidences": np.array([0.9], dtype=np.float32)
+        }
+        return self.last_tracks, len(self.tracked_ids)
+
+def make_video(path, frames=20, fps=50, size=(96, 64)):
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    for i in range(frames):
+        out.write(np.full((size[1], size[0], 3), i * 10, dtype=np.uint8))
+    out.release()
+
+def stub_server(sources, realtime):
+    server = MultiCameraServer(sources, analyze=False, realtime=realtime)
+    server.trackers = {stream_id: StubTracker() for stream_id in sources}
+    return server
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.time() + timeout
+    while not condition():
+        assert time.time() < deadline, "timed out"
+        time.sleep(0.005)
+
+def test_batched_streams():
+    print("=" * 60)
+    print("Multi-Camera - Batched Inference over File Streams")
+    print("=" * 60)
+
+    model = StubModel()
+    original = multi_camera.get_yolo
+    multi_camera.get_yolo = lambda name, backend=None: model
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "camera.mp4")
+            make_video(video)
+            sources = {"north": video, "south": video}
+
+            # Both streams have a frame waiting: one predict call covers them
+            server = stub_server(sources, realtime=False)
+            for stream in server.streams.values():
+                assert stream.start()
+            try:
+                wait_for(lambda: all(stream.frame is not None for stream in server.streams.values()))
+                outputs = server.step()
+            finally:
+                for stream in server.streams.values():
+                    stream.stop()
+            assert model.batches == [2]
+            assert sorted(output["stream_id"] for output in outputs) == ["north", "south"]
+            assert sorted(row["stream_id"] for row in server.results) == ["north", "south"]
+
+            # Offline files: every frame is served, none dropped
+            model.batches.clear()
+            server = stub_server(sources, realtime=False)
+            server.run()
+            for stream in server.streams.values():
+                assert stream.frame_id == 20 and stream.dropped_frames == 0
+            assert sum(model.batches) == 40
+            assert {row["stream_id"] for row in server.results} == {"north", "south"}
+            assert all(row["vehicle_id"] == 1 and row["vehicle_class"] == "car" for row in server.results)
+    finally:
+        multi_camera.get_yolo = original
+    print(f"  {len(model.batches)} batched steps for 40 frames")
+    print("Batching checks passed.")
+
+def test_realtime_drops():
+    print("=" * 60)
+    print("Multi-Camera - Dropped Frames in Realtime Mode")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "camera.mp4")
+        make_video(video)
+        stream = CameraStream("cam", video, realtime=True)
+        assert stream.start()
+        # Nobody takes frames: each new one replaces an unseen one
+        wait_for(lambda: stream.finished)
+        stream.stop()
+        assert stream.frame_id == 20
+        assert stream.dropped_frames == 19
+        frame, frame_id, _ = stream.latest()
+        assert frame_id == 20 and stream.latest() is None
+    print("Dropped frame checks passed.")
+
+if __name__ == "__main__":
+    test_batched_streams()
+    test_realtime_drops()
@@ -0,0 +1,140 @@
+"""
+Test script for the plate/vehicle search index over result files (no models required).
+"""
+
+import csv
+import os
+import tempfile
+from datetime import datetime
+
+from src.plate_index import PlateIndex
+from src.result_sink import SQLiteResultSink
+
+LIVE_COLUMNS = ["timestamp", "stream_id", "frame_id", "vehicle_id", "vehicle_class", "detection_confidence",
+                "make_model", "make_model_confidence", "license_plate", "plate_confidence", "bbox"]
+
+def live_row(timestamp, stream_id, frame_id, vehicle_id, make_model, plate, vehicle_class="car"):
+    return [timestamp, stream_id, frame_id, vehicle_id, vehicle_class, 0.9, make_model, 0.7, plate, 0.8,
+            "[1.0, 2.0, 3.0, 4.0]"]
+
+def test_plate_index():
+    print("=" * 60)
+    print("Plate Index - Ingest and Search")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        live_csv = os.path.join(tmp, "multi_camera_results.csv")
+        with open(live_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(LIVE_COLUMNS)
+            writer.writerow(live_row("2024-05-01T08:00:00", 3, 10, 1, "Toyota Corolla", "ABC-1234"))
+            writer.writerow(live_row("2024-05-01T08:00:01", 3, 11, 1, "Toyota Corolla", "A8C1234"))
+            writer.writerow(live_row("2024-05-01T08:00:01", 3, 11, 2, "Ford Transit", "N/A", "truck"))
+            writer.writerow(live_row("2024-05-02T17:30:00", 1, 99, 5, "Toyota Corolla", "ABC1234"))
+
+        # save_results layout: no timestamp or stream_id, timed from --start-time/--fps
+        video_csv = os.path.join(tmp, "results.csv")
+        with open(video_csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame_id", "vehicle_id", "bbox", "vehicle_class", "detection_confidence",
+                             "make_model", "make_model_confidence", "license_plate", "plate_confidence"])
+            writer.writerow([60, 7, "[0, 0, 1, 1]", "car", 0.9, "Honda Civic", 0.6, "XYZ 987", 0.7])
+
+        index = PlateIndex(os.path.join(tmp, "index.db"))
+        try:
+            assert index.ingest(live_csv) == 4
+            assert index.ingest(video_csv, camera="gate", start_time=datetime(2024, 5, 3, 12), fps=30) == 1
+            # Unchanged files are skipped
+            assert index.ingest(live_csv) == 0
+            assert index.stats() == {"detections": 5, "plates": 2, "files": 2}
+
+            # Formatting and OCR confusions don't matter; one sighting per vehicle pass
+            sightings = index.search("abc 1234")
+            assert [(s["camera"], s["vehicle_id"], s["detections"]) for s in sightings] == [("1", 5, 1), ("3", 1, 2)]
+            assert sightings[1]["first_seen"] == "2024-05-01T08:00:00"
+            assert sightings[1]["last_seen"] == "2024-05-01T08:00:01"
+            # Substrings, camera and time filters
+            assert len(index.search("C123", camera=3)) == 1
+            assert len(index.search("ABC", since="2024-05-02")) == 1
+            assert index.search("ABC", until="2024-04-30") == []
+            assert index.search("12") != []
+            # Fuzzy: one misread character
+            assert index.search("ABC1284") == []
+            assert index.search("ABC1284", fuzzy=1)[0]["plate"] == "A8C1234"
+            # Rows without a timestamp column get one from start_time + frame_id / fps
+            row, = index.search("XYZ987", sightings=False)
+            assert row["camera"] == "gate" and row["timestamp"] == "2024-05-03T12:00:02"
+            # Filters without a plate
+            assert len(index.search(make_model="transit")) == 1
+            assert len(index.search(vehicle_class="car", sightings=False)) == 4
+
+            # Appended rows (as a streaming sink writes them) are picked up incrementally,
+            # and an unfinished last line waits for the next ingest
+            with open(live_csv, "a", newline="") as f:
+                csv.writer(f).writerow(live_row("2024-05-04T09:00:00", 3, 500, 9, "Kia Rio", "NEW5678"))
+                f.write("2024-05-04T09:00:01,3,501,9,car")
+            assert index.ingest(live_csv) == 1
+            with open(live_csv, "a", newline="") as f:
+                f.write(",0.9,Kia Rio,0.7,NEW5678,0.8,\"[1, 2, 3, 4]\"\n")
+            assert index.ingest(live_csv) == 1
+            assert index.search("NEW5678")[0]["detections"] == 2
+
+            # A rewritten file replaces its old rows
+            with open(video_csv, "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(["frame_id", "vehicle_id", "license_plate"])
+                writer.writerow([1, 1, "QQQ111"])
+                writer.writerow([2, 1, "QQQ111"])
+            assert index.ingest(video_csv, camera="gate") == 2
+            assert index.search("XYZ987") == []
+            assert index.stats()["detections"] == 8
+
+            # SQLite sink files are read by rowid
+            sink = SQLiteResultSink(os.path.join(tmp, "results.db"))
+            row = {"stream_id": 2, "frame_id": 1, "vehicle_id": 4, "bbox": [0, 0, 1, 1], "license_plate": "ABC1234"}
+            sink.write_rows([row])
+            sink.flush()
+            assert index.ingest(sink.path) == 1
+            sink.write_rows([{**row, "frame_id": 2}])
+            sink.flush()
+            assert index.ingest(sink.path) == 1
+            sink.close()
+            assert index.search("ABC1234", camera=2)[0]["last_frame"] == 2
+            print(f"  {index.stats()}")
+        finally:
+            index.close()
+
+    print("Plate index checks passed.")
+
+def test_ingest_paths():
+    print("=" * 60)
+    print("Plate Index - Ingesting a Directory")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for day in range(1, 4):
+            with open(os.path.join(tmp, f"live_results_{day}.csv"), "w", newline="") as f:
+                writer = csv.writer(f)
+                writer.writerow(LIVE_COLUMNS)
+                writer.writerow(live_row(f"2024-05-0{day}T08:00:00", 1, 10, day, "Toyota Corolla", f"DAY{day}"))
+
+        index = PlateIndex(os.path.join(tmp, "index.db"))
+        maintained = []
+        maintain = index.maintain
+        index.maintain = lambda: maintained.append(1) or maintain()
+        try:
+            # Statistics and the WAL checkpoint run once per batch, not once per file
+            assert index.ingest_paths([os.path.join(tmp, "live_results_*.csv")]) == 3
+            assert len(maintained) == 1
+            assert index.stats() == {"detections": 3, "plates": 3, "files": 3}
+            assert index.connection.execute("SELECT COUNT(*) FROM sqlite_stat1").fetchone()[0] > 0
+            # Nothing new: nothing to maintain
+            assert index.ingest_paths([os.path.join(tmp, "live_results_*.csv")]) == 0
+            assert len(maintained) == 1
+        finally:
+            index.close()
+    print("Directory ingest checks passed.")
+
+if __name__ == "__main__":
+    test_plate_index()
+    test_ingest_paths()
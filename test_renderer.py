@@ -0,0 +1,184 @@
+"""
+Test script for analysis-only runs and deferred overlay rendering (no models required).
+"""
+
+import os
+import tempfile
+import threading
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+
+import main
+from main import VehicleAnalysisPipeline
+from src import renderer
+from src.detection_store import DetectionStore
+from src.renderer import frame_ranges, load_results, parse_range, render_video
+from src.track_aggregator import TrackAggregator
+from src.track_cache import TrackResultCache
+
+FPS = 10
+
+def make_video(path, frames=60, size=(160, 120)):
+    out = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), FPS, size)
+    for i in range(frames):
+        frame = np.full((size[1], size[0], 3), 40, dtype=np.uint8)
+        cv2.putText(frame, str(i), (5, 110), cv2.FONT_HERSHEY_SIMPLEX, 0.4, (255, 255, 255), 1)
+        out.write(frame)
+    out.release()
+
+def fake_pipeline():
+    """A pipeline whose process_frame reports two fixed vehicles: 1 in frames 0-29, 2 in frames 20-59."""
+    pipeline = VehicleAnalysisPipeline.__new__(VehicleAnalysisPipeline)
+    pipeline.tracker = SimpleNamespace(roi=None, motion_gate=None, tracked_ids=set())
+    pipeline.track_cache = TrackResultCache()
+    pipeline.aggregator = TrackAggregator()
+    pipeline.track_summaries = []
+    pipeline.results = DetectionStore()
+    pipeline.result_sink = None
+    pipeline.per_frame_results = True
+    pipeline.best_shot = None
+    pipeline.hotlist = None
+    pipeline.drawn = 0
+
+    def process_frame(frame, frame_id):
+        detections = []
+        if frame_id < 30:
+            detections.append({'id': 1, 'bbox': [10, 10, 60, 50], 'class': 'car', 'confidence': 0.9})
+        if frame_id >= 20:
+            detections.append({'id': 2, 'bbox': [80, 40, 150, 100], 'class': 'truck', 'confidence': 0.8})
+        pipeline.tracker.tracked_ids.update(d['id'] for d in detections)
+        make_models = [{'make_model': f"Model {d['id']}", 'confidence': 0.7} for d in detections]
+        plates = [("ABC123" if d['id'] == 1 else "N/A", 0.8) for d in detections]
+        pipeline._record_frame(frame_id, detections, make_models, plates)
+        enhanced = [{**d, 'make_model': m['make_model'], 'license_plate': p} for d, m, (p, _) in
+                    zip(detections, make_models, plates)]
+        return len(pipeline.tracker.tracked_ids), enhanced
+
+    def draw_overlays(frame, detections, total_count):
+        pipeline.drawn += 1
+
+    pipeline.process_frame = process_frame
+    pipeline.draw_overlays = draw_overlays
+    return pipeline
+
+def test_analysis_only():
+    print("=" * 60)
+    print("Analysis-only Mode - No Drawing or Encoding")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "input.mp4")
+        make_video(video)
+        for threaded in (False, True):
+            pipeline = fake_pipeline()
+            pipeline.process_video(video, None, threaded=threaded)
+            assert pipeline.drawn == 0 and pipeline.stage_timings['encode'] == 0.0
+            assert len(pipeline.results) == 30 + 40
+
+        pipeline = fake_pipeline()
+        pipeline.process_video(video, os.path.join(tmp, "annotated.mp4"), threaded=True)
+        assert pipeline.drawn == 60
+
+class NoFrameCount:
+    """VideoCapture wrapper reporting CAP_PROP_FRAME_COUNT as 0, like some streams and containers."""
+    def __init__(self, cap):
+        self.cap = cap
+
+    def get(self, prop):
+        return 0 if prop == cv2.CAP_PROP_FRAME_COUNT else self.cap.get(prop)
+
+    def __getattr__(self, name):
+        return getattr(self.cap, name)
+
+def test_render_video():
+    print("=" * 60)
+    print("Deferred Rendering - Ranges and Vehicles")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        video = os.path.join(tmp, "input.mp4")
+        results_csv = os.path.join(tmp, "results.csv")
+        make_video(video)
+        pipeline = fake_pipeline()
+        pipeline.process_video(video, None)
+        pipeline.save_results(results_csv)
+
+        results = load_results(results_csv)
+        assert list(results.columns) == ["frame_id", "vehicle_id", "x1", "y1", "x2", "y2", "make_model",
+                                         "license_plate"]
+        assert parse_range("0:01-1:02.5") == (1.0, 62.5)
+        assert frame_ranges(results, FPS, 60, time_ranges=[(1, 2), (1.5, 3)]) == [(10, 30)]
+        # Vehicle 1 is in frames 0-29; one second of padding, clipped to the time range
+        assert frame_ranges(results, FPS, 60, vehicle_ids=[1]) == [(0, 40)]
+        assert frame_ranges(results, FPS, 60, time_ranges=[(3.5, 6)], vehicle_ids=[1]) == [(35, 40)]
+
+        # Whole video: overlays drawn where the stored boxes are
+        output = os.path.join(tmp, "annotated.mp4")
+        assert render_video(video, results_csv, output) == 60
+        cap = cv2.VideoCapture(output)
+        ret, frame = cap.read()
+        cap.release()
+        assert ret and frame[10, 35, 1] > 150  # green top edge of vehicle 1's box
+
+        # Only selected time ranges and vehicles are decoded and encoded
+        assert render_video(video, results, os.path.join(tmp, "clip.mp4"), time_ranges=[(1, 2), (4, 4.5)]) == 15
+        assert render_video(video, results, os.path.join(tmp, "vehicle.mp4"), vehicle_ids=[2], padding=0) == 40
+
+        # Containers that report no frame count render up to the last stored frame
+        original = renderer.cv2.VideoCapture
+        renderer.cv2.VideoCapture = lambda path: NoFrameCount(original(path))
+        try:
+            assert render_video(video, results, os.path.join(tmp, "nocount.mp4")) == 60
+            assert render_video(video, results, os.path.join(tmp, "nocount.mp4"), time_ranges=[(4, 100)]) == 20
+        finally:
+            renderer.cv2.VideoCapture = original
+
+        # Parquet results (separate x1..y2 columns) load the same way
+        pipeline.results.to_parquet(os.path.join(tmp, "results.parquet"))
+        parquet = load_results(os.path.join(tmp, "results.parquet"))
+        assert np.allclose(parquet[["x1", "y1", "x2", "y2"]].to_numpy(), results[["x1", "y1", "x2", "y2"]].to_numpy())
+
+    print("Renderer checks passed.")
+
+def test_threaded_reader_error():
+    print("=" * 60)
+    print("Threaded Mode - Decode Errors")
+    print("=" * 60)
+
+    def failing_read(cap, skip=0):
+        if failing_read.calls == 5:
+            raise RuntimeError("decoder crashed")
+        failing_read.calls += 1
+        return original(cap, skip)
+
+    failing_read.calls = 0
+    original = main.read_frame
+    main.read_frame = failing_read
+    outcome = []
+
+    def run():
+        try:
+            fake_pipeline().process_video(video, None, threaded=True)
+        except RuntimeError as e:
+            outcome.append(e)
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            video = os.path.join(tmp, "input.mp4")
+            make_video(video)
+            # A reader that dies must end the run with its error, not leave it waiting
+            thread = threading.Thread(target=run, daemon=True)
+            thread.start()
+            thread.join(timeout=10)
+            assert not thread.is_alive(), "process_video hung after the reader failed"
+    finally:
+        main.read_frame = original
+    assert len(outcome) == 1 and str(outcome[0]) == "decoder crashed"
+    print("Reader error checks passed.")
+
+if __name__ == "__main__":
+    test_analysis_only()
+    test_render_video()
+    test_threaded_reader_error()
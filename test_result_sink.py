@@ -0,0 +1,136 @@
+"""
+Test script for the streaming result sinks (no models required).
+"""
+
+import csv
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from src.result_sink import BackgroundSinkWriter, ResultSink, open_result_sink
+
+def make_row(frame_id):
+    return {
+        "frame_id": frame_id,
+        "vehicle_id": frame_id % 3,
+        "vehicle_class": "car",
+        "detection_confidence": 0.9,
+        "make_model": "Unknown",
+        "make_model_confidence": 0.0,
+        "license_plate": "N/A",
+        "plate_confidence": 0.0,
+        "bbox": [1.0, 2.0, 3.0, 4.0]
+    }
+
+def test_result_sinks():
+    print("=" * 60)
+    print("Result Sinks - Verification Test")
+    print("=" * 60)
+
+    temp_dir = tempfile.mkdtemp()
+
+    # CSV: same column layout as save_results, appended across sessions
+    csv_path = os.path.join(temp_dir, "results.csv")
+    for session in range(2):
+        sink = open_result_sink(csv_path, batch_size=4, flush_interval=0.1)
+        for frame_id in range(10):
+            sink.write(make_row(frame_id))
+        assert sink.flush()
+        assert sink.rows_written == 10
+        sink.close()
+        # Flushing a closed sink returns instead of waiting for a thread that is gone
+        assert sink.flush() is False
+
+    with open(csv_path, newline='') as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == list(make_row(0).keys())
+    assert len(rows) == 21
+    assert rows[1][-1] == "[1.0, 2.0, 3.0, 4.0]"
+    print(f"  CSV rows: {len(rows) - 1}")
+
+    # SQLite
+    db_path = os.path.join(temp_dir, "results.db")
+    sink = open_result_sink(db_path, batch_size=4)
+    for frame_id in range(10):
+        sink.write(make_row(frame_id))
+    sink.close()
+    count, = sqlite3.connect(db_path).execute("SELECT COUNT(*) FROM results").fetchone()
+    assert count == 10
+    print(f"  SQLite rows: {count}")
+
+    # Parquet (optional dependency)
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        print("  pyarrow not installed, skipping Parquet")
+    else:
+        parquet_path = os.path.join(temp_dir, "results.parquet")
+        sink = open_result_sink(parquet_path, batch_size=4)
+        for frame_id in range(10):
+            sink.write(make_row(frame_id))
+        sink.close()
+        table = pq.read_table(parquet_path)
+        assert table.num_rows == 10
+        print(f"  Parquet rows: {table.num_rows}")
+
+    # A backend stuck in flush() doesn't hold the caller past the timeout
+    release = threading.Event()
+    stuck = SimpleNamespace(path="stuck", write_rows=lambda rows: None, flush=lambda: release.wait(),
+                            close=lambda: None)
+    sink = BackgroundSinkWriter(stuck, flush_interval=60)
+    start = time.monotonic()
+    assert sink.flush(timeout=0.3) is False
+    assert time.monotonic() - start < 2
+    release.set()
+    sink.close()
+
+    print("Result sink checks passed.")
+
+class FailingSink(ResultSink):
+    """Backend whose writes fail, e.g. a full disk."""
+    def __init__(self):
+        super().__init__("failing.csv")
+        self.closed = False
+
+    def write_rows(self, rows):
+        raise OSError("No space left on device")
+
+    def close(self):
+        self.closed = True
+
+def test_sink_errors():
+    print("=" * 60)
+    print("Result Sinks - Backend Errors")
+    print("=" * 60)
+
+    # Backends must implement write_rows
+    try:
+        ResultSink("results.csv")
+        assert False, "expected TypeError"
+    except TypeError:
+        pass
+
+    # A failed background write surfaces from flush() and close(), not only write()
+    backend = FailingSink()
+    sink = BackgroundSinkWriter(backend, flush_interval=60)
+    sink.write(make_row(0))
+    try:
+        sink.flush()
+        assert False, "expected OSError"
+    except OSError as e:
+        assert "No space" in str(e)
+    try:
+        sink.close()
+        assert False, "expected OSError"
+    except OSError:
+        pass
+    # The backend is still closed
+    assert backend.closed
+    print("Error propagation checks passed.")
+
+if __name__ == "__main__":
+    test_result_sinks()
+    test_sink_errors()
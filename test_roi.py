@@ -0,0 +1,51 @@
+"""
+Test script for per-camera ROI polygons (no models required).
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+from src.roi import RegionOfInterest, load_roi_config, roi_for_camera
+
+def test_roi():
+    print("=" * 60)
+    print("Region of Interest - Verification Test")
+    print("=" * 60)
+
+    # Road trapezoid in the lower half of a 1280x720 frame
+    roi = RegionOfInterest([[[200, 360], [1000, 360], [1279, 719], [0, 719]]])
+    frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+
+    crop, offset = roi.crop(frame)
+    assert offset == (0, 360)
+    assert crop.shape[:2] == (360, 1280)
+    # The crop is a view into the frame, not a copy
+    assert np.shares_memory(crop, frame)
+
+    boxes = np.array([
+        [500, 400, 600, 470],    # on the road
+        [50, 300, 150, 380],     # left of the trapezoid's top edge
+        [1100, 100, 1200, 200],  # sky
+    ], dtype=np.float32)
+    inside = roi.contains(boxes, frame.shape)
+    print(f"  Inside ROI: {inside.tolist()}")
+    assert inside.tolist() == [True, False, False]
+    assert roi.contains(np.empty((0, 4)), frame.shape).shape == (0,)
+
+    # Per-camera config with a default fallback
+    config_path = os.path.join(tempfile.mkdtemp(), "roi.json")
+    with open(config_path, "w") as f:
+        json.dump({"default": [[[0, 0], [10, 0], [10, 10]]],
+                   "2": [[[0, 0], [100, 0], [100, 100], [0, 100]]]}, f)
+    config = load_roi_config(config_path)
+    assert roi_for_camera(config, 2).bounds == (0, 0, 101, 101)
+    assert roi_for_camera(config, "cam-7") is config["default"]
+    assert roi_for_camera(None, 0) is None
+
+    print("ROI checks passed.")
+
+if __name__ == "__main__":
+    test_roi()
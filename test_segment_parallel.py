@@ -0,0 +1,85 @@
+"""
+Test script for track stitching across video segments (no models required).
+"""
+
+import os
+import tempfile
+
+import main
+from src.segment_parallel import plan_segments, process_video_parallel, stitch_segments
+
+def row(frame_id, vehicle_id, x):
+    return {"frame_id": frame_id, "vehicle_id": vehicle_id, "bbox": [x, 100, x + 50, 150]}
+
+def test_stitch_segments():
+    print("=" * 60)
+    print("Segment Stitching - Verification Test")
+    print("=" * 60)
+
+    segments = [(0, 10), (10, 20)]
+    overlap = 3
+
+    # Segment 0: car 1 drives through the boundary, car 2 leaves before it
+    first = [row(f, 1, 10 * f) for f in range(0, 13)] + [row(f, 2, 500) for f in range(0, 5)]
+    # Segment 1 (fresh tracker): car 1 reappears as local ID 1, a new car as local ID 2
+    second = [row(f, 1, 10 * f + 1) for f in range(10, 20)] + [row(f, 2, 800) for f in range(12, 20)]
+
+    merged = stitch_segments([first, second], segments, overlap)
+
+    # Overlap frames are only taken from the segment that owns them
+    assert [r['frame_id'] for r in merged] == sorted(r['frame_id'] for r in merged)
+    assert sum(1 for r in merged if r['frame_id'] == 11) == 1
+
+    ids_by_segment = [{r['vehicle_id'] for r in merged if start <= r['frame_id'] < end}
+                      for start, end in segments]
+    print(f"  Global IDs per segment: {ids_by_segment}")
+
+    # Car 1 keeps its global ID; car 2 and the new car get distinct IDs
+    car1_ids = {r['vehicle_id'] for r in merged if r['bbox'][0] < 400}
+    assert len(car1_ids) == 1
+    assert len({r['vehicle_id'] for r in merged}) == 3
+
+    print("Stitching checks passed.")
+
+def test_unknown_frame_count():
+    print("=" * 60)
+    print("Segment Planning - Unknown Frame Count")
+    print("=" * 60)
+
+    class FakePipeline:
+        runs = []
+
+        def __init__(self, **kwargs):
+            self.results = [row(0, 1, 10)]
+
+        def process_video(self, video_path, output_video_path=None, **kwargs):
+            FakePipeline.runs.append((video_path, output_video_path, kwargs))
+
+        def save_results(self, csv_path):
+            FakePipeline.runs.append(csv_path)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Unreadable containers report no frame count
+        video = os.path.join(tmp, "stream.mp4")
+        with open(video, "wb") as f:
+            f.write(b"not a video")
+        try:
+            plan_segments(video, 4)
+            assert False, "expected ValueError"
+        except ValueError as e:
+            print(f"  {e}")
+
+        # The whole file is processed sequentially instead of as 15 overlap frames
+        original = main.VehicleAnalysisPipeline
+        main.VehicleAnalysisPipeline = FakePipeline
+        try:
+            results = process_video_parallel(video, os.path.join(tmp, "results.csv"), num_workers=4)
+        finally:
+            main.VehicleAnalysisPipeline = original
+        assert results == [row(0, 1, 10)]
+        assert FakePipeline.runs == [(video, None, {}), os.path.join(tmp, "results.csv")]
+    print("Unknown frame count checks passed.")
+
+if __name__ == "__main__":
+    test_stitch_segments()
+    test_unknown_frame_count()
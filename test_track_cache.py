@@ -0,0 +1,51 @@
+"""
+Test script for the track-keyed result cache (no models required).
+"""
+
+from src.track_cache import TrackResultCache
+
+def test_track_cache():
+    print("=" * 60)
+    print("Track Result Cache - Verification Test")
+    print("=" * 60)
+
+    cache = TrackResultCache(refresh_interval=None, growth_threshold=0.5, max_age=5)
+
+    # First sighting always needs a run
+    cache.touch(7, 0)
+    assert cache.needs_refresh(7, 'make_model', 0, 1000)
+    cache.put(7, 'make_model', {"make_model": "Audi A4", "confidence": 0.9}, 0, 1000)
+
+    # Same track, similar size -> cached
+    assert not cache.needs_refresh(7, 'make_model', 1, 1200)
+    assert cache.get(7, 'make_model')['make_model'] == "Audi A4"
+
+    # Crop grew by more than 50% -> refresh
+    assert cache.needs_refresh(7, 'make_model', 2, 1600)
+
+    # Stages are cached independently
+    assert cache.needs_refresh(7, 'plate', 2, 1000)
+    cache.put(7, 'plate', (None, 0.0), 2, 1000)
+    assert not cache.needs_refresh(7, 'plate', 3, 1000)
+    assert cache.get(7, 'plate') == (None, 0.0)
+    print(f"  Hits: {cache.hits}, misses: {cache.misses}")
+
+    # Timed refresh
+    timed = TrackResultCache(refresh_interval=10, growth_threshold=None)
+    timed.put(1, 'plate', ("ABC123", 0.8), 0, 500)
+    assert not timed.needs_refresh(1, 'plate', 9, 5000)
+    assert timed.needs_refresh(1, 'plate', 10, 500)
+
+    # Eviction after the track has been gone for max_age frames
+    cache.touch(7, 3)
+    cache.touch(8, 4)
+    assert cache.evict_stale(8) == []
+    assert cache.evict_stale(9) == [7]
+    assert 7 not in cache and 8 in cache
+    assert cache.evict_stale(10) == [8]
+    assert len(cache) == 0
+
+    print("Track cache checks passed.")
+
+if __name__ == "__main__":
+    test_track_cache()
@@ -0,0 +1,112 @@
+"""
+Test script for the piped ffmpeg video writer and its OpenCV fallback (no models required).
+"""
+
+import os
+import tempfile
+
+import cv2
+import numpy as np
+
+from src import video_writer
+from src.video_writer import FFmpegVideoWriter, find_ffmpeg, open_video_writer
+
+def make_frames(count=30, size=(320, 240)):
+    frames = []
+    for i in range(count):
+        frame = np.full((size[1], size[0], 3), 60, dtype=np.uint8)
+        cv2.rectangle(frame, (10 + 5 * i, 60), (90 + 5 * i, 140), (0, 200, 0), -1)
+        frames.append(frame)
+    return frames
+
+def read_back(path):
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+def test_ffmpeg_writer():
+    print("=" * 60)
+    print("Video Writer - ffmpeg Pipe")
+    print("=" * 60)
+
+    if find_ffmpeg() is None:
+        print("ffmpeg not available, skipping.")
+        return
+
+    frames = make_frames()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "out.mp4")
+        writer = FFmpegVideoWriter(path, 10, (320, 240), preset="ultrafast", crf=20, threads=1)
+        for frame in frames:
+            writer.write(frame)
+        writer.release()
+        decoded = read_back(path)
+        assert len(decoded) == len(frames)
+        psnr = cv2.PSNR(frames[15], decoded[15])
+        print(f"  {os.path.getsize(path)} bytes, PSNR {psnr:.1f} dB")
+        assert psnr > 30
+
+        # Frames of the wrong size are rejected before reaching ffmpeg
+        writer = open_video_writer(os.path.join(tmp, "size.mp4"), 10, (320, 240), backend="ffmpeg")
+        try:
+            writer.write(np.zeros((100, 100, 3), dtype=np.uint8))
+            assert False, "expected ValueError"
+        except ValueError:
+            pass
+        writer.release()
+
+        # Odd dimensions are padded for yuv420p instead of failing
+        writer = FFmpegVideoWriter(os.path.join(tmp, "odd.mp4"), 10, (161, 121))
+        for _ in range(3):
+            writer.write(np.zeros((121, 161, 3), dtype=np.uint8))
+        writer.release()
+        assert len(read_back(os.path.join(tmp, "odd.mp4"))) == 3
+
+        # Encoder errors surface on release
+        writer = FFmpegVideoWriter(os.path.join(tmp, "bad.mp4"), 10, (320, 240), codec="no-such-codec")
+        try:
+            for frame in frames:
+                writer.write(frame)
+            writer.release()
+            assert False, "expected RuntimeError"
+        except RuntimeError as e:
+            print(f"  bad codec: {e}")
+
+    print("ffmpeg writer checks passed.")
+
+def test_opencv_fallback():
+    print("=" * 60)
+    print("Video Writer - OpenCV Fallback")
+    print("=" * 60)
+
+    frames = make_frames(5)
+    original = video_writer.find_ffmpeg
+    video_writer.find_ffmpeg = lambda: None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.mp4")
+            writer = open_video_writer(path, 10, (320, 240), crf=28)
+            assert isinstance(writer, cv2.VideoWriter)
+            for frame in frames:
+                writer.write(frame)
+            writer.release()
+            assert len(read_back(path)) == 5
+            try:
+                open_video_writer(path, 10, (320, 240), backend="ffmpeg")
+                assert False, "expected RuntimeError"
+            except RuntimeError:
+                pass
+    finally:
+        video_writer.find_ffmpeg = original
+
+    print("Fallback checks passed.")
+
+if __name__ == "__main__":
+    test_ffmpeg_writer()
+    test_opencv_fallback()
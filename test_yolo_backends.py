@@ -0,0 +1,91 @@
+"""
+Parity test: exported YOLO backends must find the same vehicles as PyTorch.
+
+Skipped when ultralytics or the backend's runtime is not installed.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+from src.yolo_export import export_yolo, exported_path
+
+# Backend -> runtime package it needs
+RUNTIMES = {"onnx": "onnxruntime", "openvino": "openvino"}
+
+def iou(a, b):
+    x1, y1 = max(a[0], b[0]), max(a[1], b[1])
+    x2, y2 = min(a[2], b[2]), min(a[3], b[3])
+    inter = max(0.0, x2 - x1) * max(0.0, y2 - y1)
+    return inter / ((a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter)
+
+def test_backend_parity(min_iou=0.9, max_conf_diff=0.05):
+    print("=" * 60)
+    print("YOLO Backend Parity - Verification Test")
+    print("=" * 60)
+
+    if importlib.util.find_spec("ultralytics") is None:
+        print("  ultralytics not installed, skipping")
+        return
+
+    from ultralytics import YOLO
+    from ultralytics.utils import ASSETS
+    from src.detector import VEHICLE_CLASSES
+
+    image = cv2.imread(str(ASSETS / "bus.jpg"))
+    reference = YOLO("yolo11n.pt").predict(image, classes=VEHICLE_CLASSES, verbose=False)[0].boxes
+    ref_boxes = reference.xyxy.cpu().numpy()
+    ref_conf = reference.conf.cpu().numpy()
+    print(f"  pytorch: {len(ref_boxes)} vehicles")
+
+    for backend, runtime in RUNTIMES.items():
+        if importlib.util.find_spec(runtime) is None:
+            print(f"  {runtime} not installed, skipping {backend}")
+            continue
+        boxes = YOLO(export_yolo("yolo11n.pt", backend), task="detect").predict(
+            image, classes=VEHICLE_CLASSES, verbose=False)[0].boxes
+        xyxy = boxes.xyxy.cpu().numpy()
+        conf = boxes.conf.cpu().numpy()
+        print(f"  {backend}: {len(xyxy)} vehicles")
+
+        assert len(xyxy) == len(ref_boxes)
+        for box, box_conf in zip(ref_boxes, ref_conf):
+            overlaps = [iou(box, other) for other in xyxy]
+            best = int(np.argmax(overlaps))
+            assert overlaps[best] >= min_iou, f"{backend}: box {box} has no match"
+            assert abs(conf[best] - box_conf) <= max_conf_diff
+
+    print("Backend parity checks passed.")
+
+def test_cached_export():
+    print("=" * 60)
+    print("YOLO Export - Cached Models")
+    print("=" * 60)
+
+    # Cached exports are returned without importing ultralytics or loading the checkpoint
+    blocked = sys.modules.get("ultralytics")
+    sys.modules["ultralytics"] = None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            weights = os.path.join(tmp, "yolo11n.pt")
+            for backend in ("onnx", "onnx-int8", "openvino"):
+                target = exported_path(weights, backend)
+                if backend.startswith("openvino"):
+                    os.makedirs(target)
+                else:
+                    open(target, "w").close()
+                assert export_yolo(weights, backend) == target
+    finally:
+        if blocked is None:
+            del sys.modules["ultralytics"]
+        else:
+            sys.modules["ultralytics"] = blocked
+    print("Cached export checks passed.")
+
+if __name__ == "__main__":
+    test_backend_parity()
+    test_cached_export()